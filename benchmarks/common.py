@@ -0,0 +1,58 @@
+"""Common functions for benchmarks: test data generators and time measurement. """
+import random
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+from question_model import QuizModel, QuestionModel, AnswerModel, QuestionUserDataModel
+
+NUMBER_OF_ANSWERS = 4
+
+
+def generate_quiz_model(name: str, number_of_questions: int, with_user_data: bool = True,
+                        first_question_id: int = 1) -> QuizModel:
+    """Generate quiz model with a given number of questions. """
+    questions = [QuestionModel(id=first_question_id + index, text=f'Question {index}?',
+                               answers=[AnswerModel(text=f'Answer {answer}', is_correct=answer == index % 4)
+                                        for answer in range(NUMBER_OF_ANSWERS)],
+                               user_data=QuestionUserDataModel(level=index % 4) if with_user_data else None,
+                               comment=f'Comment to question {index}.')
+                 for index in range(number_of_questions)]
+    return QuizModel(name=name, questions=questions)
+
+
+def generate_quiz_text(name: str, number_of_questions: int, comment_lines: int = 2) -> str:
+    """Generate quiz markdown text with a given number of questions. """
+    lines = [f'## {name}', '']
+    for index in range(number_of_questions):
+        lines += [f'#### Q{index}. What is {index} + {index}?', '']
+        if index % 10 == 0:
+            lines += [f'![Q{index}](images/question{index}.png)', '']
+        correct = random.randrange(NUMBER_OF_ANSWERS)
+        lines += [f'- [{"x" if answer == correct else " "}] {index + answer}' for answer in range(NUMBER_OF_ANSWERS)]
+        lines += [''] + [f'Comment line {line} to question {index}.' for line in range(comment_lines)] + ['']
+    return '\n'.join(lines)
+
+
+@contextmanager
+def temporary_database_path() -> Iterator[str]:
+    """Yield path to a database file in a temporary directory, removed afterwards. """
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        yield str(Path(tmp_dir, 'benchmark.db'))
+
+
+def measure(function: Callable, *args, repeat: int = 1, **kwargs) -> float:
+    """Return the best time in seconds of calling the function. """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args, **kwargs)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def print_result(name: str, seconds: float, items: int, unit: str = 'items') -> None:
+    """Print a single benchmark result with throughput. """
+    print(f'{name:<50} {seconds * 1000:>10.1f} ms {items / seconds:>14.0f} {unit}/s')
@@ -0,0 +1,176 @@
+"""Database manager benchmarks.
+Run from the repository root: PYTHONPATH=src python3 benchmarks/database_benchmarks.py
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable
+
+from sqlalchemy import exists, update, select, or_
+
+from common import generate_quiz_model, measure, print_result, temporary_database_path, NUMBER_OF_ANSWERS
+from database.database_manager import DatabaseManager, ENGINE_PROFILES
+from database.database_model import QuestionUserData, Question, Answer
+from question_model import QuestionUserDataModel
+
+QUIZ_SIZES = [1000, 10000]
+PROGRESS_QUIZ_SIZE = 10000
+PROGRESS_SAVES = 1000
+PROFILE_QUIZ_SIZE = 10000
+PROFILE_READS = 2
+SUMMARY_QUIZZES = 200
+SUMMARY_QUIZ_SIZE = 500
+SUMMARY_PAGE_SIZE = 50
+SEARCH_QUIZ_SIZE = 200000
+SEARCH_QUERIES = 100
+
+
+def benchmark_add_quiz(database_manager: DatabaseManager) -> None:
+    """Compare import throughput of the ORM path and the bulk insert path. """
+    for number_of_questions in QUIZ_SIZES:
+        model = generate_quiz_model(f'Quiz {number_of_questions}', number_of_questions)
+        rows = number_of_questions * (NUMBER_OF_ANSWERS + 2)
+
+        database_manager.erase_all_quizzes()
+        seconds = measure(database_manager.add_quiz, model)
+        print_result(f'add_quiz ({number_of_questions} questions)', seconds, rows, 'rows')
+
+        database_manager.erase_all_quizzes()
+        seconds = measure(database_manager.add_quiz_bulk, model)
+        print_result(f'add_quiz_bulk ({number_of_questions} questions)', seconds, rows, 'rows')
+
+
+def save_progress_with_exists_check(database_manager: DatabaseManager, question_ids: list) -> None:
+    """Save progress of every question the way it was done before upserts: existence check, update or insert. """
+    session = database_manager.session
+    for question_id in question_ids:
+        user_data = QuestionUserDataModel(level=1, correct_answer=2)
+        if not session.query(exists().where(QuestionUserData.question_id == question_id)).scalar():
+            session.add(QuestionUserData(question_id=question_id, **user_data.dict()))
+        else:
+            session.execute(update(QuestionUserData).where(QuestionUserData.question_id == question_id)
+                            .values(**user_data.dict()))
+        session.commit()
+
+
+def save_progress(database_manager: DatabaseManager, question_ids: list) -> None:
+    """Save progress of every question with a separate upsert. """
+    for question_id in question_ids:
+        database_manager.update_question_user_data(QuestionUserDataModel(level=1, correct_answer=2), question_id)
+
+
+def save_progress_batch(database_manager: DatabaseManager, question_ids: list) -> None:
+    """Save progress of all questions with one upsert. """
+    database_manager.update_questions_user_data(
+        {question_id: QuestionUserDataModel(level=1, correct_answer=2) for question_id in question_ids})
+
+
+def benchmark_save_progress(database_manager: DatabaseManager) -> None:
+    """Compare ways of saving questions progress. """
+    database_manager.erase_all_quizzes()
+    question_ids = database_manager.add_quiz_bulk(
+        generate_quiz_model('Progress quiz', PROGRESS_QUIZ_SIZE)).question_ids[:PROGRESS_SAVES]
+    for function in (save_progress_with_exists_check, save_progress, save_progress_batch):
+        print_result(f'{function.__name__} ({PROGRESS_SAVES} questions)',
+                     measure(function, database_manager, question_ids), PROGRESS_SAVES, 'saves')
+
+
+def benchmark_get_quiz(database_manager: DatabaseManager) -> None:
+    """Compare reading quizzes validated from ORM objects and built from raw rows without validation. """
+    for number_of_questions in QUIZ_SIZES:
+        database_manager.erase_all_quizzes()
+        model = generate_quiz_model(f'Quiz {number_of_questions}', number_of_questions)
+        database_manager.add_quiz_bulk(model)
+        for validate in (True, False):
+            # Session is closed, so objects loaded by the previous read are not reused
+            database_manager.close_session()
+            print_result(f'get_quiz validate={validate} ({number_of_questions} questions)',
+                         measure(database_manager.get_quiz, model.name, validate=validate),
+                         number_of_questions, 'questions')
+
+
+def benchmark_quizzes_summaries(database_manager: DatabaseManager) -> None:
+    """Compare listing quizzes with their progress from whole quizzes graphs and from aggregate summaries. """
+    database_manager.erase_all_quizzes()
+    for quiz_number in range(SUMMARY_QUIZZES):
+        database_manager.add_quiz_bulk(generate_quiz_model(f'Quiz {quiz_number}', SUMMARY_QUIZ_SIZE,
+                                                           first_question_id=quiz_number * SUMMARY_QUIZ_SIZE + 1))
+    print_result(f'get_quizzes ({SUMMARY_QUIZZES} quizzes)', measure(database_manager.get_quizzes),
+                 SUMMARY_QUIZZES, 'quizzes')
+    print_result(f'get_quizzes_summaries ({SUMMARY_QUIZZES} quizzes)',
+                 measure(database_manager.get_quizzes_summaries), SUMMARY_QUIZZES, 'quizzes')
+    print_result(f'get_quizzes_summaries page ({SUMMARY_PAGE_SIZE} quizzes)',
+                 measure(database_manager.get_quizzes_summaries, limit=SUMMARY_PAGE_SIZE), SUMMARY_PAGE_SIZE,
+                 'quizzes')
+
+
+def search_with_like(database_manager: DatabaseManager, words: str) -> list:
+    """Find identifiers of questions with the words in their text, answers or comment by scanning the tables. """
+    pattern = f'%{words}%'
+    query = select(Question.id).outerjoin(Answer, Answer.question_id == Question.id) \
+        .where(or_(Question.text.like(pattern), Question.comment.like(pattern), Answer.text.like(pattern))) \
+        .distinct().limit(DatabaseManager.SEARCH_PAGE_SIZE)
+    return database_manager.session.execute(query).scalars().all()
+
+
+def search_questions(database_manager: DatabaseManager, search_function: Callable, number_of_queries: int) -> None:
+    """Search questions with numbers spread over the quiz. """
+    for query_number in range(number_of_queries):
+        search_function(database_manager, str(query_number * SEARCH_QUIZ_SIZE // number_of_queries))
+
+
+def benchmark_search(database_manager: DatabaseManager) -> None:
+    """Compare searching questions content with the full-text index and with scanning the tables. """
+    database_manager.erase_all_quizzes()
+    model = generate_quiz_model('Search quiz', SEARCH_QUIZ_SIZE)
+    print_result(f'add_quiz_bulk with search index ({SEARCH_QUIZ_SIZE} questions)',
+                 measure(database_manager.add_quiz_bulk, model), SEARCH_QUIZ_SIZE, 'questions')
+    print_result(f'search ({SEARCH_QUIZ_SIZE} questions)',
+                 measure(search_questions, database_manager, DatabaseManager.search, SEARCH_QUERIES),
+                 SEARCH_QUERIES, 'queries')
+    print_result(f'search with LIKE ({SEARCH_QUIZ_SIZE} questions)',
+                 measure(search_questions, database_manager, search_with_like, SEARCH_QUERIES // 10),
+                 SEARCH_QUERIES // 10, 'queries')
+
+
+def read_quiz(database_manager: DatabaseManager, quiz_name: str) -> None:
+    """Read the quiz a few times. """
+    for _ in range(PROFILE_READS):
+        database_manager.get_quiz(quiz_name)
+
+
+def benchmark_profile(profile: str) -> None:
+    """Measure writes and reads with an engine profile. Database manager is a singleton, so it is run in a separate
+    process for every profile.
+    """
+    with temporary_database_path() as database_path:
+        DatabaseManager.create_database(database_path, profile)
+        database_manager = DatabaseManager(database_path, profile)
+        model = generate_quiz_model('Profile quiz', PROFILE_QUIZ_SIZE)
+        question_ids = list(range(1, PROGRESS_SAVES + 1))
+
+        print_result(f'[{profile}] add_quiz_bulk ({PROFILE_QUIZ_SIZE} questions)',
+                     measure(database_manager.add_quiz_bulk, model), PROFILE_QUIZ_SIZE, 'questions')
+        print_result(f'[{profile}] save_progress ({PROGRESS_SAVES} questions)',
+                     measure(save_progress, database_manager, question_ids), PROGRESS_SAVES, 'saves')
+        print_result(f'[{profile}] get_quiz ({PROFILE_QUIZ_SIZE} questions)',
+                     measure(read_quiz, database_manager, model.name), PROFILE_READS * PROFILE_QUIZ_SIZE, 'questions')
+        print_result(f'[{profile}] get_quizzes_names', measure(database_manager.get_quizzes_names), 1, 'calls')
+
+
+def run() -> None:
+    """Run all database benchmarks on a temporary database. """
+    for profile in ENGINE_PROFILES:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            executor.submit(benchmark_profile, profile).result()
+
+    with temporary_database_path() as database_path:
+        DatabaseManager.create_database(database_path)
+        database_manager = DatabaseManager(database_path)
+        benchmark_add_quiz(database_manager)
+        benchmark_get_quiz(database_manager)
+        benchmark_quizzes_summaries(database_manager)
+        benchmark_search(database_manager)
+        benchmark_save_progress(database_manager)
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,47 @@
+"""Graphic user interface benchmarks. They use the offscreen Qt platform, so no window is shown.
+Run from the repository root: PYTHONPATH=src python3 benchmarks/gui_benchmarks.py
+"""
+import os
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PySide6.QtCore import QCoreApplication  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from common import generate_quiz_model, measure, print_result, temporary_database_path  # noqa: E402
+from database.database_manager import DatabaseManager  # noqa: E402
+from gui.strategy.question import QuestionStrategy  # noqa: E402
+from question_model import LearningModel  # noqa: E402
+
+NUMBER_OF_QUESTIONS = 1000
+NUMBER_OF_TRANSITIONS = 100
+
+
+def answer_questions(strategy: QuestionStrategy, number_of_transitions: int) -> None:
+    """Check the current question and go to the next one, processing events as the event loop would. """
+    for _ in range(number_of_transitions):
+        strategy.next_or_check_question()
+        strategy.next_or_check_question()
+        QCoreApplication.processEvents()
+
+
+def run() -> None:
+    """Run question widget benchmarks on a generated quiz. """
+    application = QApplication([])
+    with temporary_database_path() as database_path:
+        DatabaseManager.create_database(database_path)
+        DatabaseManager(database_path)
+        strategy = QuestionStrategy()
+        strategy.widget.show()
+        quiz_model = generate_quiz_model('GUI quiz', NUMBER_OF_QUESTIONS, with_user_data=False)
+        strategy.start_quiz(LearningModel.create_from_quiz_model(quiz_model))
+
+        print_result(f'question transitions ({NUMBER_OF_QUESTIONS} questions)',
+                     measure(answer_questions, strategy, NUMBER_OF_TRANSITIONS, repeat=3), NUMBER_OF_TRANSITIONS,
+                     'transitions')
+        strategy.progress_buffer.close()
+    application.quit()
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,46 @@
+"""Learning model benchmarks.
+Run from the repository root: PYTHONPATH=src python3 benchmarks/learning_benchmarks.py
+"""
+import random
+
+from common import generate_quiz_model, measure, print_result
+from question_model import LearningModel
+
+NUMBER_OF_QUESTIONS = 100000
+NUMBER_OF_ANSWERS = 1000000
+CORRECT_ANSWER_PROBABILITY = 0.8
+
+
+def simulate_answers(learning_model: LearningModel, number_of_answers: int) -> None:
+    """Answer questions drawn from the learning model, updating their levels after correct answers. """
+    for _ in range(number_of_answers):
+        question = next(learning_model)
+        if random.random() < CORRECT_ANSWER_PROBABILITY:
+            question.correct_answer()
+            learning_model.update_question(question)
+        else:
+            question.incorrect_answer()
+
+
+def draw_single(learning_model: LearningModel, number: int) -> None:
+    """Draw questions one by one. """
+    for _ in range(number):
+        next(learning_model)
+
+
+def run() -> None:
+    """Run learning model benchmarks on a generated quiz. """
+    random.seed(0)
+    quiz_model = generate_quiz_model('Learning quiz', NUMBER_OF_QUESTIONS, with_user_data=False)
+    learning_model = LearningModel.create_from_quiz_model(quiz_model)
+    learning_model.seed(0)
+    print_result(f'next ({NUMBER_OF_QUESTIONS} questions)',
+                 measure(draw_single, learning_model, NUMBER_OF_ANSWERS), NUMBER_OF_ANSWERS, 'questions')
+    print_result(f'next_questions ({NUMBER_OF_QUESTIONS} questions)',
+                 measure(learning_model.next_questions, NUMBER_OF_ANSWERS), NUMBER_OF_ANSWERS, 'questions')
+    print_result(f'simulate_answers ({NUMBER_OF_QUESTIONS} questions)',
+                 measure(simulate_answers, learning_model, NUMBER_OF_ANSWERS), NUMBER_OF_ANSWERS, 'answers')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,45 @@
+"""Quiz parser micro-benchmarks.
+Run from the repository root: PYTHONPATH=src python3 benchmarks/parser_benchmarks.py
+"""
+import io
+
+from common import generate_quiz_text, measure, print_result
+from database.quiz_parser import parse_quiz_text, parse_quiz_stream, LINE_PATTERN
+
+QUIZ_SIZES = [1000, 10000, 50000]
+LONG_COMMENT_LINES = 10000
+REPEAT = 3
+
+
+def consume_stream(text: str) -> None:
+    """Parse text with the streaming parser, reading it as a file, and drop the questions. """
+    _, questions = parse_quiz_stream(io.StringIO(text))
+    for _ in questions:
+        pass
+
+
+def tokenize(lines: list) -> None:
+    """Classify every line with the tokenizer pattern only. """
+    for line in lines:
+        LINE_PATTERN.fullmatch(line)
+
+
+def run() -> None:
+    """Run all parser benchmarks on generated quizzes. """
+    for number_of_questions in QUIZ_SIZES:
+        text = generate_quiz_text(f'Quiz {number_of_questions}', number_of_questions)
+        lines = text.split('\n')
+        print_result(f'tokenize ({number_of_questions} questions)',
+                     measure(tokenize, lines, repeat=REPEAT), len(lines), 'lines')
+        print_result(f'parse_quiz_text ({number_of_questions} questions)',
+                     measure(parse_quiz_text, text, repeat=REPEAT), number_of_questions, 'questions')
+        print_result(f'parse_quiz_stream ({number_of_questions} questions)',
+                     measure(consume_stream, text, repeat=REPEAT), number_of_questions, 'questions')
+
+    text = generate_quiz_text('Long comments', 10, comment_lines=LONG_COMMENT_LINES)
+    print_result(f'parse_quiz_text (comments of {LONG_COMMENT_LINES} lines)',
+                 measure(parse_quiz_text, text, repeat=REPEAT), 10 * LONG_COMMENT_LINES, 'lines')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,79 @@
+"""Question store benchmarks: memory and study throughput of the compact store compared to pydantic models.
+Run from the repository root: PYTHONPATH=src python3 benchmarks/question_store_benchmarks.py
+"""
+import gc
+import random
+import tracemalloc
+from typing import Callable, Union
+
+from common import generate_quiz_model, measure, print_result
+from question_model import LearningModel
+from question_store import StudyModel
+
+NUMBER_OF_QUESTIONS = 100000
+NUMBER_OF_ANSWERS = 300000
+CORRECT_ANSWER_PROBABILITY = 0.8
+
+
+def measure_memory(create_model: Callable[[], object]) -> int:
+    """Return number of bytes kept by the created model, temporary allocations are not counted. """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        model = create_model()
+        gc.collect()
+        kept_bytes, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del model
+    return kept_bytes
+
+
+def create_learning_model() -> LearningModel:
+    """Create learning model, it keeps question models of the quiz. """
+    return LearningModel.create_from_quiz_model(generate_quiz_model('Store quiz', NUMBER_OF_QUESTIONS))
+
+
+def create_study_model() -> StudyModel:
+    """Create study model, the quiz model is converted once and released. """
+    return StudyModel.create_from_quiz_model(generate_quiz_model('Store quiz', NUMBER_OF_QUESTIONS))
+
+
+def simulate_answers(model: Union[LearningModel, StudyModel], number_of_answers: int) -> None:
+    """Answer questions drawn from the model, updating their levels after correct answers. """
+    for _ in range(number_of_answers):
+        question = next(model)
+        if random.random() < CORRECT_ANSWER_PROBABILITY:
+            question.correct_answer()
+            model.update_question(question)
+        else:
+            question.incorrect_answer()
+
+
+def read_answers(model: Union[LearningModel, StudyModel], number_of_questions: int) -> None:
+    """Draw questions and read correctness of their answers, as the question widget does. """
+    for question in model.next_questions(number_of_questions):
+        [answer.is_correct for answer in question.answers]
+
+
+def run() -> None:
+    """Run question store benchmarks on a generated quiz. """
+    for name, create_model in (('LearningModel', create_learning_model), ('StudyModel', create_study_model)):
+        kept_bytes = measure_memory(create_model)
+        print(f'{name + f" memory ({NUMBER_OF_QUESTIONS} questions)":<50} {kept_bytes / 2 ** 20:>10.1f} MiB '
+              f'{kept_bytes / NUMBER_OF_QUESTIONS:>14.0f} bytes/question')
+
+    quiz_model = generate_quiz_model('Store quiz', NUMBER_OF_QUESTIONS)
+    print_result(f'StudyModel.create_from_quiz_model ({NUMBER_OF_QUESTIONS} questions)',
+                 measure(StudyModel.create_from_quiz_model, quiz_model), NUMBER_OF_QUESTIONS, 'questions')
+    for model in (StudyModel.create_from_quiz_model(quiz_model), LearningModel.create_from_quiz_model(quiz_model)):
+        random.seed(0)
+        model.seed(0)
+        print_result(f'{type(model).__name__} answers ({NUMBER_OF_QUESTIONS} questions)',
+                     measure(simulate_answers, model, NUMBER_OF_ANSWERS), NUMBER_OF_ANSWERS, 'answers')
+        print_result(f'{type(model).__name__} read answers ({NUMBER_OF_QUESTIONS} questions)',
+                     measure(read_answers, model, NUMBER_OF_ANSWERS), NUMBER_OF_ANSWERS, 'questions')
+
+
+if __name__ == '__main__':
+    run()
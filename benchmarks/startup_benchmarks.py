@@ -0,0 +1,82 @@
+"""Application startup benchmarks. Time is measured from the process start to the first paint of the main window.
+Run from the repository root: PYTHONPATH=src python3 benchmarks/startup_benchmarks.py
+"""
+import os
+import subprocess
+import sys
+import time
+
+from common import generate_quiz_model, print_result, temporary_database_path
+
+NUMBER_OF_QUIZZES = 20
+NUMBER_OF_QUESTIONS = 1000
+REPEAT = 5
+FIRST_PAINT_MESSAGE = 'first paint'
+CHILD_FLAG = '--first-paint'
+
+
+def show_main_window(database_path: str) -> None:
+    """Start the application and quit right after the main window is painted for the first time.
+    It is run in a child process, so imports are measured too.
+    """
+    from PySide6.QtCore import QEvent, QObject, QTimer
+    from PySide6.QtWidgets import QApplication
+
+    from run_gui import create_main_window
+
+    class FirstPaintFilter(QObject):
+        """Report the first paint event of a widget and quit the application. """
+
+        def eventFilter(self, watched: QObject, event: QEvent) -> bool:
+            """Filter widget events. """
+            if event.type() == QEvent.Paint:
+                watched.removeEventFilter(self)
+                print(FIRST_PAINT_MESSAGE, flush=True)
+                QTimer.singleShot(0, QApplication.quit)
+            return False
+
+    application = QApplication(sys.argv[:1])
+    window = create_main_window(database_path)
+    paint_filter = FirstPaintFilter()
+    window.installEventFilter(paint_filter)
+    window.show()
+    application.exec()
+
+
+def measure_first_paint(database_path: str) -> float:
+    """Return seconds from starting a child process to the first paint of its main window. """
+    environment = {**os.environ, 'QT_QPA_PLATFORM': os.environ.get('QT_QPA_PLATFORM', 'offscreen')}
+    start = time.perf_counter()
+    with subprocess.Popen([sys.executable, __file__, CHILD_FLAG, database_path], env=environment,
+                          stdout=subprocess.PIPE, text=True) as process:
+        for line in process.stdout:
+            if line.strip() == FIRST_PAINT_MESSAGE:
+                seconds = time.perf_counter() - start
+                break
+        else:
+            raise RuntimeError('Main window was not painted')
+        process.stdout.read()
+    return seconds
+
+
+def run() -> None:
+    """Run startup benchmark on a database with generated quizzes. """
+    from database.database_manager import DatabaseManager
+
+    with temporary_database_path() as database_path:
+        DatabaseManager.create_database(database_path)
+        database_manager = DatabaseManager(database_path)
+        for index in range(NUMBER_OF_QUIZZES):
+            database_manager.add_quiz_bulk(generate_quiz_model(f'Quiz {index}', NUMBER_OF_QUESTIONS,
+                                                              first_question_id=index * NUMBER_OF_QUESTIONS + 1))
+        database_manager.engine.dispose()
+
+        seconds = min(measure_first_paint(database_path) for _ in range(REPEAT))
+        print_result(f'process start to first paint ({NUMBER_OF_QUIZZES} quizzes)', seconds, 1, 'starts')
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == [CHILD_FLAG]:
+        show_main_window(sys.argv[2])
+    else:
+        run()
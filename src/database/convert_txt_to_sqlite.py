@@ -1,24 +1,176 @@
-"""Get data from quiz text file and put it into SQLite database file. Database version used in this script: 0.0.1. """
+"""Get data from quiz text files and put it into SQLite database file. The database is created or upgraded to the
+current version before the import.
+Files are parsed in parallel by a pool of processes, parsed quizzes are written to the database by a single writer.
+Files imported before are skipped if they haven't changed, otherwise only changed questions are written. Files which
+can't be parsed or written are reported as failed and the import goes on with the remaining ones.
+Run from the repository root: PYTHONPATH=src python3 src/database/convert_txt_to_sqlite.py <input_path> <database_path>
+"""
+import glob
+import hashlib
+import os
+import time
 from argparse import ArgumentParser, Namespace
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple
 
-from database.database_manager import add_quiz
-from run import get_quiz_model
+from database.database_manager import DatabaseManager, QuizSyncResult, ENGINE_PROFILES
+from database.quiz_parser import parse_quiz_stream
+from question_model import QuizModel, SourceFileModel
 
 DATABASE_PATH = 'data/quiz.db'
+QUIZ_FILE_PATTERN = '*.md'
+HASH_CHUNK_SIZE = 1 << 20
+
+
+class FileImportReport(NamedTuple):
+    """Import statistics of a single quiz file. """
+    path: str
+    questions: int
+    inserted: int
+    updated: int
+    deleted: int
+    parse_seconds: float
+    write_seconds: float
+    # File was not changed since the last import, so it wasn't synchronized
+    skipped: bool = False
+    # Description of the error if the file couldn't be parsed or written, nothing from it is stored then
+    error: Optional[str] = None
 
 
 def create_arg_parser() -> ArgumentParser:
     """Create argument parser. """
     pars = ArgumentParser(description=__doc__)
-    pars.add_argument('input_path', type=str, help='path to input text file to be processed')
-    pars.add_argument('database_path', type=str, help='path to SQLite database file to be processed')
+    pars.add_argument('input_path', type=str,
+                      help=f'path to input text file, directory with {QUIZ_FILE_PATTERN} files or glob pattern')
+    pars.add_argument('database_path', type=str, nargs='?', default=DATABASE_PATH,
+                      help='path to SQLite database file to be processed, it is created if it does not exist')
+    pars.add_argument('--workers', type=int, default=os.cpu_count(), help='number of parsing processes')
+    pars.add_argument('--profile', choices=ENGINE_PROFILES, default='fast', help='database engine profile')
+    pars.add_argument('--batch-size', type=int, default=DatabaseManager.BULK_BATCH_SIZE,
+                      help='number of questions inserted into the database at once')
     return pars
 
 
+def find_quiz_files(input_path: str) -> List[str]:
+    """Return sorted paths of quiz files in a directory, paths matching a glob pattern or the file itself. """
+    if Path(input_path).is_dir():
+        return sorted(str(path) for path in Path(input_path).glob(QUIZ_FILE_PATTERN))
+    return sorted(glob.glob(input_path))
+
+
+def get_source_file_state(path: str, content_hash: str = '') -> SourceFileModel:
+    """Return current state of a quiz source file. """
+    stat = os.stat(path)
+    return SourceFileModel(path=path, size=stat.st_size, modification_time=stat.st_mtime_ns, content_hash=content_hash)
+
+
+def file_content_hash(path: str) -> str:
+    """Return hash of the file content, the file is read in chunks. """
+    content_hash = hashlib.sha256()
+    with open(path, 'rb') as quiz_file:
+        while chunk := quiz_file.read(HASH_CHUNK_SIZE):
+            content_hash.update(chunk)
+    return content_hash.hexdigest()
+
+
+def parse_quiz_file(path: str, imported_source: Optional[SourceFileModel] = None) \
+        -> Tuple[SourceFileModel, Optional[QuizModel], float]:
+    """Parse quiz file. It is run in a worker process.
+    Return file state, quiz model and parsing time in seconds. Quiz model is None if the file content hash is equal
+    to the hash of the imported file.
+    """
+    start = time.perf_counter()
+    source = get_source_file_state(path, file_content_hash(path))
+    if imported_source and imported_source.content_hash == source.content_hash:
+        return source.copy(update={'quiz_id': imported_source.quiz_id}), None, time.perf_counter() - start
+
+    with open(path, encoding='utf-8') as quiz_file:
+        quiz_name, questions = parse_quiz_stream(quiz_file)
+        model = QuizModel(name=quiz_name, questions=list(questions))
+    return source, model, time.perf_counter() - start
+
+
+def is_source_file_unchanged(path: str, imported_source: Optional[SourceFileModel]) -> bool:
+    """Check if size and modification time of a file are the same as when it was imported. """
+    if imported_source is None:
+        return False
+    source = get_source_file_state(path)
+    return (source.size, source.modification_time) == (imported_source.size, imported_source.modification_time)
+
+
+def import_quiz_files(paths: List[str], database_manager: DatabaseManager, workers: int = 1,
+                      batch_size: int = DatabaseManager.BULK_BATCH_SIZE) -> List[FileImportReport]:
+    """Parse quiz files in a process pool and write them in the database one by one, as soon as they are parsed.
+    The database is accessed only from the calling process. Files with the same size and modification time as when
+    they were imported are skipped without reading them. A file failing to be parsed or written is reported with
+    the error and doesn't stop the import of other files.
+    """
+    reports = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {}
+        for path in paths:
+            imported_source = database_manager.get_source_file(path)
+            if is_source_file_unchanged(path, imported_source):
+                reports.append(FileImportReport(path=path, questions=0, inserted=0, updated=0, deleted=0,
+                                                parse_seconds=0, write_seconds=0, skipped=True))
+            else:
+                futures[executor.submit(parse_quiz_file, path, imported_source)] = path
+
+        for future in as_completed(futures):
+            try:
+                source, model, parse_seconds = future.result()
+                start = time.perf_counter()
+                if model is None:
+                    database_manager.update_source_file(source)
+                    result = QuizSyncResult(quiz_id=source.quiz_id, inserted=0, updated=0, deleted=0)
+                else:
+                    result = database_manager.sync_quiz(model, source, batch_size=batch_size)
+            except Exception as error:
+                reports.append(FileImportReport(path=futures[future], questions=0, inserted=0, updated=0, deleted=0,
+                                                parse_seconds=0, write_seconds=0,
+                                                error=f'{type(error).__name__}: {error}'))
+                continue
+            reports.append(FileImportReport(path=source.path, questions=len(model.questions) if model else 0,
+                                            inserted=result.inserted, updated=result.updated, deleted=result.deleted,
+                                            parse_seconds=parse_seconds, write_seconds=time.perf_counter() - start,
+                                            skipped=model is None))
+    return reports
+
+
+def print_reports(reports: List[FileImportReport], total_seconds: float) -> None:
+    """Print per file timing and overall throughput. """
+    for report in reports:
+        if report.error is not None:
+            print(f'{report.path}: failed, {report.error}')
+            continue
+        if report.skipped:
+            print(f'{report.path}: unchanged, skipped')
+            continue
+        print(f'{report.path}: {report.questions} questions ({report.inserted} inserted, {report.updated} updated, '
+              f'{report.deleted} deleted), '
+              f'parsed in {report.parse_seconds:.3f} s, written in {report.write_seconds:.3f} s')
+    questions = sum(report.questions for report in reports)
+    skipped = sum(report.skipped for report in reports)
+    failed = sum(report.error is not None for report in reports)
+    print(f'Imported {len(reports)} files ({skipped} unchanged, {failed} failed) with {questions} questions '
+          f'in {total_seconds:.3f} s '
+          f'({len(reports) / total_seconds:.1f} files/s, {questions / total_seconds:.0f} questions/s)')
+
+
 def run(arguments: Namespace):
     """Main function of this script. """
-    model = get_quiz_model(arguments.input_path)
-    add_quiz(arguments.database_path, model)
+    start = time.perf_counter()
+    if not Path(arguments.database_path).exists():
+        DatabaseManager.create_database(arguments.database_path, arguments.profile)
+    database_manager = DatabaseManager(arguments.database_path, arguments.profile)
+
+    paths = find_quiz_files(arguments.input_path)
+    reports = import_quiz_files(paths, database_manager, arguments.workers, arguments.batch_size)
+    if reports:
+        print_reports(reports, time.perf_counter() - start)
+    else:
+        print(f'No quiz files found in {arguments.input_path}')
 
 
 if __name__ == '__main__':
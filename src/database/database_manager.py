@@ -1,26 +1,174 @@
 """Database manager. It is used to add new questions to existing database. """
-from typing import List, Optional
+import hashlib
+import json
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+from typing import List, Optional, Iterable, Iterator, NamedTuple, Tuple, Dict, Any, Union, Sequence, Set
 
-from sqlalchemy import create_engine, update, exists
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, update, insert, select, func, delete, bindparam, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert, Insert
+from sqlalchemy.orm import sessionmaker, subqueryload, scoped_session, Session
+from sqlalchemy.pool import QueuePool
 
-from database.database_model import Quiz, Question, QuestionUserData, Answer, Base, Version
+from database.database_model import Quiz, Question, QuestionUserData, Answer, Base, Version, SourceFile, \
+    QuestionHash
+from database.migrations import upgrade_database
 from singleton_meta import SingletonMeta
-from question_model import QuizModel, QuestionUserDataModel
+from question_model import QuizModel, QuestionModel, QuestionUserDataModel, SourceFileModel, AnswerModel, \
+    QuizSummaryModel, NUMBER_OF_LEVELS, SearchResultModel
+
+
+# SQLite pragmas applied on every new connection. Both profiles use write-ahead logging, so readers don't block
+# the writer. The safe profile syncs every commit to disk, the fast one may lose the last commits on a power loss,
+# but never corrupts the database, and trades memory for speed.
+ENGINE_PROFILES: Dict[str, Dict[str, Union[str, int]]] = {
+    'safe': {'journal_mode': 'WAL', 'synchronous': 'FULL', 'foreign_keys': 'ON'},
+    'fast': {'journal_mode': 'WAL', 'synchronous': 'NORMAL', 'foreign_keys': 'ON', 'temp_store': 'MEMORY',
+             'mmap_size': 256 * 1024 * 1024, 'cache_size': -64 * 1024},
+}
+DEFAULT_ENGINE_PROFILE = 'safe'
+# Connections kept open in the pool and the number of additional ones opened when every pooled one is in use
+POOL_SIZE = 5
+POOL_MAX_OVERFLOW = 10
+
+
+def create_database_engine(database_path: str, profile: str = DEFAULT_ENGINE_PROFILE) -> Engine:
+    """Create engine of SQLite database, applying pragmas of the profile on connect.
+    Connections are pooled and may be used by any thread, but by one thread at a time.
+    """
+    if profile not in ENGINE_PROFILES:
+        raise ValueError(f'Unknown database engine profile: {profile}. Available: {", ".join(ENGINE_PROFILES)}.')
+    engine = create_engine(DatabaseManager.DATABASE_PREFIX + database_path, echo=False, poolclass=QueuePool,
+                           pool_size=POOL_SIZE, max_overflow=POOL_MAX_OVERFLOW,
+                           connect_args={'check_same_thread': False})
+    pragmas = ENGINE_PROFILES[profile]
+
+    @event.listens_for(engine, 'connect')
+    def apply_pragmas(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+        cursor.close()
+
+    return engine
+
+
+class ImportedQuizIds(NamedTuple):
+    """Identifiers of rows created by a bulk quiz import. """
+    quiz_id: int
+    question_ids: List[int]
+    answer_ids: List[int]
+
+
+class QuizSyncResult(NamedTuple):
+    """Number of questions changed by an incremental quiz import. """
+    quiz_id: int
+    inserted: int
+    updated: int
+    deleted: int
+
+
+class IdentifierGenerator:
+    """Generator of identifiers of rows inserted by a bulk import. Identifiers given explicitly in the imported
+    models are reserved, so they are skipped when identifiers of the other rows are generated.
+    """
+
+    def __init__(self, next_id: int):
+        """Constructor. """
+        self.next_id = next_id
+        self.reserved: Set[int] = set()
+
+    def reserve(self, identifiers: Iterable[Optional[int]]) -> None:
+        """Reserve explicitly given identifiers, missing ones are ignored. """
+        self.reserved.update(identifier for identifier in identifiers if identifier is not None)
+
+    def get(self, identifier: Optional[int]) -> int:
+        """Return the explicit identifier or generate the next one, which isn't reserved. """
+        if identifier is not None:
+            self.next_id = max(self.next_id, identifier + 1)
+            return identifier
+        while self.next_id in self.reserved:
+            self.next_id += 1
+        self.next_id += 1
+        return self.next_id - 1
+
+
+def reserve_identifiers(questions: Iterable[QuestionModel], question_ids: IdentifierGenerator,
+                        answer_ids: IdentifierGenerator) -> None:
+    """Reserve identifiers given explicitly in questions and their answers. """
+    for question in questions:
+        question_ids.reserve([question.id])
+        answer_ids.reserve(answer.id for answer in question.answers)
+
+
+def question_content_hash(question: QuestionModel) -> str:
+    """Return hash of question content: text, image, comment and answers. Identifiers and user data are omitted. """
+    content = [question.text, question.image_path, question.comment,
+               [[answer.text, answer.is_correct] for answer in question.answers]]
+    return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+
+def question_keys(questions: Iterable[Any]) -> Iterator[Tuple[Tuple[str, int], Any]]:
+    """Yield questions with their keys. Key is the question text with the number of previous questions with
+    the same text, so repeated questions are matched in order.
+    """
+    occurrences = Counter()
+    for question in questions:
+        yield (question.text, occurrences[question.text]), question
+        occurrences[question.text] += 1
+
+
+def search_query(words: str) -> str:
+    """Return full-text search query matching questions containing all the words or words starting with them.
+    Words are quoted, so characters of the query syntax are searched as they are.
+    """
+    return ' '.join('"' + word.replace('"', '""') + '"*' for word in words.split())
+
+
+def batches(iterable: Iterable, batch_size: int) -> Iterator[list]:
+    """Split iterable into lists of at most batch_size elements. """
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, batch_size)):
+        yield batch
 
 
 class DatabaseManager(metaclass=SingletonMeta):
-    """Database manager class. """
+    """Database manager class.
+    Methods use a session of the calling thread, so they may be called from worker threads. A worker thread should
+    call close_session when it finishes its work. Separate units of work may use session_scope.
+    """
     DATABASE_PREFIX = 'sqlite:///'
-    DATABASE_VERSION = (0, 0, 1)
+    DATABASE_VERSION = (0, 0, 4)
+    BULK_BATCH_SIZE = 1000
+    SEARCH_PAGE_SIZE = 20
+    # Weights of question text, answers and comment in ranking search results
+    SEARCH_WEIGHTS = (2.0, 1.0, 1.0)
+    SNIPPET_MARKERS = ('[', ']')
+    SNIPPET_TOKENS = 12
 
-    def __init__(self, database_path: Optional[str] = None) -> None:
+    def __init__(self, database_path: Optional[str] = None, profile: str = DEFAULT_ENGINE_PROFILE) -> None:
         self.database_path = database_path
-        self.engine = create_engine(self.DATABASE_PREFIX + database_path, echo=False)
+        self.profile = profile
+        self.engine = create_database_engine(database_path, profile)
         # TODO exception if the database doesn't exist
+        upgrade_database(self.engine)
 
-        SessionClass = sessionmaker(bind=self.engine)
-        self.session = SessionClass()
+        self.SessionClass = sessionmaker(bind=self.engine)
+        self.session = scoped_session(self.SessionClass)
+
+    @contextmanager
+    def session_scope(self) -> Iterator[Session]:
+        """Yield new session for a unit of work. It is committed at the end or rolled back if an exception is raised.
+        """
+        with self.SessionClass() as session, session.begin():
+            yield session
+
+    def close_session(self) -> None:
+        """Close session of the calling thread. """
+        self.session.remove()
 
     def add_quiz(self, model: QuizModel) -> None:
         """Add new quiz to existing database.
@@ -40,21 +188,296 @@ class DatabaseManager(metaclass=SingletonMeta):
         self.session.add(model_orm)
         self.session.commit()
 
-    def get_quizzes(self) -> List[QuizModel]:
-        """Returns list of object representation of quizzes stored in a database. """
-        quizzes_orm_objects = self.session.query(Quiz).all()
+    def add_quiz_bulk(self, model: QuizModel, questions: Optional[Iterable[QuestionModel]] = None,
+                      batch_size: int = BULK_BATCH_SIZE) -> ImportedQuizIds:
+        """Add new quiz to existing database with executemany inserts, without building ORM objects.
+        Questions, answers and user data are written in batches of batch_size questions, all in one transaction.
+        If questions are given, they are used instead of model questions, so they may be streamed from a parser.
+        Identifiers missing in models are assigned up front, because executemany doesn't report generated keys.
+        """
+        try:
+            quiz_row = {'name': model.name, 'description': model.description}
+            if model.id is not None:
+                quiz_row['id'] = model.id
+            quiz_id = self.session.execute(insert(Quiz.__table__).values(quiz_row)).inserted_primary_key[0]
+            question_ids, answer_ids = self._insert_questions(
+                quiz_id, model.questions if questions is None else questions, batch_size)
+            self.session.commit()
+        except BaseException:
+            self.session.rollback()
+            raise
+
+        return ImportedQuizIds(quiz_id=quiz_id, question_ids=question_ids, answer_ids=answer_ids)
+
+    def _insert_questions(self, quiz_id: int, questions: Iterable[QuestionModel], batch_size: int,
+                          with_hashes: bool = False) -> Tuple[List[int], List[int]]:
+        """Insert questions with answers and user data in batches, without committing.
+        Return identifiers of inserted questions and answers. If with_hashes is set, question content hashes are stored.
+        Identifiers given in models are reserved before others are generated: all of them for a sequence of questions,
+        batch by batch for streamed ones.
+        """
+        question_id_generator = IdentifierGenerator(self._next_id(Question))
+        answer_id_generator = IdentifierGenerator(self._next_id(Answer))
+        if isinstance(questions, Sequence):
+            reserve_identifiers(questions, question_id_generator, answer_id_generator)
+        question_ids, answer_ids = [], []
+        # Answers are inserted before their questions, so the search index trigger of a question indexes it with
+        # its answers at once. Foreign keys are checked at the commit.
+        self.session.execute(text('PRAGMA defer_foreign_keys = ON'))
+
+        for questions_batch in batches(questions, batch_size):
+            question_rows, answer_rows, user_data_rows, hash_rows = [], [], [], []
+            reserve_identifiers(questions_batch, question_id_generator, answer_id_generator)
+            for question in questions_batch:
+                question_id = question_id_generator.get(question.id)
+                question_ids.append(question_id)
+                question_rows.append({'id': question_id, 'quiz_id': quiz_id, 'text': question.text,
+                                      'image_path': question.image_path, 'comment': question.comment})
+                for answer in question.answers:
+                    answer_id = answer_id_generator.get(answer.id)
+                    answer_ids.append(answer_id)
+                    answer_rows.append({'id': answer_id, 'question_id': question_id,
+                                        'text': answer.text, 'is_correct': answer.is_correct})
+                if question.user_data:
+                    user_data_rows.append({'question_id': question_id, **question.user_data.dict()})
+                if with_hashes:
+                    hash_rows.append({'question_id': question_id, 'content_hash': question_content_hash(question)})
+
+            for table, rows in ((Answer, answer_rows), (Question, question_rows), (QuestionUserData, user_data_rows),
+                                (QuestionHash, hash_rows)):
+                if rows:
+                    self.session.execute(insert(table.__table__), rows)
+
+        return question_ids, answer_ids
+
+    def get_source_file(self, path: str) -> Optional[SourceFileModel]:
+        """Return state of an imported quiz source file or None if the file was never imported. """
+        source_file = self.session.query(SourceFile).filter(SourceFile.path == path).first()
+
+        return SourceFileModel.from_orm(source_file) if source_file else None
+
+    def update_source_file(self, source: SourceFileModel) -> None:
+        """Store state of an imported quiz source file. """
+        self._store_source_file(source, source.quiz_id)
+        self.session.commit()
+
+    def _store_source_file(self, source: SourceFileModel, quiz_id: Optional[int]) -> None:
+        """Insert or update source file state, without committing. """
+        source_file = self.session.query(SourceFile).filter(SourceFile.path == source.path).first()
+        if source_file is None:
+            source_file = SourceFile(path=source.path)
+            self.session.add(source_file)
+        source_file.size = source.size
+        source_file.modification_time = source.modification_time
+        source_file.content_hash = source.content_hash
+        source_file.quiz_id = quiz_id
+
+    def sync_quiz(self, model: QuizModel, source: SourceFileModel,
+                  batch_size: int = BULK_BATCH_SIZE) -> QuizSyncResult:
+        """Import quiz from a source file, applying only the differences if the file was imported before.
+        Questions are matched by their text (and position among questions with the same text) and compared by their
+        content hashes. New questions are inserted, changed ones are updated in place, keeping their identifiers
+        and user data, and questions missing in the model are deleted. Everything is done in one transaction.
+        """
+        source_file = self.session.query(SourceFile).filter(SourceFile.path == source.path).first()
+        quiz = self.session.get(Quiz, source_file.quiz_id) if source_file and source_file.quiz_id else None
+        try:
+            if quiz is None:
+                quiz = Quiz(name=model.name, description=model.description)
+                self.session.add(quiz)
+                self.session.flush()
+                stored_questions = {}
+            else:
+                quiz.name, quiz.description = model.name, model.description
+                stored_questions = self._get_questions_hashes(quiz.id)
+
+            new_questions, changed_questions = [], {}
+            for key, question in question_keys(model.questions):
+                stored_question = stored_questions.pop(key, None)
+                if stored_question is None:
+                    new_questions.append(question)
+                elif stored_question[1] != question_content_hash(question):
+                    changed_questions[stored_question[0]] = question
+
+            self._insert_questions(quiz.id, new_questions, batch_size, with_hashes=True)
+            self._update_questions(changed_questions, batch_size)
+            self._delete_questions([question_id for question_id, _ in stored_questions.values()], batch_size)
+            self._store_source_file(source, quiz.id)
+            self.session.commit()
+        except BaseException:
+            self.session.rollback()
+            raise
+
+        return QuizSyncResult(quiz_id=quiz.id, inserted=len(new_questions), updated=len(changed_questions),
+                              deleted=len(stored_questions))
+
+    def _get_questions_hashes(self, quiz_id: int) -> Dict[Tuple[str, int], Tuple[int, Optional[str]]]:
+        """Return quiz questions identifiers and content hashes by question keys. """
+        rows = self.session.execute(
+            select(Question.id, Question.text, QuestionHash.content_hash)
+            .outerjoin(QuestionHash, QuestionHash.question_id == Question.id)
+            .where(Question.quiz_id == quiz_id)
+            .order_by(Question.id)).all()
+
+        return {key: (row.id, row.content_hash) for key, row in question_keys(rows)}
+
+    def _update_questions(self, questions: Dict[int, QuestionModel], batch_size: int) -> None:
+        """Replace content and answers of questions with the given identifiers, keeping their user data. """
+        for questions_batch in batches(questions.items(), batch_size):
+            question_ids = [question_id for question_id, _ in questions_batch]
+            self.session.execute(
+                update(Question.__table__).where(Question.__table__.c.id == bindparam('question_id')),
+                [{'question_id': question_id, 'text': question.text, 'image_path': question.image_path,
+                  'comment': question.comment} for question_id, question in questions_batch])
+            self.session.execute(delete(Answer.__table__).where(Answer.question_id.in_(question_ids)))
+            self.session.execute(delete(QuestionHash.__table__).where(QuestionHash.question_id.in_(question_ids)))
+            answer_rows = [{'question_id': question_id, 'text': answer.text, 'is_correct': answer.is_correct}
+                           for question_id, question in questions_batch for answer in question.answers]
+            if answer_rows:
+                self.session.execute(insert(Answer.__table__), answer_rows)
+            self.session.execute(insert(QuestionHash.__table__), [
+                {'question_id': question_id, 'content_hash': question_content_hash(question)}
+                for question_id, question in questions_batch])
+
+    def _delete_questions(self, question_ids: List[int], batch_size: int) -> None:
+        """Delete questions with the given identifiers and every row depending on them. """
+        for ids_batch in batches(question_ids, batch_size):
+            for table in (Answer, QuestionUserData, QuestionHash):
+                self.session.execute(delete(table.__table__).where(table.question_id.in_(ids_batch)))
+            self.session.execute(delete(Question.__table__).where(Question.id.in_(ids_batch)))
+
+    def _next_id(self, table) -> int:
+        """Return the first identifier after the highest one stored in a table. """
+        return (self.session.execute(select(func.max(table.id))).scalar() or 0) + 1
+
+    @staticmethod
+    def _quiz_graph_options() -> tuple:
+        """Loader options fetching a whole quiz graph in a fixed number of queries.
+        Questions and answers are loaded with one subquery each, user data is joined to the questions query.
+        Unlike selectin loading, subquery loading is not chunked, so the number of queries doesn't grow with
+        the number of questions.
+        """
+        questions = subqueryload(Quiz.questions)
+        return questions.subqueryload(Question.answers), questions.joinedload(Question.user_data)
+
+    def _build_quiz_models(self, quiz_condition: Optional[Any] = None) -> List[QuizModel]:
+        """Build quiz models straight from rows of three queries: quizzes, questions joined with their user data
+        and answers. Models are constructed without validation, data in the database was validated when it was
+        stored. Only quizzes matching the condition are built.
+        """
+        quizzes_query = select(Quiz.id, Quiz.name, Quiz.description, Quiz.date).order_by(Quiz.id)
+        questions_query = select(Question.quiz_id, Question.id, Question.text, Question.image_path, Question.comment,
+                                 QuestionUserData.level, QuestionUserData.correct_answer,
+                                 QuestionUserData.comment.label('user_comment')) \
+            .outerjoin(QuestionUserData, QuestionUserData.question_id == Question.id).order_by(Question.id)
+        answers_query = select(Answer.question_id, Answer.id, Answer.text, Answer.is_correct) \
+            .join(Question, Question.id == Answer.question_id)
+        if quiz_condition is not None:
+            quizzes_query = quizzes_query.where(quiz_condition)
+            questions_query = questions_query.join(Quiz, Quiz.id == Question.quiz_id).where(quiz_condition)
+            answers_query = answers_query.join(Quiz, Quiz.id == Question.quiz_id).where(quiz_condition)
+
+        answers: Dict[int, List[AnswerModel]] = {}
+        for question_id, answer_id, text, is_correct in self.session.connection().execute(answers_query):
+            answers.setdefault(question_id, []).append(AnswerModel.construct(id=answer_id, text=text,
+                                                                             is_correct=is_correct))
+
+        questions: Dict[int, List[QuestionModel]] = {}
+        for quiz_id, question_id, text, image_path, comment, level, correct_answer, user_comment \
+                in self.session.connection().execute(questions_query):
+            user_data = QuestionUserDataModel.construct(level=level, correct_answer=correct_answer,
+                                                        comment=user_comment) if level is not None else None
+            questions.setdefault(quiz_id, []).append(QuestionModel.construct(
+                id=question_id, text=text, answers=sorted(answers.get(question_id, []), key=lambda answer: answer.id),
+                user_data=user_data, image_path=image_path, comment=comment))
+
+        return [QuizModel.construct(id=quiz_id, name=name, questions=questions.get(quiz_id, []),
+                                    description=description, date=str(date) if date is not None else None)
+                for quiz_id, name, description, date in self.session.connection().execute(quizzes_query)]
+
+    def get_quizzes(self, eager: bool = True, validate: bool = False) -> List[QuizModel]:
+        """Returns list of object representation of quizzes stored in a database.
+        By default models are built from raw rows without validation. If validate is set, they are validated from
+        ORM objects, and if eager is set as well, quizzes graphs are fetched up front instead of lazily.
+        """
+        if not validate:
+            return self._build_quiz_models()
+
+        query = self.session.query(Quiz).order_by(Quiz.id)
+        if eager:
+            query = query.options(*self._quiz_graph_options())
+        quizzes_orm_objects = query.all()
 
         return [QuizModel.from_orm(quiz_orm) for quiz_orm in quizzes_orm_objects]
 
     def get_quizzes_names(self) -> List[str]:
         """Return quizzes names. """
-        quizzes_orm_objects = self.session.query(Quiz.name).all()
+        quizzes_orm_objects = self.session.query(Quiz.name).order_by(Quiz.id).all()
 
         return [quiz_orm[0] for quiz_orm in quizzes_orm_objects]
 
-    def get_quiz(self, quiz_name: str) -> QuizModel:
-        """Return quiz object. """
-        quizzes_orm = self.session.query(Quiz).filter(Quiz.name.is_(quiz_name)).all()
+    def get_quizzes_summaries(self, offset: int = 0, limit: Optional[int] = None,
+                              name_filter: Optional[str] = None) -> List[QuizSummaryModel]:
+        """Return summaries of a page of quizzes, in the order of quizzes names read from their index, quizzes with
+        equal names in the order they were added: number of questions, number of questions on every level and time of
+        the last progress write of any of its questions. They are counted by one aggregate query over the page quizzes
+        only, so neither questions nor answers are loaded. Questions without progress are on the first level. If the
+        name filter is given, only quizzes with names containing it, ignoring case, are paged.
+        """
+        page = select(Quiz.id, Quiz.name).order_by(Quiz.name, Quiz.id).offset(offset).limit(limit)
+        if name_filter:
+            page = page.where(Quiz.name.contains(name_filter, autoescape=True))
+        page = page.subquery()
+        level = func.coalesce(QuestionUserData.level, 0)
+        query = select(page.c.id, page.c.name, func.max(QuestionUserData.last_studied), func.count(Question.id),
+                       *[func.count(Question.id).filter(level == level_number)
+                         for level_number in range(NUMBER_OF_LEVELS)]) \
+            .select_from(page) \
+            .outerjoin(Question, Question.quiz_id == page.c.id) \
+            .outerjoin(QuestionUserData, QuestionUserData.question_id == Question.id) \
+            .group_by(page.c.name, page.c.id).order_by(page.c.name, page.c.id)
+
+        return [QuizSummaryModel.construct(id=quiz_id, name=name, last_studied=last_studied,
+                                           number_of_questions=number_of_questions,
+                                           questions_on_levels=list(questions_on_levels))
+                for quiz_id, name, last_studied, number_of_questions, *questions_on_levels
+                in self.session.connection().execute(query)]
+
+    def search(self, query: str, offset: int = 0, limit: int = SEARCH_PAGE_SIZE) -> List[SearchResultModel]:
+        """Return a page of questions containing all words of the query in their text, answers or comment, best
+        matches first. Words match words starting with them, ignoring case and diacritics. Results have snippets of
+        the best matching field, with matched words between snippet markers.
+        """
+        match = search_query(query)
+        if not match:
+            return []
+        statement = text(
+            'SELECT question.id, question.quiz_id, quiz.name, question.text, '
+            'snippet(question_search, -1, :marker_start, :marker_end, :ellipsis, :tokens), '
+            f'bm25(question_search, {", ".join(map(str, self.SEARCH_WEIGHTS))}) AS score '
+            'FROM question_search JOIN question ON question.id = question_search.rowid '
+            'LEFT JOIN quiz ON quiz.id = question.quiz_id '
+            'WHERE question_search MATCH :match ORDER BY score LIMIT :limit OFFSET :offset')
+        rows = self.session.connection().execute(statement, {
+            'marker_start': self.SNIPPET_MARKERS[0], 'marker_end': self.SNIPPET_MARKERS[1], 'ellipsis': '...',
+            'tokens': self.SNIPPET_TOKENS, 'match': match, 'limit': limit, 'offset': offset})
+
+        return [SearchResultModel.construct(question_id=question_id, quiz_id=quiz_id, quiz_name=quiz_name,
+                                            text=question_text, snippet=snippet, rank=rank)
+                for question_id, quiz_id, quiz_name, question_text, snippet, rank in rows]
+
+    def get_quiz(self, quiz_name: str, eager: bool = True, validate: bool = False) -> QuizModel:
+        """Return quiz object. By default it is built from raw rows of a fixed number of queries, without validation.
+        If validate is set, it is validated from ORM objects, and if eager is set as well, the whole quiz graph is
+        fetched in a fixed number of queries instead of lazily, question by question.
+        """
+        if not validate:
+            return self._build_quiz_models(Quiz.name == quiz_name)[0]
+
+        query = self.session.query(Quiz).filter(Quiz.name == quiz_name)
+        if eager:
+            query = query.options(*self._quiz_graph_options())
+        quizzes_orm = query.all()
 
         return QuizModel.from_orm(quizzes_orm[0])
 
@@ -62,31 +485,44 @@ class DatabaseManager(metaclass=SingletonMeta):
         """Erase all quizzes from a database including depending on structures as questions and answers. """
         self.session.query(Answer).delete()
         self.session.query(QuestionUserData).delete()
+        self.session.query(QuestionHash).delete()
+        self.session.query(SourceFile).delete()
         self.session.query(Question).delete()
         self.session.query(Quiz).delete()
         self.session.commit()
 
     def update_question_user_data(self, user_data_model: QuestionUserDataModel, question_id: int) -> None:
-        """Update a question's user note and progress parameters. """
-        if not self.session.query(exists().where(QuestionUserData.question_id == question_id)).scalar():
-            question_user_data = QuestionUserData(**user_data_model.dict())
-            question_user_data.question_id = question_id
-            self.session.add(question_user_data)
-            self.session.commit()
-        else:
-            query = update(QuestionUserData) \
-                .where(QuestionUserData.id == question_id) \
-                .values(level=user_data_model.level,
-                        correct_answer=user_data_model.correct_answer,
-                        comment=user_data_model.comment) \
-                .execution_options(synchronize_session="fetch")
-            self.session.execute(query)
-            self.session.commit()
+        """Update a question's user note and progress parameters. It takes a single insert or update statement. """
+        self.session.execute(self._upsert_user_data_statement(datetime.now()),
+                             {'question_id': question_id, **user_data_model.dict()})
+        self.session.commit()
+
+    def update_questions_user_data(self, user_data_models: Dict[int, QuestionUserDataModel],
+                                   batch_size: int = BULK_BATCH_SIZE) -> None:
+        """Update user notes and progress parameters of many questions, given by question identifiers, in one
+        transaction. It uses its own session, so it may be called from a thread other than the one using the manager.
+        """
+        statement = self._upsert_user_data_statement(datetime.now())
+        with self.session_scope() as session:
+            for items_batch in batches(user_data_models.items(), batch_size):
+                session.execute(statement, [{'question_id': question_id, **user_data_model.dict()}
+                                            for question_id, user_data_model in items_batch])
+
+    @staticmethod
+    def _upsert_user_data_statement(studied_at: datetime) -> Insert:
+        """Statement inserting question user data or updating it if the question already has one. Progress is
+        written only while studying, so the row gets the studied time, imported progress is stored without it.
+        """
+        statement = sqlite_insert(QuestionUserData.__table__).values(last_studied=studied_at)
+        return statement.on_conflict_do_update(
+            index_elements=[QuestionUserData.question_id],
+            set_={'level': statement.excluded.level, 'correct_answer': statement.excluded.correct_answer,
+                  'comment': statement.excluded.comment, 'last_studied': statement.excluded.last_studied})
 
     @classmethod
-    def create_database(cls, database_path: str):
+    def create_database(cls, database_path: str, profile: str = DEFAULT_ENGINE_PROFILE):
         """ Create database in path, initialised tables and put record with database version. """
-        engine = create_engine(cls.DATABASE_PREFIX + database_path, echo=False)
+        engine = create_database_engine(database_path, profile)
         Base.metadata.create_all(engine)
 
         SessionClass = sessionmaker(bind=engine)
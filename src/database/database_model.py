@@ -1,5 +1,5 @@
 """Module contains models for object–relational mapping (ORM) communication with a database. """
-from sqlalchemy import Column, Integer, ForeignKey, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, Text, DateTime, Boolean, DDL, event
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.orm import relationship, backref
 
@@ -12,7 +12,7 @@ class Quiz(Base):
     __tablename__ = 'quiz'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    name = Column(Text, nullable=False)
+    name = Column(Text, nullable=False, index=True)
     description = Column(Text, nullable=True)
     date = Column(DateTime)
 
@@ -29,7 +29,7 @@ class Question(Base):
     __tablename__ = 'question'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    quiz_id = Column(Integer, ForeignKey("quiz.id"))
+    quiz_id = Column(Integer, ForeignKey("quiz.id"), index=True)
     text = Column(Text, nullable=False)
     image_path = Column(Text)
     comment = Column(Text)
@@ -48,10 +48,12 @@ class QuestionUserData(Base):
     __tablename__ = 'question_user_data'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    question_id = Column(Integer, ForeignKey("question.id"))
+    question_id = Column(Integer, ForeignKey("question.id"), index=True, unique=True)
     level = Column(Integer, nullable=False)
     correct_answer = Column(Integer, nullable=False)
     comment = Column(Text, nullable=True)
+    # Time of the last progress write while studying, progress stored by imports has none
+    last_studied = Column(DateTime, nullable=True)
 
     def __repr__(self):
         """ Model objects representation. It is to represent a class object as text. """
@@ -64,7 +66,7 @@ class Answer(Base):
     __tablename__ = 'answer'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    question_id = Column(Integer, ForeignKey("question.id"))
+    question_id = Column(Integer, ForeignKey("question.id"), index=True)
     text = Column(Text, nullable=False)
     is_correct = Column(Boolean)
 
@@ -86,3 +88,73 @@ class Version(Base):
     def __repr__(self):
         """ Model objects representation. It is to represent a class object as text. """
         return f'<Version (id=\'{self.id}\', major=\'{self.major}\', minor=\'{self.minor}\', patch=\'{self.patch}\')>'
+
+
+class SourceFile(Base):
+    """Quiz source file database table model. It keeps the state of an imported file to skip unchanged ones. """
+    __tablename__ = 'source_file'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    path = Column(Text, nullable=False, unique=True)
+    size = Column(Integer, nullable=False)
+    modification_time = Column(Integer, nullable=False)
+    content_hash = Column(Text, nullable=False)
+    quiz_id = Column(Integer, ForeignKey("quiz.id"))
+
+    def __repr__(self):
+        """ Model objects representation. It is to represent a class object as text. """
+        return f'<SourceFile (id=\'{self.id}\', path=\'{self.path}\', size=\'{self.size}\', ' \
+               f'modification_time=\'{self.modification_time}\', content_hash=\'{self.content_hash}\', ' \
+               f'quiz_id=\'{self.quiz_id}\')>'
+
+
+class QuestionHash(Base):
+    """Question content hash database table model. It is used to find changed questions while re-importing a quiz. """
+    __tablename__ = 'question_hash'
+
+    question_id = Column(Integer, ForeignKey("question.id"), primary_key=True)
+    content_hash = Column(Text, nullable=False)
+
+    def __repr__(self):
+        """ Model objects representation. It is to represent a class object as text. """
+        return f'<QuestionHash (question_id=\'{self.question_id}\', content_hash=\'{self.content_hash}\')>'
+
+
+# Full-text search index of questions: text, answers and comment. Row identifier is the question identifier, answers
+# of a question are indexed together, one per line. Triggers keep it in sync with questions and answers.
+QUESTION_SEARCH_TABLE = "CREATE VIRTUAL TABLE IF NOT EXISTS question_search USING fts5(text, answers, comment, " \
+                        "tokenize = 'unicode61 remove_diacritics 2')"
+
+
+def question_search_answers(question_id: str) -> str:
+    """Return SQL expression with answers of the question, in order, to be indexed. """
+    return f'(SELECT group_concat(text, char(10)) FROM (SELECT text FROM answer WHERE question_id = {question_id} ' \
+           f'ORDER BY id))'
+
+
+QUESTION_SEARCH_QUESTION_TRIGGERS = [
+    'CREATE TRIGGER IF NOT EXISTS question_search_question_inserted AFTER INSERT ON question BEGIN '
+    'INSERT INTO question_search (rowid, text, answers, comment) '
+    f'VALUES (NEW.id, NEW.text, {question_search_answers("NEW.id")}, NEW.comment); END',
+    'CREATE TRIGGER IF NOT EXISTS question_search_question_updated AFTER UPDATE OF text, comment ON question BEGIN '
+    'UPDATE question_search SET text = NEW.text, comment = NEW.comment WHERE rowid = NEW.id; END',
+    'CREATE TRIGGER IF NOT EXISTS question_search_question_deleted AFTER DELETE ON question BEGIN '
+    'DELETE FROM question_search WHERE rowid = OLD.id; END',
+]
+QUESTION_SEARCH_ANSWER_TRIGGERS = [
+    'CREATE TRIGGER IF NOT EXISTS question_search_answer_inserted AFTER INSERT ON answer BEGIN '
+    f'UPDATE question_search SET answers = {question_search_answers("NEW.question_id")} '
+    'WHERE rowid = NEW.question_id; END',
+    'CREATE TRIGGER IF NOT EXISTS question_search_answer_updated AFTER UPDATE OF text, question_id ON answer BEGIN '
+    f'UPDATE question_search SET answers = {question_search_answers("OLD.question_id")} '
+    'WHERE rowid = OLD.question_id; '
+    f'UPDATE question_search SET answers = {question_search_answers("NEW.question_id")} '
+    'WHERE rowid = NEW.question_id; END',
+    'CREATE TRIGGER IF NOT EXISTS question_search_answer_deleted AFTER DELETE ON answer BEGIN '
+    f'UPDATE question_search SET answers = {question_search_answers("OLD.question_id")} '
+    'WHERE rowid = OLD.question_id; END',
+]
+for statement in [QUESTION_SEARCH_TABLE, *QUESTION_SEARCH_QUESTION_TRIGGERS]:
+    event.listen(Question.__table__, 'after_create', DDL(statement))
+for statement in QUESTION_SEARCH_ANSWER_TRIGGERS:
+    event.listen(Answer.__table__, 'after_create', DDL(statement))
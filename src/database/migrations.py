@@ -0,0 +1,215 @@
+"""Upgrades of databases created by previous versions of the application, done in place.
+Every migration upgrades the database from one version to the next one with a list of operations. Operations run in
+their own, short transactions, so a large database isn't locked for the whole upgrade, and have to be idempotent,
+so an interrupted upgrade may be simply run again. Version is stored after all operations of a migration succeeded.
+Migrations are written in literal SQL, they upgrade to the schema of their version, whatever the current models are.
+"""
+from typing import Callable, List, NamedTuple, Sequence, Tuple
+
+from sqlalchemy import select, update, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+from database.database_model import Version
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+class MigrationError(Exception):
+    """Database can't be upgraded to the current version. """
+
+
+class Operation:
+    """Single idempotent operation of a migration. """
+
+    def run(self, engine: Engine) -> None:
+        """Run operation on the database. """
+        raise NotImplementedError
+
+
+class Transactional(Operation):
+    """Operation running a function in one transaction. """
+
+    def __init__(self, function: Callable[[Connection], None]):
+        """Constructor. """
+        self.function = function
+
+    def run(self, engine: Engine) -> None:
+        """Run function in a transaction. """
+        with engine.begin() as connection:
+            self.function(connection)
+
+
+class CreateIndex(Operation):
+    """Operation building an index in its own transaction, if it doesn't exist yet. Database is locked for writing
+    only while this index is built, readers aren't blocked in the write-ahead log mode.
+    """
+
+    def __init__(self, name: str, table: str, columns: Sequence[str], unique: bool = False):
+        """Constructor. """
+        self.name = name
+        self.table = table
+        self.columns = columns
+        self.unique = unique
+
+    def run(self, engine: Engine) -> None:
+        """Build index. """
+        with engine.begin() as connection:
+            connection.execute(text(f'CREATE {"UNIQUE " if self.unique else ""}INDEX IF NOT EXISTS {self.name} '
+                                    f'ON {self.table} ({", ".join(self.columns)})'))
+
+
+class Backfill(Operation):
+    """Operation running a statement on ranges of a table primary key, every range in its own transaction, so rows
+    are never loaded into memory at once. The statement gets the range as first_id and last_id parameters.
+    """
+
+    def __init__(self, table: str, statement: str, batch_size: int = BACKFILL_BATCH_SIZE):
+        """Constructor. """
+        self.table = table
+        self.statement = text(statement)
+        self.batch_size = batch_size
+
+    def run(self, engine: Engine) -> None:
+        """Run statement on every range of the primary key. """
+        with engine.connect() as connection:
+            first_id, last_id = connection.execute(text(f'SELECT min(id), max(id) FROM {self.table}')).one()
+        if first_id is None:
+            return
+        for batch_first_id in range(first_id, last_id + 1, self.batch_size):
+            with engine.begin() as connection:
+                connection.execute(self.statement, {'first_id': batch_first_id,
+                                                    'last_id': batch_first_id + self.batch_size - 1})
+
+
+class Migration(NamedTuple):
+    """Upgrade from a version to the next one. """
+    from_version: Tuple[int, int, int]
+    to_version: Tuple[int, int, int]
+    operations: List[Operation]
+
+
+def run_statement(statement: str) -> Operation:
+    """Return operation running an idempotent statement. """
+    return Transactional(lambda connection: connection.execute(text(statement)))
+
+
+def drop_index(name: str) -> Operation:
+    """Return operation dropping an index if it exists. """
+    return run_statement(f'DROP INDEX IF EXISTS {name}')
+
+
+def add_column(table: str, column: str, column_type: str) -> Operation:
+    """Return operation adding a nullable column if the table doesn't have it yet. """
+
+    def add(connection: Connection) -> None:
+        columns = {row.name for row in connection.exec_driver_sql(f'PRAGMA table_info({table})')}
+        if column not in columns:
+            connection.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {column_type}'))
+
+    return Transactional(add)
+
+
+MIGRATIONS: List[Migration] = [
+    # Add incremental import tables, remove duplicated questions user data, so the question identifier may be unique,
+    # and index foreign keys and quiz names.
+    Migration((0, 0, 1), (0, 0, 2), [
+        run_statement('CREATE TABLE IF NOT EXISTS source_file (id INTEGER NOT NULL, path TEXT NOT NULL, '
+                      'size INTEGER NOT NULL, modification_time INTEGER NOT NULL, content_hash TEXT NOT NULL, '
+                      'quiz_id INTEGER, PRIMARY KEY (id), UNIQUE (path), FOREIGN KEY(quiz_id) REFERENCES quiz (id))'),
+        run_statement('CREATE TABLE IF NOT EXISTS question_hash (question_id INTEGER NOT NULL, '
+                      'content_hash TEXT NOT NULL, PRIMARY KEY (question_id), '
+                      'FOREIGN KEY(question_id) REFERENCES question (id))'),
+        CreateIndex('tmp_question_user_data_question_id', 'question_user_data', ['question_id']),
+        Backfill('question_user_data',
+                 'DELETE FROM question_user_data WHERE id BETWEEN :first_id AND :last_id AND EXISTS '
+                 '(SELECT 1 FROM question_user_data AS newer WHERE newer.question_id = question_user_data.question_id '
+                 'AND newer.id > question_user_data.id)'),
+        CreateIndex('ix_quiz_name', 'quiz', ['name']),
+        CreateIndex('ix_question_quiz_id', 'question', ['quiz_id']),
+        CreateIndex('ix_answer_question_id', 'answer', ['question_id']),
+        CreateIndex('ix_question_user_data_question_id', 'question_user_data', ['question_id'], unique=True),
+        drop_index('tmp_question_user_data_question_id'),
+    ]),
+    # Keep time of the last progress write of every question for quizzes summaries.
+    Migration((0, 0, 2), (0, 0, 3), [
+        add_column('question_user_data', 'last_studied', 'DATETIME'),
+    ]),
+    # Add full-text search index of questions. Triggers are created first, so questions changed while the index is
+    # filled are kept in sync, and questions already indexed are skipped.
+    Migration((0, 0, 3), (0, 0, 4), [
+        run_statement("CREATE VIRTUAL TABLE IF NOT EXISTS question_search USING fts5(text, answers, comment, "
+                      "tokenize = 'unicode61 remove_diacritics 2')"),
+        run_statement('CREATE TRIGGER IF NOT EXISTS question_search_question_inserted AFTER INSERT ON question BEGIN '
+                      'INSERT INTO question_search (rowid, text, answers, comment) VALUES (NEW.id, NEW.text, '
+                      '(SELECT group_concat(text, char(10)) FROM '
+                      '(SELECT text FROM answer WHERE question_id = NEW.id ORDER BY id)), NEW.comment); END'),
+        run_statement('CREATE TRIGGER IF NOT EXISTS question_search_question_updated AFTER UPDATE OF text, comment '
+                      'ON question BEGIN '
+                      'UPDATE question_search SET text = NEW.text, comment = NEW.comment WHERE rowid = NEW.id; END'),
+        run_statement('CREATE TRIGGER IF NOT EXISTS question_search_question_deleted AFTER DELETE ON question BEGIN '
+                      'DELETE FROM question_search WHERE rowid = OLD.id; END'),
+        run_statement('CREATE TRIGGER IF NOT EXISTS question_search_answer_inserted AFTER INSERT ON answer BEGIN '
+                      'UPDATE question_search SET answers = (SELECT group_concat(text, char(10)) FROM '
+                      '(SELECT text FROM answer WHERE question_id = NEW.question_id ORDER BY id)) '
+                      'WHERE rowid = NEW.question_id; END'),
+        run_statement('CREATE TRIGGER IF NOT EXISTS question_search_answer_updated AFTER UPDATE OF text, question_id '
+                      'ON answer BEGIN '
+                      'UPDATE question_search SET answers = (SELECT group_concat(text, char(10)) FROM '
+                      '(SELECT text FROM answer WHERE question_id = OLD.question_id ORDER BY id)) '
+                      'WHERE rowid = OLD.question_id; '
+                      'UPDATE question_search SET answers = (SELECT group_concat(text, char(10)) FROM '
+                      '(SELECT text FROM answer WHERE question_id = NEW.question_id ORDER BY id)) '
+                      'WHERE rowid = NEW.question_id; END'),
+        run_statement('CREATE TRIGGER IF NOT EXISTS question_search_answer_deleted AFTER DELETE ON answer BEGIN '
+                      'UPDATE question_search SET answers = (SELECT group_concat(text, char(10)) FROM '
+                      '(SELECT text FROM answer WHERE question_id = OLD.question_id ORDER BY id)) '
+                      'WHERE rowid = OLD.question_id; END'),
+        Backfill('question',
+                 'INSERT INTO question_search (rowid, text, answers, comment) '
+                 'SELECT id, text, (SELECT group_concat(text, char(10)) FROM '
+                 '(SELECT text FROM answer WHERE question_id = question.id ORDER BY id)), comment FROM question '
+                 'WHERE id BETWEEN :first_id AND :last_id AND id NOT IN '
+                 '(SELECT rowid FROM question_search WHERE rowid BETWEEN :first_id AND :last_id)'),
+    ]),
+]
+LATEST_VERSION = MIGRATIONS[-1].to_version
+
+
+def get_database_version(connection: Connection) -> Tuple[int, int, int]:
+    """Return version of the database stored in the version table. Raise MigrationError if there is no version. """
+    try:
+        row = connection.execute(
+            select(Version.major, Version.minor, Version.patch).order_by(Version.id.desc()).limit(1)).first()
+    except OperationalError as error:
+        raise MigrationError('Database has no version table, it wasn\'t created by this application.') from error
+    if row is None:
+        raise MigrationError('Database version table is empty, version of the database is unknown.')
+    return tuple(row)
+
+
+def set_database_version(connection: Connection, version: Tuple[int, int, int]) -> None:
+    """Store version of the database in the version table. """
+    connection.execute(update(Version).values(major=version[0], minor=version[1], patch=version[2]))
+
+
+def upgrade_database(engine: Engine, migrations: List[Migration] = MIGRATIONS) -> List[Tuple[int, int, int]]:
+    """Read the database version and apply migrations in order, until the latest version is reached.
+    Return versions the database was upgraded to. Raise MigrationError if the stored version is unknown.
+    """
+    with engine.connect() as connection:
+        version = get_database_version(connection)
+    applied_versions = []
+    for migration in migrations:
+        if migration.from_version != version:
+            continue
+        for operation in migration.operations:
+            operation.run(engine)
+        with engine.begin() as connection:
+            set_database_version(connection, migration.to_version)
+        version = migration.to_version
+        applied_versions.append(version)
+
+    if version != migrations[-1].to_version:
+        raise MigrationError(f'Database version {".".join(map(str, version))} can\'t be upgraded.')
+    return applied_versions
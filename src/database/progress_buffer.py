@@ -0,0 +1,80 @@
+"""Write-behind buffer of questions progress. It keeps the user interface thread away from disk writes. """
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from database.database_manager import DatabaseManager
+from question_model import QuestionUserDataModel
+
+
+class ProgressBuffer:
+    """Collect questions user data changes and write them in one transaction, in a background thread.
+    Changes are flushed after max_pending questions were changed, max_delay_ms milliseconds after the first pending
+    change or when flush or close is called. Only the latest change of a question is written.
+    """
+    MAX_PENDING = 20
+    MAX_DELAY_MS = 2000
+
+    def __init__(self, database_manager: DatabaseManager, max_pending: int = MAX_PENDING,
+                 max_delay_ms: int = MAX_DELAY_MS):
+        """Constructor. """
+        self.database_manager = database_manager
+        self.max_pending = max_pending
+        self.max_delay_ms = max_delay_ms
+
+        self._pending: Dict[int, QuestionUserDataModel] = {}
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._closed = False
+        # Single writer thread keeps the order of flushes
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='progress-writer')
+
+    def add(self, user_data_model: QuestionUserDataModel, question_id: int) -> None:
+        """Add question user data change. The model is copied, so it may be changed afterwards. """
+        with self._lock:
+            self._pending[question_id] = user_data_model.copy()
+            pending = len(self._pending)
+            if pending < self.max_pending:
+                self._start_timer()
+        if pending >= self.max_pending:
+            self.flush()
+
+    def _start_timer(self) -> None:
+        """Schedule flush after the delay, unless it is already scheduled or the buffer is closed. It has to be
+        called with the lock held.
+        """
+        if self._timer is None and not self._closed:
+            self._timer = threading.Timer(self.max_delay_ms / 1000, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self) -> Future:
+        """Write pending changes in the background. Returned future is done when they are written. """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            pending, self._pending = self._pending, {}
+        return self._executor.submit(self._write, pending)
+
+    def _write(self, pending: Dict[int, QuestionUserDataModel]) -> None:
+        """Write changes to the database. If it fails, changes are put back and written again after the delay. """
+        if not pending:
+            return
+        try:
+            self.database_manager.update_questions_user_data(pending)
+        except BaseException:
+            with self._lock:
+                self._pending = {**pending, **self._pending}
+                self._start_timer()
+            raise
+
+    def close(self) -> None:
+        """Write pending changes and wait until everything is written. Exception of the last write is raised, so
+        progress which couldn't be saved isn't lost silently.
+        """
+        with self._lock:
+            self._closed = True
+        future = self.flush()
+        self._executor.shutdown(wait=True)
+        future.result()
@@ -1,41 +1,69 @@
 """ Quiz txt file parser """
 import re
+from typing import Iterable, Iterator, Tuple
 
 from question_model import QuizModel, QuestionModel, AnswerModel
 
+QUIZ_NAME_PATTERN = re.compile(r'## (.+)')
+# Every quiz line is classified and its content captured with a single match. Type of the line is the name of
+# the last matched group: question, answer or image. Lines not matching the pattern belong to a comment.
+LINE_PATTERN = re.compile(r'#### (?P<question>.+)'
+                          r'|- \[(?P<mark>.)\] (?P<answer>.+)'
+                          r'|!\[.*\]\((?P<image>.+?)\)')
+
 
 def parse_quiz_text(text: str) -> QuizModel:
     """Parse text and return quiz model structure. """
-    text_lines = text.split('\n')
-    text_lines = [line for line in text_lines if line]
-    quiz_name = re.search(r'^## (.+?)$', text_lines[0]).group(1)
-    questions = []
+    quiz_name, questions = parse_quiz_stream(text.split('\n'))
+
+    return QuizModel(name=quiz_name, questions=list(questions))
+
+
+def parse_quiz_stream(lines: Iterable[str]) -> Tuple[str, Iterator[QuestionModel]]:
+    """Parse quiz lines one by one, e.g. straight from an opened file, without keeping the whole text in memory.
+    Return quiz name and generator yielding questions as soon as they are finished.
+    It raises ValueError if there are no lines or the first line isn't the quiz name header.
+    """
+    text_lines = (line.rstrip('\n') for line in lines)
+    text_lines = (line for line in text_lines if line)
+    first_line = next(text_lines, None)
+    if first_line is None:
+        raise ValueError('Quiz is empty')
+    quiz_name_match = QUIZ_NAME_PATTERN.fullmatch(first_line)
+    if quiz_name_match is None:
+        raise ValueError(f'Quiz must start with the "## <quiz name>" header, not: {first_line!r}')
+    quiz_name = quiz_name_match.group(1)
+
+    return quiz_name, _parse_questions(text_lines)
+
+
+def _parse_questions(text_lines: Iterator[str]) -> Iterator[QuestionModel]:
+    """Generator of questions parsed from quiz lines following the quiz name. """
     question_text = ''
     answers = []
-    comment = ''
+    comment_lines = []
     first_element = True
     image_path = None
 
-    for line in text_lines[1:]:
-        if line.startswith('####'):
+    for line in text_lines:
+        token = LINE_PATTERN.fullmatch(line)
+        token_type = token.lastgroup if token else None
+        if token_type == 'question':
             if not first_element:
-                questions.append(QuestionModel(
-                    text=question_text, answers=answers, image_path=image_path, comment=comment.rstrip()))
+                yield QuestionModel(
+                    text=question_text, answers=answers, image_path=image_path,
+                    comment='\n'.join(comment_lines).rstrip())
                 answers = []
-                comment = ''
+                comment_lines = []
                 image_path = None
             else:
                 first_element = False
-            question_text = re.search(r'^#### (.+?)$', line).group(1)
-        elif line.startswith('-'):
-            is_correct = False
-            if re.match(r'^- \[x\]', line):
-                is_correct = True
-            answers.append(AnswerModel(text=re.search(r'^- \[.\] (.+?)$', line).group(1), is_correct=is_correct))
-        elif line.startswith('!['):
-            image_path = re.search(r'^!\[.*\]\((.+?)\)$', line).group(1)
+            question_text = token['question']
+        elif token_type == 'answer':
+            answers.append(AnswerModel(text=token['answer'], is_correct=token['mark'] == 'x'))
+        elif token_type == 'image':
+            image_path = token['image']
         else:
-            comment += f'{line}\n'
-    questions.append(QuestionModel(text=question_text, answers=answers, image_path=image_path, comment=comment.rstrip()))
-
-    return QuizModel(name=quiz_name, questions=questions)
+            comment_lines.append(line)
+    yield QuestionModel(
+        text=question_text, answers=answers, image_path=image_path, comment='\n'.join(comment_lines).rstrip())
@@ -37,6 +37,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.current_widget = self.strategy.widget
         self.strategy.strategy_change.connect(self.set_strategy)
 
+        # Strategies are created lazily, their widgets are added when they are shown for the first time
+        if self.stack_widget.indexOf(self.current_widget) == -1:
+            self.stack_widget.addWidget(self.current_widget)
         self.stack_widget.setCurrentWidget(self.current_widget)
 
     def set_stack_widgets(self, widgets_iterator: Iterator):
@@ -0,0 +1,76 @@
+"""Lazy list model of quizzes. Quizzes summaries are fetched from the database page by page, when the view scrolls
+to them, so the list opens in the same time however many quizzes are stored.
+"""
+from typing import Any, Callable, List, Optional, TYPE_CHECKING
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+if TYPE_CHECKING:
+    from question_model import QuizSummaryModel
+
+# Function returning summaries of a page of quizzes: offset, limit and name filter are given
+FetchQuizzesSummaries = Callable[[int, int, Optional[str]], List['QuizSummaryModel']]
+
+
+def get_quiz_description(summary: 'QuizSummaryModel') -> str:
+    """Get text describing the quiz: its name, number of questions learnt and the day it was last studied. """
+    description = f'{summary.name} ({summary.questions_on_levels[-1]}/{summary.number_of_questions} learnt'
+    if summary.last_studied is not None:
+        description += f', last studied {summary.last_studied:%Y-%m-%d}'
+    return description + ')'
+
+
+class QuizListModel(QAbstractListModel):
+    """List model of quizzes summaries, fetched on demand. Names of quizzes are kept in the QUIZ_NAME_ROLE role. """
+    QUIZ_NAME_ROLE = Qt.UserRole
+    PAGE_SIZE = 100
+
+    def __init__(self, fetch_summaries: FetchQuizzesSummaries, page_size: int = PAGE_SIZE, parent=None):
+        """Constructor. No quiz is fetched until the view asks for rows. """
+        super().__init__(parent)
+        self.fetch_summaries = fetch_summaries
+        self.page_size = page_size
+        self.summaries: List['QuizSummaryModel'] = []
+        self.name_filter: Optional[str] = None
+        self._all_fetched = False
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        """Number of quizzes fetched so far. """
+        return 0 if parent.isValid() else len(self.summaries)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        """Description of the quiz for display or its name for the quiz name role. """
+        if not index.isValid() or not 0 <= index.row() < len(self.summaries):
+            return None
+        summary = self.summaries[index.row()]
+        if role == Qt.DisplayRole:
+            return get_quiz_description(summary)
+        if role == self.QUIZ_NAME_ROLE:
+            return summary.name
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        """Check if there may be more quizzes in the database. """
+        return not parent.isValid() and not self._all_fetched
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        """Fetch the next page of quizzes. A page shorter than the page size is the last one. """
+        if not self.canFetchMore(parent):
+            return
+        page = self.fetch_summaries(len(self.summaries), self.page_size, self.name_filter)
+        self._all_fetched = len(page) < self.page_size
+        if not page:
+            return
+        self.beginInsertRows(QModelIndex(), len(self.summaries), len(self.summaries) + len(page) - 1)
+        self.summaries.extend(page)
+        self.endInsertRows()
+
+    def set_name_filter(self, name_filter: Optional[str]) -> None:
+        """Show only quizzes with names containing the filter. Fetched quizzes are dropped, the view fetches them
+        again from the first page.
+        """
+        self.beginResetModel()
+        self.name_filter = name_filter or None
+        self.summaries = []
+        self._all_fetched = False
+        self.endResetModel()
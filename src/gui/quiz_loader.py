@@ -0,0 +1,63 @@
+"""Background loading of quizzes. It keeps the user interface thread responsive while a quiz is read. """
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from database.database_manager import DatabaseManager
+from question_store import StudyModel
+
+
+class QuizLoaderSignals(QObject):
+    """Signals of the quiz loader. They are emitted from a worker thread and delivered in the receiver thread. """
+    progress = Signal(int, str)
+    finished = Signal(object)
+    failed = Signal(str)
+    cancelled = Signal()
+
+
+class QuizLoader(QRunnable):
+    """Load a quiz from the database and build its study model in a thread pool worker.
+    Cancellation is cooperative: it is checked between loading steps and the result of a cancelled load is dropped.
+    """
+    LOADING_QUIZ_STEP = 'Loading quiz'
+    BUILDING_MODEL_STEP = 'Preparing questions'
+    NUMBER_OF_STEPS = 2
+
+    def __init__(self, quiz_name: str, database_manager: DatabaseManager):
+        """Constructor. """
+        super().__init__()
+        self.quiz_name = quiz_name
+        self.database_manager = database_manager
+        self.signals = QuizLoaderSignals()
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Request the loading to stop. """
+        self._cancelled.set()
+
+    def is_cancelled(self) -> bool:
+        """Check if the loading was cancelled. """
+        return self._cancelled.is_set()
+
+    def run(self) -> None:
+        """Load the quiz. Exactly one of finished, failed or cancelled signals is emitted. """
+        try:
+            self.signals.progress.emit(0, self.LOADING_QUIZ_STEP)
+            quiz_model = self.database_manager.get_quiz(self.quiz_name)
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+                return
+
+            self.signals.progress.emit(1, self.BUILDING_MODEL_STEP)
+            learning_model = StudyModel.create_from_quiz_model(quiz_model)
+            if self.is_cancelled():
+                self.signals.cancelled.emit()
+                return
+
+            self.signals.progress.emit(self.NUMBER_OF_STEPS, self.BUILDING_MODEL_STEP)
+            self.signals.finished.emit(learning_model)
+        except Exception as error:
+            self.signals.failed.emit(str(error))
+        finally:
+            # Worker threads get their own scoped sessions, they are released with the thread's work
+            self.database_manager.close_session()
@@ -1,5 +1,5 @@
 """TODO """
-from typing import Iterator
+from typing import Callable, Dict, Iterator
 
 from PySide6.QtCore import QObject, Signal
 from PySide6.QtWidgets import QWidget
@@ -7,24 +7,33 @@ from PySide6.QtWidgets import QWidget
 from gui.widgets import MenuWidget
 
 
+StrategyFactory = Callable[[], QObject]
+
+
 class MainMenuStrategy(QObject):
-    """TODO """
+    """Main menu strategy. Sub-strategies are created the first time user navigates to them. """
     strategy_change = Signal(QObject)
 
+    QUIZ = 'quiz'
+    ABOUT_PROGRAM = 'about_program'
+    MANAGE_QUIZ = 'manage_quiz'
+    CREATE_QUIZ = 'create_quiz'
+
     def __init__(self,
-                 quiz_strategy: QObject,
-                 about_program_strategy: QObject,
-                 manage_quiz_strategy: QObject,
-                 create_quiz_strategy: QObject):
-        """TODO """
+                 quiz_strategy: StrategyFactory,
+                 about_program_strategy: StrategyFactory,
+                 manage_quiz_strategy: StrategyFactory,
+                 create_quiz_strategy: StrategyFactory):
+        """Constructor. Sub-strategies are given as factories, e.g. strategy classes. """
         super().__init__()
 
         self.widget = MenuWidget()
 
-        self.quiz_strategy = quiz_strategy
-        self.about_program_strategy = about_program_strategy
-        self.manage_quiz_strategy = manage_quiz_strategy
-        self.create_quiz_strategy = create_quiz_strategy
+        self.strategy_factories: Dict[str, StrategyFactory] = {self.QUIZ: quiz_strategy,
+                                                               self.ABOUT_PROGRAM: about_program_strategy,
+                                                               self.MANAGE_QUIZ: manage_quiz_strategy,
+                                                               self.CREATE_QUIZ: create_quiz_strategy}
+        self.strategies: Dict[str, QObject] = {}
 
         self.init_gui_signals()
 
@@ -37,24 +46,28 @@ class MainMenuStrategy(QObject):
 
     def run_about(self):
         """Serve about application button action. """
-        self.strategy_change.emit(self.about_program_strategy)
+        self.strategy_change.emit(self.get_strategy(self.ABOUT_PROGRAM))
 
     def run_start_quiz(self):
         """Serve start quiz button action. """
-        self.strategy_change.emit(self.quiz_strategy)
+        self.strategy_change.emit(self.get_strategy(self.QUIZ))
 
     def run_create_new_quiz(self):
         """Serve create new quiz button action. """
-        self.strategy_change.emit(self.create_quiz_strategy)
+        self.strategy_change.emit(self.get_strategy(self.CREATE_QUIZ))
 
     def run_manage_quizzes(self):
         """Serve manage quizzes button action. """
-        self.strategy_change.emit(self.manage_quiz_strategy)
+        self.strategy_change.emit(self.get_strategy(self.MANAGE_QUIZ))
+
+    def get_strategy(self, name: str) -> QObject:
+        """Get sub-strategy by name, creating it on first use. """
+        if name not in self.strategies:
+            self.strategies[name] = self.strategy_factories[name]()
+        return self.strategies[name]
 
     def get_widgets(self) -> Iterator[QWidget]:
-        """ Get this strategy and sub-strategies widgets. """
+        """ Get this strategy and already created sub-strategies widgets. """
         yield self.widget
-        yield from self.quiz_strategy.get_widgets()
-        yield from self.about_program_strategy.get_widgets()
-        yield from self.manage_quiz_strategy.get_widgets()
-        yield from self.create_quiz_strategy.get_widgets()
+        for strategy in self.strategies.values():
+            yield from strategy.get_widgets()
@@ -1,17 +1,17 @@
 """TODO """
 from enum import auto, Enum
-from functools import partial
-from typing import List
+from typing import List, Optional
 
 from PySide6.QtCharts import QBarSet, QChart, QChartView, QHorizontalPercentBarSeries
 from PySide6.QtCore import QObject, Signal, QMargins
 from PySide6.QtGui import QPainter, QColor, QColorConstants
-from PySide6.QtWidgets import QVBoxLayout, QCheckBox, QWidget, QSizePolicy
+from PySide6.QtWidgets import QWidget, QSizePolicy, QApplication
 
 from database.database_manager import DatabaseManager
+from database.progress_buffer import ProgressBuffer
 from gui.common import PREVIOUS_STRATEGY
 from gui.widgets import QuestionWidget
-from question_model import QuestionModel, LearningModel
+from question_store import StudyModel, StudyQuestion
 
 
 def blend_colors(first_color: QColor, second_color: QColor, number_of_steps: int) -> QColor:
@@ -27,30 +27,44 @@ def blend_colors(first_color: QColor, second_color: QColor, number_of_steps: int
         yield QColor(*rgb_color)
 
 
-def create_progress_chart(levels_questions: List[int]) -> QWidget:
-    """Create progress chart from the input data. """
-    data_sets = [QBarSet(str(index)) for index, _ in enumerate(levels_questions)]
-    [single_Set.append([value]) for single_Set, value in zip(data_sets, levels_questions)]
-    [single_Set.setColor(color) for single_Set, color in
-     zip(data_sets, blend_colors(QColorConstants.Red, QColorConstants.Green, len(levels_questions)))]
+class ProgressChart(QChartView):
+    """Chart of the number of questions on every learning level.
+    Bars are created once and their values are updated in place, so the chart may be kept for the whole session.
+    """
 
-    series = QHorizontalPercentBarSeries()
-
-    [series.append(single_Set) for single_Set in data_sets]
-
-    chart = QChart()
-    chart.addSeries(series)
-    chart.setSizePolicy(QSizePolicy.Maximum, QSizePolicy.Maximum)
-
-    chart.legend().setVisible(False)
-    margins = QMargins(0, 0, 0, 0)
-    chart.setMargins(margins)
-    chart.setSizePolicy(QSizePolicy.Maximum, QSizePolicy.Maximum)
-    chart_view = QChartView(chart)
-    chart_view.setRenderHint(QPainter.Antialiasing)
-    chart_view.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-
-    return chart_view
+    def __init__(self, *args, **kwargs):
+        """Constructor. """
+        super().__init__(*args, **kwargs)
+        self.bar_sets: List[QBarSet] = []
+        self.series = QHorizontalPercentBarSeries()
+
+        chart = QChart()
+        chart.addSeries(self.series)
+        chart.legend().setVisible(False)
+        chart.setMargins(QMargins(0, 0, 0, 0))
+        chart.setSizePolicy(QSizePolicy.Maximum, QSizePolicy.Maximum)
+        self.setChart(chart)
+        self.setRenderHint(QPainter.Antialiasing)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+
+    def set_levels(self, levels_questions: List[int]) -> None:
+        """Show the number of questions on every level. Bars are recreated only if the number of levels changes. """
+        if len(levels_questions) != len(self.bar_sets):
+            self._create_bar_sets(len(levels_questions))
+        for bar_set, value in zip(self.bar_sets, levels_questions):
+            if bar_set.at(0) != value:
+                bar_set.replace(0, value)
+
+    def _create_bar_sets(self, number_of_levels: int) -> None:
+        """Replace bars with a set for every level, colored from red to green. """
+        self.series.clear()
+        self.bar_sets = [QBarSet(str(index)) for index in range(number_of_levels)]
+        colors = blend_colors(QColorConstants.Red, QColorConstants.Green, number_of_levels) \
+            if number_of_levels > 1 else [QColorConstants.Green]
+        for bar_set, color in zip(self.bar_sets, colors):
+            bar_set.append(0)
+            bar_set.setColor(color)
+            self.series.append(bar_set)
 
 
 class QuestionStrategy(QObject):
@@ -79,8 +93,8 @@ class QuestionStrategy(QObject):
             self.answer_model[index] = not self.answer_model[index]
 
         def new_question(self):
-            self.answer_model = []
-            self.correct_answer_model = []
+            self.answer_model.clear()
+            self.correct_answer_model.clear()
 
         def is_correct(self) -> bool:
             return self.answer_model == self.correct_answer_model
@@ -99,10 +113,13 @@ class QuestionStrategy(QObject):
         self.widget_state = self.QuestionWidgetState.CHECK_QUESTION
 
         self.widget = QuestionWidget()
+        self.progress_chart = ProgressChart()
+        self.widget.chart_layout.addWidget(self.progress_chart)
         self.manage_answer = self.ManageAnswer()
 
         self.question_iterator = None
         self.database_manager = DatabaseManager()
+        self.progress_buffer = ProgressBuffer(self.database_manager)
 
         self.init_gui_signals()
 
@@ -110,9 +127,12 @@ class QuestionStrategy(QObject):
         """ Initiate graphic user interface signals connections. """
         self.widget.back_btn.clicked.connect(self.back_button)
         self.widget.check_next_btn.clicked.connect(self.next_or_check_question)
+        self.widget.answer_clicked.connect(self.manage_answer.update_answer)
+        QApplication.instance().aboutToQuit.connect(self.progress_buffer.close)
 
     def back_button(self):
-        """Action for back button clicked signal. """
+        """Action for back button clicked signal. Progress of the quiz is written before leaving it. """
+        self.progress_buffer.flush()
         self.strategy_change.emit(PREVIOUS_STRATEGY)
 
     def get_widgets(self) -> QWidget:
@@ -123,10 +143,14 @@ class QuestionStrategy(QObject):
         """Set current quiz. """
         self.quiz_name = quiz_name
 
-    def start_quiz(self):
-        """TODO"""
-        quiz_model = self.database_manager.get_quiz(self.quiz_name)
-        self.question_iterator = LearningModel.create_from_quiz_model(quiz_model)
+    def start_quiz(self, learning_model: Optional[StudyModel] = None):
+        """Start the current quiz. A learning model loaded in the background may be given, otherwise it is loaded
+        synchronously.
+        """
+        if learning_model is None:
+            quiz_model = self.database_manager.get_quiz(self.quiz_name)
+            learning_model = StudyModel.create_from_quiz_model(quiz_model)
+        self.question_iterator = learning_model
         self.draw_next_question()
 
     def draw_next_question(self):
@@ -142,19 +166,14 @@ class QuestionStrategy(QObject):
         self.widget.incorrect_answer_lbl.hide()
 
         self.manage_answer.new_question()
-        self.current_question: QuestionModel = question_model
+        self.current_question: StudyQuestion = question_model
 
         self.widget.question_text_lbl.setText(question_model.text)
 
-        self.widget.delete_subwidgets(self.widget.main_layout.findChild(QVBoxLayout, 'answers_layout'))
-
-        for index, answer in enumerate(question_model.answers):
+        for answer in question_model.answers:
             self.manage_answer.add_answer(answer.is_correct)
-            answer_check_box = QCheckBox(answer.text)
-            answer_check_box.clicked.connect(partial(self.manage_answer.update_answer, index))
-            self.widget.main_layout.findChild(QVBoxLayout, 'answers_layout').addWidget(answer_check_box)
-        progress_chart = create_progress_chart(self.question_iterator.get_number_of_questions_on_levels())
-        self.widget.findChild(QVBoxLayout, 'chart_layout').addWidget(progress_chart)
+        self.widget.set_answers([answer.text for answer in question_model.answers])
+        self.progress_chart.set_levels(self.question_iterator.get_number_of_questions_on_levels())
 
         self.widget.check_next_btn.setText(self.CHECK_QUESTION_LABEL)
         self.widget_state = self.QuestionWidgetState.CHECK_QUESTION
@@ -166,11 +185,11 @@ class QuestionStrategy(QObject):
         if self.widget_state == self.QuestionWidgetState.CHECK_QUESTION:
             self.widget.check_next_btn.setText(self.NEXT_QUESTION_LABEL)
             self.widget_state = self.QuestionWidgetState.NEXT_QUESTION
-            self.widget.disable_subwidgets(self.widget.main_layout.findChild(QVBoxLayout, 'answers_layout'))
-
-            self.widget.green_subwidgets_at(
-                self.widget.main_layout.findChild(QVBoxLayout, 'answers_layout'),
-                [i for i in range(self.widget.main_layout.findChild(QVBoxLayout, 'answers_layout').count())])
+            self.widget.disable_answers()
+            # Every answer style is set once, style sheets are costly to apply
+            differences = self.manage_answer.get_differences()
+            self.widget.green_answers_at([index for index in range(self.widget.number_of_answers)
+                                          if index not in differences])
 
             if self.manage_answer.is_correct():
                 self.widget.correct_answer_lbl.show()
@@ -178,12 +197,10 @@ class QuestionStrategy(QObject):
                 self.question_iterator.update_question(self.current_question)
             else:
                 self.widget.incorrect_answer_lbl.show()
-                self.widget.red_subwidgets_at(
-                    self.widget.main_layout.findChild(QVBoxLayout, 'answers_layout'),
-                    self.manage_answer.get_differences())
+                self.widget.red_answers_at(differences)
                 self.current_question.incorrect_answer()
-            self.database_manager.update_question_user_data(user_data_model=self.current_question.user_data,
-                                                            question_id=self.current_question.id)
+            self.progress_buffer.add(user_data_model=self.current_question.user_data,
+                                     question_id=self.current_question.id)
         elif self.widget_state == self.QuestionWidgetState.NEXT_QUESTION:
             self.widget.check_next_btn.setText(self.CHECK_QUESTION_LABEL)
             self.widget_state = self.QuestionWidgetState.CHECK_QUESTION
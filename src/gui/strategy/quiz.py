@@ -1,27 +1,42 @@
 """TODO """
-from PySide6.QtCore import QObject, Signal
-from PySide6.QtWidgets import QWidget
+from typing import Optional, TYPE_CHECKING
+
+from PySide6.QtCore import QObject, Signal, QThreadPool, Qt
+from PySide6.QtWidgets import QWidget, QProgressDialog, QMessageBox
 
 from database.database_manager import DatabaseManager
 from gui.common import PREVIOUS_STRATEGY
-from gui.strategy.question import QuestionStrategy
+from gui.quiz_list_model import QuizListModel
+from gui.quiz_loader import QuizLoader
 from gui.widgets import ChooseQuizWidget
+from question_store import StudyModel
+
+if TYPE_CHECKING:
+    from gui.strategy.question import QuestionStrategy
 
 
 class QuizStrategy(QObject):
     """Menu chose a quiz strategy class. """
     strategy_change = Signal(QObject)
 
+    # Quick loads finish before the progress dialog shows up, so it does not flash
+    PROGRESS_DIALOG_DELAY_MS = 300
+
     def __init__(self):
         """Constructor. """
         super().__init__()
 
         choose_quiz_widget = ChooseQuizWidget()
-        database_manager = DatabaseManager()
-        choose_quiz_widget.set_quizzes_to_chose_from(database_manager.get_quizzes_names())
+        self.database_manager = DatabaseManager()
+        self.quizzes_model = QuizListModel(self.database_manager.get_quizzes_summaries)
+        choose_quiz_widget.set_quizzes_model(self.quizzes_model)
         choose_quiz_widget.choose_quiz.connect(self.choose_quiz)
         self.widget = choose_quiz_widget
-        self.question_strategy = QuestionStrategy()
+        self.question_strategy: Optional['QuestionStrategy'] = None
+
+        self.thread_pool = QThreadPool.globalInstance()
+        self.loader: Optional[QuizLoader] = None
+        self.progress_dialog: Optional[QProgressDialog] = None
 
         self.init_gui_signals()
 
@@ -34,12 +49,82 @@ class QuizStrategy(QObject):
         self.strategy_change.emit(PREVIOUS_STRATEGY)
 
     def choose_quiz(self, quiz_name: str):
-        """ TODO """
-        self.question_strategy.set_quiz(quiz_name)
-        self.question_strategy.start_quiz()
-        self.strategy_change.emit(self.question_strategy)
+        """Load chosen quiz in the background. The question widget is shown when the loading finishes. """
+        self.cancel_loading()
+
+        loader = QuizLoader(quiz_name, self.database_manager)
+        loader.signals.progress.connect(self.loading_progress)
+        loader.signals.finished.connect(self.loading_finished)
+        loader.signals.failed.connect(self.loading_failed)
+        self.loader = loader
+
+        self.progress_dialog = QProgressDialog(QuizLoader.LOADING_QUIZ_STEP, 'Cancel', 0, QuizLoader.NUMBER_OF_STEPS,
+                                               self.widget)
+        self.progress_dialog.setWindowTitle(quiz_name)
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.setMinimumDuration(self.PROGRESS_DIALOG_DELAY_MS)
+        self.progress_dialog.canceled.connect(self.cancel_loading)
+
+        self.thread_pool.start(loader)
+
+    def cancel_loading(self):
+        """Cancel the quiz loading in progress, if there is any. """
+        if self.loader is not None:
+            self.loader.cancel()
+            self.loader = None
+        self.close_progress_dialog()
+
+    def loading_progress(self, step: int, description: str):
+        """Show progress of the quiz loading. """
+        if self.progress_dialog is not None and self.sender() is self._current_signals():
+            self.progress_dialog.setLabelText(description)
+            self.progress_dialog.setValue(step)
+
+    def loading_finished(self, learning_model: StudyModel):
+        """Start the loaded quiz and switch to the question widget. """
+        # Result of a load cancelled after it finished may still be queued
+        if self.sender() is not self._current_signals():
+            return
+        quiz_name = self.loader.quiz_name
+        self.loader = None
+        self.close_progress_dialog()
+
+        question_strategy = self.get_question_strategy()
+        question_strategy.set_quiz(quiz_name)
+        question_strategy.start_quiz(learning_model)
+        self.strategy_change.emit(question_strategy)
+
+    def loading_failed(self, message: str):
+        """Inform about the quiz loading failure. """
+        if self.sender() is not self._current_signals():
+            return
+        quiz_name = self.loader.quiz_name
+        self.loader = None
+        self.close_progress_dialog()
+        QMessageBox.warning(self.widget, quiz_name, f'Quiz could not be loaded: {message}')
+
+    def close_progress_dialog(self):
+        """Close the progress dialog. """
+        if self.progress_dialog is not None:
+            # Closing the dialog must not cancel the next loading
+            self.progress_dialog.canceled.disconnect(self.cancel_loading)
+            self.progress_dialog.close()
+            self.progress_dialog.deleteLater()
+            self.progress_dialog = None
+
+    def _current_signals(self) -> Optional[QObject]:
+        """Signals object of the loading in progress. """
+        return self.loader.signals if self.loader is not None else None
+
+    def get_question_strategy(self) -> 'QuestionStrategy':
+        """Get question strategy, creating it when the first quiz is started. Its module imports QtCharts. """
+        if self.question_strategy is None:
+            from gui.strategy.question import QuestionStrategy
+            self.question_strategy = QuestionStrategy()
+        return self.question_strategy
 
     def get_widgets(self) -> QWidget:
-        """ Get this strategy and sub-strategies widgets. """
+        """ Get this strategy and already created sub-strategies widgets. """
         yield self.widget
-        yield from self.question_strategy.get_widgets()
+        if self.question_strategy is not None:
+            yield from self.question_strategy.get_widgets()
@@ -2,14 +2,15 @@
 from functools import partial
 from typing import List
 
-from PySide6.QtCore import Signal
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton
+from PySide6.QtCore import Signal, QTimer, QModelIndex
+from PySide6.QtWidgets import QWidget, QCheckBox, QLineEdit, QListView, QAbstractItemView
 
 from gui.forms.main_menu_ui import Ui_MainMenu
 from gui.forms.not_implemented_ui import Ui_Form as Ui_NotImplemented
 from gui.forms.question_ui import Ui_Form as Ui_Question
 from gui.forms.about_ui import Ui_Form as Ui_About
 from gui.forms.choose_quiz import Ui_Form as Ui_ChooseQuiz
+from gui.quiz_list_model import QuizListModel
 
 
 class NotImplementedWindow(QWidget, Ui_NotImplemented):
@@ -33,53 +34,109 @@ class MenuWidget(QWidget, Ui_MainMenu):
 
 
 class QuestionWidget(QWidget, Ui_Question):
-    """Main menu widget. """
+    """Question widget. Answer checkboxes are kept in a pool and reused by the next questions, new ones are created
+    only when a question has more answers than any question shown before.
+    """
+    answer_clicked = Signal(int)
+
+    RED_STYLE_SHEET = 'color: red; font-weight: bold;'
+    GREEN_STYLE_SHEET = 'color: green'
 
     def __init__(self, *args, **kwargs):
         """Constructor. """
         super().__init__(*args, **kwargs)
         self.setupUi(self)
-
-    @staticmethod
-    def delete_subwidgets(owner: QVBoxLayout):
-        """Delete owner subwidgets. Used especially to delete a layout checkboxes. """
-        [owner.itemAt(index).widget().deleteLater() for index in reversed(range(owner.count()))]
-
-    @staticmethod
-    def disable_subwidgets(owner: QVBoxLayout):
-        """Disable owner subwidgets. Used especially to disable a layout checkboxes. """
-        [owner.itemAt(index).widget().setEnabled(False) for index in range(owner.count())]
-
-    @staticmethod
-    def red_subwidgets_at(owner: QVBoxLayout, positions: List[int]):
-        """Set red color for subwidgets at a specified positions. """
-        [owner.itemAt(index).widget().setStyleSheet("color: red; font-weight: bold;") for index in positions]
-
-    @staticmethod
-    def green_subwidgets_at(owner: QVBoxLayout, positions: List[int]):
-        """Set green color for subwidgets at a specified positions. """
-        [owner.itemAt(index).widget().setStyleSheet("color: green") for index in positions]
+        self.answer_check_boxes: List[QCheckBox] = []
+        self.number_of_answers = 0
+
+    def set_answers(self, answers: List[str]):
+        """Show answers of a new question, unchecked and enabled. Checkboxes left from longer questions are hidden. """
+        for index in range(len(self.answer_check_boxes), len(answers)):
+            check_box = QCheckBox()
+            check_box.clicked.connect(partial(self.answer_clicked.emit, index))
+            self.answers_layout.addWidget(check_box)
+            self.answer_check_boxes.append(check_box)
+
+        for check_box, text in zip(self.answer_check_boxes, answers):
+            check_box.setText(text)
+            check_box.setChecked(False)
+            check_box.setEnabled(True)
+            if check_box.styleSheet():
+                check_box.setStyleSheet('')
+            check_box.show()
+        for check_box in self.answer_check_boxes[len(answers):self.number_of_answers]:
+            check_box.hide()
+        self.number_of_answers = len(answers)
+
+    def disable_answers(self):
+        """Disable answers checkboxes. """
+        [check_box.setEnabled(False) for check_box in self.answer_check_boxes[:self.number_of_answers]]
+
+    def red_answers_at(self, positions: List[int]):
+        """Set red color for answers at a specified positions. """
+        [self.answer_check_boxes[index].setStyleSheet(self.RED_STYLE_SHEET) for index in positions]
+
+    def green_answers_at(self, positions: List[int]):
+        """Set green color for answers at a specified positions. """
+        [self.answer_check_boxes[index].setStyleSheet(self.GREEN_STYLE_SHEET) for index in positions]
 
 
 class ChooseQuizWidget(QWidget, Ui_ChooseQuiz):
-    """Main menu widget. """
+    """Choose quiz widget. Quizzes are shown in a list view of a lazy model, filtered by the typed name. """
     choose_quiz = Signal(str)
 
+    # Filter is applied when typing pauses, so the database isn't queried for every key
+    FILTER_DELAY_MS = 200
+
     def __init__(self, *args, **kwargs):
         """Constructor. """
         super().__init__(*args, **kwargs)
         self.setupUi(self)
 
-    def set_quizzes_to_chose_from(self, quiz_names: List[str]):
-        """ Create button for every quiz name. After clicking a button signal to change widget needs to be emitted. """
-        for quiz in quiz_names:
-            new_button = QPushButton(quiz)
-            new_button.clicked.connect(partial(self.choose_quiz_btn, quiz))
-            self.quizzes_layout.addWidget(new_button)
-
-    def choose_quiz_btn(self, quiz):
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText('Search quizzes')
+        self.search_edit.setClearButtonEnabled(True)
+        self.quizzes_view = QListView()
+        self.quizzes_view.setUniformItemSizes(True)
+        self.quizzes_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.quizzes_layout.addWidget(self.search_edit)
+        self.quizzes_layout.addWidget(self.quizzes_view)
+
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(self.FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.search_edit.textChanged.connect(self.filter_timer.start)
+        self.search_edit.returnPressed.connect(self.choose_current_quiz)
+        self.quizzes_view.clicked.connect(self.choose_quiz_at)
+
+    def set_quizzes_model(self, model: QuizListModel):
+        """Show quizzes of the model. Rows are fetched from it when the view needs them. """
+        self.quizzes_view.setModel(model)
+
+    def apply_filter(self):
+        """Show only quizzes with names containing the searched text. """
+        self.filter_timer.stop()
+        model = self.quizzes_view.model()
+        if model is not None:
+            model.set_name_filter(self.search_edit.text())
+
+    def choose_current_quiz(self):
+        """Choose the selected quiz or the first one shown, after applying the filter being typed. """
+        if self.filter_timer.isActive():
+            self.apply_filter()
+        model = self.quizzes_view.model()
+        if model is None:
+            return
+        if model.rowCount() == 0 and model.canFetchMore():
+            model.fetchMore()
+        index = self.quizzes_view.currentIndex()
+        self.choose_quiz_at(index if index.isValid() else model.index(0))
+
+    def choose_quiz_at(self, index: QModelIndex):
         """Action for choosing one of quizzes. It emits a signal that changes main widget. """
-        self.choose_quiz.emit(quiz)
+        if index.isValid():
+            self.choose_quiz.emit(index.data(QuizListModel.QUIZ_NAME_ROLE))
 
 
 class AboutWidget(QWidget, Ui_About):
@@ -0,0 +1,61 @@
+"""Import time profiling. A script is run in a child interpreter with -X importtime and a report of the slowest
+imports is written to a file.
+"""
+import re
+import subprocess
+import sys
+from typing import Iterable, List, NamedTuple
+
+# Line printed by the interpreter: "import time:       self [us] |  cumulative | imported package"
+IMPORT_TIME_PATTERN = re.compile(r'^import time:\s+(?P<self>\d+) \|\s+(?P<cumulative>\d+) \| (?P<indent>\s*)'
+                                 r'(?P<module>\S+)\s*$')
+REPORT_SIZE = 40
+
+
+class ImportTime(NamedTuple):
+    """Time of importing a single module. Cumulative time includes imports of its dependencies. """
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_import_times(lines: Iterable[str]) -> List[ImportTime]:
+    """Parse -X importtime output. Lines of other output are skipped. """
+    import_times = []
+    for line in lines:
+        if match := IMPORT_TIME_PATTERN.match(line):
+            import_times.append(ImportTime(module=match['module'], self_us=int(match['self']),
+                                           cumulative_us=int(match['cumulative']), depth=len(match['indent']) // 2))
+    return import_times
+
+
+def format_report(import_times: List[ImportTime], size: int = REPORT_SIZE) -> str:
+    """Format report of top level imports time and modules with the longest cumulative import time. """
+    top_level = [import_time for import_time in import_times if import_time.depth == 0]
+    total_us = sum(import_time.cumulative_us for import_time in top_level)
+    slowest = sorted(import_times, key=lambda import_time: import_time.cumulative_us, reverse=True)[:size]
+
+    lines = [f'Imported modules: {len(import_times)}, total import time: {total_us / 1000:.1f} ms', '',
+             f'{"cumulative [ms]":>16} {"self [ms]":>10}  module']
+    lines += [f'{import_time.cumulative_us / 1000:>16.1f} {import_time.self_us / 1000:>10.1f}  {import_time.module}'
+              for import_time in slowest]
+    return '\n'.join(lines) + '\n'
+
+
+def profile_imports(arguments: List[str], report_path: str) -> int:
+    """Run python with the arguments and -X importtime option and write the import time report.
+    Standard error output other than import times is passed through. Exit code of the child process is returned.
+    """
+    process = subprocess.Popen([sys.executable, '-X', 'importtime', *arguments], stderr=subprocess.PIPE, text=True)
+    import_lines = []
+    for line in process.stderr:
+        if line.startswith('import time:'):
+            import_lines.append(line)
+        else:
+            sys.stderr.write(line)
+    exit_code = process.wait()
+
+    with open(report_path, 'w') as report_file:
+        report_file.write(format_report(parse_import_times(import_lines)))
+    return exit_code
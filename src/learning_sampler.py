@@ -0,0 +1,83 @@
+"""Weighted sampler of questions from learning levels. """
+import bisect
+import random
+from itertools import accumulate
+from typing import List, Optional, Sequence, Tuple
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, without it batches are drawn with the random module
+    numpy = None
+
+# Probability of drawing a question from each level, empty levels are skipped
+LEVELS_PROBABILITY: List[float] = [0.5, 0.3, 0.1, 0.07, 0.03]
+
+
+class LevelSampler:
+    """Draw positions of questions: a level with its probability and then a question in the level uniformly.
+    Cumulative weights of levels are updated only when a level becomes empty or non-empty.
+    Batches are drawn in one vectorized call if NumPy is available. Random generator may be seeded for
+    reproducible draws, NumPy and random module generators give different sequences for the same seed.
+    """
+
+    def __init__(self, level_sizes: Sequence[int], levels_probability: Sequence[float] = LEVELS_PROBABILITY,
+                 seed: Optional[int] = None, use_numpy: bool = True):
+        """Constructor. """
+        self.levels_probability = list(levels_probability)
+        self.level_sizes = list(level_sizes)
+        self.use_numpy = use_numpy and numpy is not None
+        self.cumulative_weights = []
+        self.random = None
+        self.numpy_random = None
+
+        self.seed(seed)
+        self._update_cumulative_weights()
+
+    def seed(self, seed: Optional[int] = None) -> None:
+        """Reset random generator with a seed. """
+        self.random = random.Random(seed)
+        self.numpy_random = numpy.random.default_rng(seed) if self.use_numpy else None
+
+    def set_levels_probability(self, levels_probability: Sequence[float]) -> None:
+        """Set probability of drawing a question from each level. """
+        self.levels_probability = list(levels_probability)
+        self._update_cumulative_weights()
+
+    def set_level_size(self, level: int, size: int) -> None:
+        """Set number of questions on a level. """
+        was_empty = not self.level_sizes[level]
+        self.level_sizes[level] = size
+        if was_empty != (not size):
+            self._update_cumulative_weights()
+
+    def _update_cumulative_weights(self) -> None:
+        """Compute cumulative weights of levels, empty levels have zero weight. """
+        self.cumulative_weights = list(accumulate(
+            probability if size else 0 for probability, size in zip(self.levels_probability, self.level_sizes)))
+
+    def is_empty(self) -> bool:
+        """Check if there is no question to draw. """
+        return not self.cumulative_weights[-1]
+
+    def draw(self) -> Tuple[int, int]:
+        """Draw a single question position: level and index in the level. """
+        if self.is_empty():
+            raise ValueError('There are no questions to draw.')
+        level = bisect.bisect(self.cumulative_weights, self.random.random() * self.cumulative_weights[-1])
+        return level, self.random.randrange(self.level_sizes[level])
+
+    def draw_batch(self, number: int) -> Tuple[Sequence[int], Sequence[int]]:
+        """Draw positions of number questions: levels and indexes in the levels.
+        Every question is drawn from the same levels state, levels changes during the batch are not taken into account.
+        """
+        if self.is_empty():
+            raise ValueError('There are no questions to draw.')
+        if self.use_numpy:
+            cumulative_weights = numpy.asarray(self.cumulative_weights)
+            levels = numpy.searchsorted(
+                cumulative_weights, self.numpy_random.random(number) * cumulative_weights[-1], side='right')
+            indexes = (self.numpy_random.random(number) * numpy.asarray(self.level_sizes)[levels]).astype(numpy.int64)
+            return levels.tolist(), indexes.tolist()
+
+        levels = self.random.choices(range(len(self.level_sizes)), cum_weights=self.cumulative_weights, k=number)
+        return levels, [self.random.randrange(self.level_sizes[level]) for level in levels]
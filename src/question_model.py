@@ -1,8 +1,10 @@
 """Data models. """
-import random
-from typing import List, Optional, ClassVar
+from datetime import datetime
+from typing import List, Optional, ClassVar, Dict, Tuple
 
-from pydantic import conlist, BaseModel, Field
+from pydantic import conlist, BaseModel, Field, PrivateAttr
+
+from learning_sampler import LevelSampler
 
 
 class AnswerModel(BaseModel):
@@ -77,12 +79,67 @@ class QuizModel(BaseModel):
         orm_mode = True
 
 
+class QuizSummaryModel(BaseModel):
+    """Quiz summary model class. It describes size and progress of a quiz without its questions. """
+    id: int
+    name: str
+    number_of_questions: int
+    questions_on_levels: List[int]
+    last_studied: Optional[datetime]
+
+
+class SearchResultModel(BaseModel):
+    """Question found by a full-text search model class. Snippet is a fragment of the best matching question field
+    with matched words marked.
+    """
+    question_id: int
+    quiz_id: Optional[int]
+    quiz_name: Optional[str]
+    text: str
+    snippet: str
+    rank: float
+
+
+class SourceFileModel(BaseModel):
+    """Quiz source file state model class. """
+    path: str
+    size: int
+    modification_time: int
+    content_hash: str
+    quiz_id: Optional[int]
+
+    class Config:
+        """Configuration set for a model class. """
+        orm_mode = True
+
+
 class LearningModel(BaseModel):
     """ There are 5 levels. At the beginning every question starts in first level.
     After defined number of tries with positive answers it is promoted to next level.
-    The higher the question is, the lower probability should be that it is going to be asked. """
+    The higher the question is, the lower probability should be that it is going to be asked.
+    Questions are indexed by their identifiers, which have to be unique, with their level and position in the level,
+    so moving a question between levels and checking if it is in the model take constant time. """
     NUMBER_OF_LEVELS: ClassVar[int] = 5
     learning_levels: conlist(List[QuestionModel], min_items=NUMBER_OF_LEVELS, max_items=NUMBER_OF_LEVELS)
+    _positions: Dict[int, Tuple[int, int]] = PrivateAttr(default_factory=dict)
+    _sampler: LevelSampler = PrivateAttr()
+
+    def __init__(self, **data):
+        """Constructor. Validate data and index questions. It raises ValueError if a question has no identifier or
+        identifiers repeat.
+        """
+        super().__init__(**data)
+        self._positions = {question.id: (level, index) for level, questions in enumerate(self.learning_levels)
+                           for index, question in enumerate(questions)}
+        if None in self._positions:
+            raise ValueError('Every question of a learning model must have an identifier')
+        if len(self._positions) != sum(map(len, self.learning_levels)):
+            raise ValueError('Identifiers of questions of a learning model must be unique')
+        self._sampler = LevelSampler([len(questions) for questions in self.learning_levels])
+
+    def __contains__(self, question: QuestionModel) -> bool:
+        """Check if the question is in the model. """
+        return question.id in self._positions
 
     def __iter__(self):
         """Return iterator - self. """
@@ -92,24 +149,52 @@ class LearningModel(BaseModel):
         """Get next question to iterate. Draw a learning level to chose question from, next choose question from it. """
         if not self.is_anything_to_learn():
             raise StopIteration('Study finished, every question is on the top level of study.')
-        levels_probability = [0.5, 0.3, 0.1, 0.07, 0.03]
+        level, index = self._sampler.draw()
+        return self.learning_levels[level][index]
+
+    def next_questions(self, number: int) -> List[QuestionModel]:
+        """Draw number of next questions at once, e.g. to generate a whole session up front.
+        Questions are drawn from the current levels state, it is not updated between them.
+        """
+        if not self.is_anything_to_learn():
+            return []
+        levels, indexes = self._sampler.draw_batch(number)
+        return [self.learning_levels[level][index] for level, index in zip(levels, indexes)]
+
+    def seed(self, seed: Optional[int] = None) -> None:
+        """Seed random generator drawing questions, so the sequence of questions may be reproduced. """
+        self._sampler.seed(seed)
 
-        level_contain_elements = [1 if len(level) else 0 for level in self.learning_levels]
-        levels_probability_not_empty = \
-            [multiplier * multiplicand for multiplier, multiplicand in zip(levels_probability, level_contain_elements)]
-        choose_level = self.learning_levels[random.choices([i for i in range(self.NUMBER_OF_LEVELS)],
-                                                           weights=levels_probability_not_empty)[0]]
-        return random.choice(choose_level)
+    def set_levels_probability(self, levels_probability: List[float]) -> None:
+        """Set probability of drawing a question from each level. """
+        self._sampler.set_levels_probability(levels_probability)
 
     def get_number_of_questions_on_levels(self) -> List[int]:
         """Get number of questions on every level """
         return [len(list_of_questions) for list_of_questions in self.learning_levels]
 
+    def get_question_level(self, question: QuestionModel) -> int:
+        """Get level on which the question is stored. """
+        return self._positions[question.id][0]
+
     def update_question(self, question: QuestionModel) -> None:
-        """Update level of the question if it is needed. """
-        if question not in self.learning_levels[question.user_data.level]:
-            self.learning_levels[question.user_data.level - 1].remove(question)
-            self.learning_levels[question.user_data.level].append(question)
+        """Update level of the question if it is needed. Question is moved to the level from its user data. """
+        level, index = self._positions[question.id]
+        if level == question.user_data.level:
+            return
+
+        # Remove by moving the last question of the level in place of the updated one
+        level_questions = self.learning_levels[level]
+        last_question = level_questions.pop()
+        if index < len(level_questions):
+            level_questions[index] = last_question
+            self._positions[last_question.id] = (level, index)
+
+        new_level_questions = self.learning_levels[question.user_data.level]
+        self._positions[question.id] = (question.user_data.level, len(new_level_questions))
+        new_level_questions.append(question)
+        self._sampler.set_level_size(level, len(level_questions))
+        self._sampler.set_level_size(question.user_data.level, len(new_level_questions))
 
     def is_anything_to_learn(self) -> bool:
         """Check if there are any question in level other than last one. """
@@ -124,8 +209,7 @@ class LearningModel(BaseModel):
                 learning_levels[question.user_data.level].append(question)
             else:
                 question.user_data = QuestionUserDataModel()
-                learning_levels[0].append(question.user_data)
-                # TODO currently if in the quiz is a question without the user data, a exception is raised.
+                learning_levels[0].append(question)
         return cls(learning_levels=learning_levels)
 
     class Config:
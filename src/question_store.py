@@ -0,0 +1,257 @@
+"""Compact runtime representation of quiz questions used while studying.
+Questions are kept in columns: arrays of numbers and lists of strings, instead of a pydantic model per question and
+answer. Quiz models are converted once, pydantic models are created again only at the edges, e.g. to save progress.
+"""
+from array import array
+from typing import Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from learning_sampler import LevelSampler
+from question_model import QuizModel, QuestionModel, QuestionUserDataModel, NEEDED_CORRECT_ANSWERS, NUMBER_OF_LEVELS
+
+# Identifier stored for questions without one
+NO_ID = -1
+
+
+class StudyAnswer(NamedTuple):
+    """Answer to a question. """
+    text: str
+    is_correct: bool
+
+
+class QuestionStore:
+    """Questions of a quiz stored in columns, a question is identified by its index.
+    Correctness of answers is kept as a bitmask per question, bit n is set if answer n is correct.
+    """
+    __slots__ = ('ids', 'texts', 'image_paths', 'comments', 'answers_texts', 'correct_answers_masks', 'levels',
+                 'correct_answers', 'user_comments')
+
+    MAX_ANSWERS = 64
+
+    def __init__(self):
+        """Constructor. """
+        self.ids = array('q')
+        self.texts: List[str] = []
+        self.image_paths: List[Optional[str]] = []
+        self.comments: List[Optional[str]] = []
+        self.answers_texts: List[Tuple[str, ...]] = []
+        self.correct_answers_masks = array('Q')
+        self.levels = array('b')
+        self.correct_answers = array('H')
+        self.user_comments: List[Optional[str]] = []
+
+    def __len__(self) -> int:
+        """Number of questions. """
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator['StudyQuestion']:
+        """Iterate over questions views. """
+        return (StudyQuestion(self, index) for index in range(len(self)))
+
+    def append(self, question: QuestionModel) -> int:
+        """Add question with its progress and return its index. Question without user data starts from scratch. """
+        if len(question.answers) > self.MAX_ANSWERS:
+            raise ValueError(f'Question {question.id} has more than {self.MAX_ANSWERS} answers')
+        self.ids.append(question.id if question.id is not None else NO_ID)
+        self.texts.append(question.text)
+        self.image_paths.append(question.image_path)
+        self.comments.append(question.comment)
+        self.answers_texts.append(tuple(answer.text for answer in question.answers))
+        self.correct_answers_masks.append(sum(1 << index for index, answer in enumerate(question.answers)
+                                              if answer.is_correct))
+        user_data = question.user_data
+        self.levels.append(user_data.level if user_data else 0)
+        self.correct_answers.append(user_data.correct_answer if user_data else 0)
+        self.user_comments.append(user_data.comment if user_data else None)
+        return len(self.ids) - 1
+
+    def reset_progress(self) -> None:
+        """Move every question to the first level with no correct answers. """
+        self.levels = array('b', [0]) * len(self)
+        self.correct_answers = array('H', [0]) * len(self)
+
+    def get_answers(self, index: int) -> Tuple[StudyAnswer, ...]:
+        """Get answers of the question. """
+        mask = self.correct_answers_masks[index]
+        return tuple(StudyAnswer(text, bool(mask >> position & 1))
+                     for position, text in enumerate(self.answers_texts[index]))
+
+    def correct_answer(self, index: int) -> None:
+        """React on a correct answer. Same rules as QuestionModel.correct_answer. """
+        level = self.levels[index]
+        if level == NUMBER_OF_LEVELS - 1:
+            return
+
+        correct_answers = self.correct_answers[index] + 1
+        if correct_answers >= NEEDED_CORRECT_ANSWERS[level]:
+            self.correct_answers[index] = 0
+            self.levels[index] = level + 1
+        else:
+            self.correct_answers[index] = correct_answers
+
+    def incorrect_answer(self, index: int) -> None:
+        """React to an incorrect answer. Zero the number of correct answers. """
+        self.correct_answers[index] = 0
+
+    def get_user_data_model(self, index: int) -> QuestionUserDataModel:
+        """Get progress of the question as a model, e.g. to save it in the database. """
+        return QuestionUserDataModel.construct(level=self.levels[index], correct_answer=self.correct_answers[index],
+                                               comment=self.user_comments[index])
+
+    @classmethod
+    def from_quiz_model(cls, quiz_model: QuizModel) -> 'QuestionStore':
+        """Create store from the quiz model questions. """
+        store = cls()
+        for question in quiz_model.questions:
+            store.append(question)
+        return store
+
+
+class StudyQuestion:
+    """View of a single question in the store. It has the interface of QuestionModel used while studying. """
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store: QuestionStore, index: int):
+        """Constructor. """
+        self.store = store
+        self.index = index
+
+    def __eq__(self, other) -> bool:
+        """Views are equal if they show the same question of the same store. """
+        return isinstance(other, StudyQuestion) and self.store is other.store and self.index == other.index
+
+    def __hash__(self) -> int:
+        """Hash of the viewed question position. """
+        return hash((id(self.store), self.index))
+
+    @property
+    def id(self) -> Optional[int]:
+        """Question identifier. """
+        question_id = self.store.ids[self.index]
+        return question_id if question_id != NO_ID else None
+
+    @property
+    def text(self) -> str:
+        """Question text. """
+        return self.store.texts[self.index]
+
+    @property
+    def image_path(self) -> Optional[str]:
+        """Path to the question image. """
+        return self.store.image_paths[self.index]
+
+    @property
+    def comment(self) -> Optional[str]:
+        """Question comment. """
+        return self.store.comments[self.index]
+
+    @property
+    def answers(self) -> Tuple[StudyAnswer, ...]:
+        """Answers to the question. """
+        return self.store.get_answers(self.index)
+
+    @property
+    def level(self) -> int:
+        """Learning level of the question. """
+        return self.store.levels[self.index]
+
+    @property
+    def user_data(self) -> QuestionUserDataModel:
+        """Progress of the question as a model. It is a copy, changing it does not change the store. """
+        return self.store.get_user_data_model(self.index)
+
+    def correct_answer(self) -> None:
+        """React on a correct answer. """
+        self.store.correct_answer(self.index)
+
+    def incorrect_answer(self) -> None:
+        """React to an incorrect answer. """
+        self.store.incorrect_answer(self.index)
+
+
+class StudyModel:
+    """Learning model over a question store. It has the interface of LearningModel, learning levels keep indexes
+    of questions in the store and questions are returned as views, so no model is created while studying.
+    """
+    NUMBER_OF_LEVELS = NUMBER_OF_LEVELS
+
+    def __init__(self, store: QuestionStore):
+        """Constructor. Questions are put on levels from their progress. """
+        self.store = store
+        self.learning_levels = [array('l') for _ in range(self.NUMBER_OF_LEVELS)]
+        # Level and position in the level on which every question is stored
+        self._stored_levels = array('b', store.levels)
+        self._positions = array('l', [0]) * len(store)
+        for index, level in enumerate(store.levels):
+            self._positions[index] = len(self.learning_levels[level])
+            self.learning_levels[level].append(index)
+        self._sampler = LevelSampler([len(indexes) for indexes in self.learning_levels])
+
+    def __contains__(self, question: StudyQuestion) -> bool:
+        """Check if the question is in the model. """
+        return question.store is self.store and 0 <= question.index < len(self.store)
+
+    def __iter__(self):
+        """Return iterator - self. """
+        return self
+
+    def __next__(self) -> StudyQuestion:
+        """Get next question to iterate. Draw a learning level to chose question from, next choose question from it. """
+        if not self.is_anything_to_learn():
+            raise StopIteration('Study finished, every question is on the top level of study.')
+        level, position = self._sampler.draw()
+        return StudyQuestion(self.store, self.learning_levels[level][position])
+
+    def next_questions(self, number: int) -> List[StudyQuestion]:
+        """Draw number of next questions at once. Questions are drawn from the current levels state. """
+        if not self.is_anything_to_learn():
+            return []
+        levels, positions = self._sampler.draw_batch(number)
+        return [StudyQuestion(self.store, self.learning_levels[level][position])
+                for level, position in zip(levels, positions)]
+
+    def seed(self, seed: Optional[int] = None) -> None:
+        """Seed random generator drawing questions, so the sequence of questions may be reproduced. """
+        self._sampler.seed(seed)
+
+    def set_levels_probability(self, levels_probability: Sequence[float]) -> None:
+        """Set probability of drawing a question from each level. """
+        self._sampler.set_levels_probability(levels_probability)
+
+    def get_number_of_questions_on_levels(self) -> List[int]:
+        """Get number of questions on every level """
+        return [len(indexes) for indexes in self.learning_levels]
+
+    def get_question_level(self, question: StudyQuestion) -> int:
+        """Get level on which the question is stored. """
+        return self._stored_levels[question.index]
+
+    def update_question(self, question: StudyQuestion) -> None:
+        """Move the question to the level from its progress if it is needed. """
+        index = question.index
+        level, new_level = self._stored_levels[index], self.store.levels[index]
+        if level == new_level:
+            return
+
+        # Remove by moving the last question of the level in place of the updated one
+        level_indexes = self.learning_levels[level]
+        last_index = level_indexes.pop()
+        position = self._positions[index]
+        if position < len(level_indexes):
+            level_indexes[position] = last_index
+            self._positions[last_index] = position
+
+        new_level_indexes = self.learning_levels[new_level]
+        self._stored_levels[index] = new_level
+        self._positions[index] = len(new_level_indexes)
+        new_level_indexes.append(index)
+        self._sampler.set_level_size(level, len(level_indexes))
+        self._sampler.set_level_size(new_level, len(new_level_indexes))
+
+    def is_anything_to_learn(self) -> bool:
+        """Check if there are any question in level other than last one. """
+        return any(self.learning_levels[:-1])
+
+    @classmethod
+    def create_from_quiz_model(cls, quiz_model: QuizModel) -> 'StudyModel':
+        """Create instance with questions and their progress from the quiz model. """
+        return cls(QuestionStore.from_quiz_model(quiz_model))
@@ -1,38 +1,67 @@
-"""TODO """
+"""Run the application with a graphic user interface. """
 import sys
+from argparse import ArgumentParser, Namespace
+from functools import partial
 
 from PySide6 import QtWidgets
+from PySide6.QtCore import QObject
 
-from database.database_manager import DatabaseManager
 from gui.main_window import MainWindow
 from gui.strategy.about_program import AboutProgramStrategy
 from gui.strategy.create_quiz import CreateQuizStrategy
 from gui.strategy.main_menu import MainMenuStrategy
 from gui.strategy.manage_quiz import ManageQuizStrategy
-from gui.strategy.quiz import QuizStrategy
 
 QUIZ_DB_PATH = './data/quiz.db'
 
 
-def run():
-    """Main function for running application with a graphic user interface.
-    It creates a QUI components and starts main event loop. """
-    app = QtWidgets.QApplication(sys.argv)
+def create_quiz_strategy(database_path: str) -> QObject:
+    """Open the database and create the quiz strategy.
+    Database and quiz modules import SQLAlchemy, pydantic and QtCharts, so they are imported when first needed.
+    """
+    from database.database_manager import DatabaseManager
+    from gui.strategy.quiz import QuizStrategy
+
     # initiate database manager object
-    DatabaseManager(QUIZ_DB_PATH)
+    DatabaseManager(database_path)
+    return QuizStrategy()
 
+
+def create_main_window(database_path: str = QUIZ_DB_PATH) -> MainWindow:
+    """Create main window showing the main menu. Other strategies are created when user navigates to them. """
     window = MainWindow()
-    main_menu_strategy = MainMenuStrategy(quiz_strategy=QuizStrategy(),
-                                          about_program_strategy=AboutProgramStrategy(),
-                                          manage_quiz_strategy=ManageQuizStrategy(),
-                                          create_quiz_strategy=CreateQuizStrategy()
+    main_menu_strategy = MainMenuStrategy(quiz_strategy=partial(create_quiz_strategy, database_path),
+                                          about_program_strategy=AboutProgramStrategy,
+                                          manage_quiz_strategy=ManageQuizStrategy,
+                                          create_quiz_strategy=CreateQuizStrategy
                                           )
 
     window.set_stack_widgets(main_menu_strategy.get_widgets())
     window.set_strategy(main_menu_strategy)
+    return window
+
+
+def create_arg_parser() -> ArgumentParser:
+    """Create argument parser. """
+    pars = ArgumentParser(description=__doc__)
+    pars.add_argument('--import-time', type=str, metavar='REPORT_PATH',
+                      help='run the application with -X importtime and write a report of modules import time')
+    return pars
+
+
+def run(arguments: Namespace):
+    """Main function for running application with a graphic user interface.
+    It creates a QUI components and starts main event loop. """
+    if arguments.import_time:
+        from import_profiler import profile_imports
+        sys.exit(profile_imports([__file__], arguments.import_time))
+
+    app = QtWidgets.QApplication(sys.argv[:1])
+    window = create_main_window()
     window.show()
     app.exec()
 
 
 if __name__ == '__main__':
-    run()
+    parser = create_arg_parser()
+    run(parser.parse_args())
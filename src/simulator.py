@@ -0,0 +1,167 @@
+"""Headless simulator of learning with synthetic learners. It evaluates the learning schedule defined by
+the learning model without the graphic user interface.
+Run from the repository root: PYTHONPATH=src python3 src/simulator.py --questions 1000 --simulations 8
+"""
+import random
+import time
+from argparse import ArgumentParser, Namespace
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+from learning_sampler import LEVELS_PROBABILITY
+from question_model import QuizModel, QuestionModel, AnswerModel, NUMBER_OF_LEVELS
+from question_store import QuestionStore, StudyModel
+
+DEFAULT_MAX_ANSWERS = 10000000
+
+# Quiz used by simulations in a worker process, it is sent once per process instead of once per simulation
+_WORKER_QUIZ_MODEL: Optional[QuizModel] = None
+
+
+class LearnerModel(BaseModel):
+    """Synthetic learner. Probability of answering correctly is drawn for every question from a range. """
+    min_recall: float = Field(default=0.7, ge=0, le=1)
+    max_recall: float = Field(default=0.9, ge=0, le=1)
+    seed: Optional[int] = None
+    levels_probability: List[float] = Field(default_factory=lambda: list(LEVELS_PROBABILITY))
+    max_answers: int = DEFAULT_MAX_ANSWERS
+
+
+class SimulationResult(BaseModel):
+    """Result of a single simulation. """
+    answers: int
+    finished: bool
+    answers_on_levels: List[int]
+    question_answers_to_mastery: List[int]
+    seconds: float
+
+    @property
+    def answers_per_second(self) -> float:
+        """Simulation throughput. """
+        return self.answers / self.seconds if self.seconds else 0
+
+
+def simulate(quiz_model: QuizModel, learner: LearnerModel) -> SimulationResult:
+    """Simulate learning the quiz from scratch until every question is on the top level or the answers limit is hit.
+    Count answers given on every level and the number of answers every question needed to reach the top level.
+    """
+    store = QuestionStore.from_quiz_model(quiz_model)
+    store.reset_progress()
+    learning_model = StudyModel(store)
+    learning_model.seed(learner.seed)
+    learning_model.set_levels_probability(learner.levels_probability)
+    rng = random.Random(learner.seed)
+    recall = {question.id: rng.uniform(learner.min_recall, learner.max_recall) for question in quiz_model.questions}
+
+    answers_on_levels = [0] * NUMBER_OF_LEVELS
+    question_answers = dict.fromkeys(recall, 0)
+    question_answers_to_mastery = []
+    finished = False
+    start = time.perf_counter()
+    for _ in range(learner.max_answers):
+        try:
+            question = next(learning_model)
+        except StopIteration:
+            finished = True
+            break
+        level = question.level
+        answers_on_levels[level] += 1
+        question_answers[question.id] += 1
+        if rng.random() < recall[question.id]:
+            question.correct_answer()
+            learning_model.update_question(question)
+            if level != question.level == NUMBER_OF_LEVELS - 1:
+                question_answers_to_mastery.append(question_answers[question.id])
+        else:
+            question.incorrect_answer()
+
+    finished = finished or not learning_model.is_anything_to_learn()
+    return SimulationResult(answers=sum(answers_on_levels), finished=finished,
+                            answers_on_levels=answers_on_levels,
+                            question_answers_to_mastery=question_answers_to_mastery,
+                            seconds=time.perf_counter() - start)
+
+
+def _init_worker(quiz_model: QuizModel) -> None:
+    """Keep the quiz in a worker process. """
+    global _WORKER_QUIZ_MODEL
+    _WORKER_QUIZ_MODEL = quiz_model
+
+
+def _simulate_in_worker(learner: LearnerModel) -> SimulationResult:
+    """Run simulation on the quiz kept in a worker process. """
+    return simulate(_WORKER_QUIZ_MODEL, learner)
+
+
+def run_simulations(quiz_model: QuizModel, learners: List[LearnerModel],
+                    workers: Optional[int] = None) -> List[SimulationResult]:
+    """Run simulation for every learner in a pool of processes. Results are in the order of learners. """
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(quiz_model,)) as executor:
+        return list(executor.map(_simulate_in_worker, learners))
+
+
+def generate_quiz_model(number_of_questions: int) -> QuizModel:
+    """Generate quiz with a given number of questions, each with a single correct answer. """
+    questions = [QuestionModel(id=index + 1, text=f'Question {index}',
+                               answers=[AnswerModel(text='Answer', is_correct=True)])
+                 for index in range(number_of_questions)]
+    return QuizModel(name='Simulated quiz', questions=questions)
+
+
+def print_results(results: List[SimulationResult], total_seconds: float) -> None:
+    """Print summary of simulations results. """
+    finished = [result for result in results if result.finished]
+    answers = sum(result.answers for result in results)
+    answers_on_levels = [sum(level_answers) for level_answers in zip(*(result.answers_on_levels for result in results))]
+    mastery = [answers for result in results for answers in result.question_answers_to_mastery]
+
+    print(f'Simulations finished: {len(finished)} of {len(results)}')
+    if finished:
+        print(f'Answers to master the quiz: mean {sum(result.answers for result in finished) / len(finished):.0f}, '
+              f'min {min(result.answers for result in finished)}, max {max(result.answers for result in finished)}')
+    if mastery:
+        print(f'Answers to master a question: mean {sum(mastery) / len(mastery):.1f}, '
+              f'min {min(mastery)}, max {max(mastery)}')
+    print('Answers on levels: ' + ', '.join(
+        f'{level}: {level_answers / answers:.1%}' for level, level_answers in enumerate(answers_on_levels)))
+    print(f'Throughput: {answers / sum(result.seconds for result in results):.0f} answers/s per process, '
+          f'{answers / total_seconds:.0f} answers/s in total')
+
+
+def create_arg_parser() -> ArgumentParser:
+    """Create argument parser. """
+    pars = ArgumentParser(description=__doc__)
+    pars.add_argument('--questions', type=int, default=1000, help='number of questions in a generated quiz')
+    pars.add_argument('--quiz', type=str, help='name of a quiz from the database used instead of a generated one')
+    pars.add_argument('--database-path', type=str, default='./data/quiz.db', help='path to SQLite database file')
+    pars.add_argument('--simulations', type=int, default=8, help='number of simulated learners')
+    pars.add_argument('--workers', type=int, help='number of processes, by default number of processors')
+    pars.add_argument('--min-recall', type=float, default=0.7, help='minimal probability of a correct answer')
+    pars.add_argument('--max-recall', type=float, default=0.9, help='maximal probability of a correct answer')
+    pars.add_argument('--levels-probability', type=float, nargs=NUMBER_OF_LEVELS, default=LEVELS_PROBABILITY,
+                      help='probability of drawing a question from each level')
+    pars.add_argument('--max-answers', type=int, default=DEFAULT_MAX_ANSWERS, help='answers limit of a simulation')
+    return pars
+
+
+def run(arguments: Namespace):
+    """Main function of this script. """
+    if arguments.quiz:
+        from database.database_manager import DatabaseManager
+        quiz_model = DatabaseManager(arguments.database_path).get_quiz(arguments.quiz)
+    else:
+        quiz_model = generate_quiz_model(arguments.questions)
+    learners = [LearnerModel(min_recall=arguments.min_recall, max_recall=arguments.max_recall, seed=seed,
+                             levels_probability=arguments.levels_probability, max_answers=arguments.max_answers)
+                for seed in range(arguments.simulations)]
+
+    start = time.perf_counter()
+    results = run_simulations(quiz_model, learners, arguments.workers)
+    print_results(results, time.perf_counter() - start)
+
+
+if __name__ == '__main__':
+    parser = create_arg_parser()
+    run(parser.parse_args())
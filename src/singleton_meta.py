@@ -1,13 +1,17 @@
 """ Module contains base class for singleton classes to inherit from. """
+import threading
 
 
 class SingletonMeta(type):
-    """ Implementation of the Singleton base class. """
+    """ Implementation of the Singleton base class. Creating the instance is thread-safe. """
     _instances = {}
+    _lock = threading.RLock()
 
     def __call__(cls, *args, **kwargs):
         """ Class instance is being returned. If it wasn't created yet, it is going to be created. """
         if cls not in cls._instances:
-            instance = super().__call__(*args, **kwargs)
-            cls._instances[cls] = instance
+            with cls._lock:
+                if cls not in cls._instances:
+                    instance = super().__call__(*args, **kwargs)
+                    cls._instances[cls] = instance
         return cls._instances[cls]
@@ -0,0 +1,106 @@
+"""Unit tests for the quiz files import script. """
+import io
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+from unittest import TestCase
+
+from src.database.convert_txt_to_sqlite import find_quiz_files, import_quiz_files, print_reports
+from src.database.database_manager import DatabaseManager
+from src.database.quiz_parser import parse_quiz_text
+
+QUIZ_FILE_PATH = 'data/test_quiz.md'
+
+
+class ConvertTxtToSqliteTests(TestCase):
+    """Unit tests for importing a set of quiz files into a database. """
+
+    def setUp(self):
+        """Create directory with quiz files. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        with open(QUIZ_FILE_PATH) as quiz_file:
+            self.quiz_text = quiz_file.read()
+        self.paths = []
+        for index in range(3):
+            path = Path(self.tmp_dir.name, f'quiz_{index}.md')
+            path.write_text(self.quiz_text.replace('## Test quiz', f'## Test quiz {index}'))
+            self.paths.append(str(path))
+        Path(self.tmp_dir.name, 'notes.txt').write_text('not a quiz')
+
+    def tearDown(self) -> None:
+        """Delete temporary directory. """
+        self.tmp_dir.cleanup()
+
+    def test_find_quiz_files(self):
+        """Test finding quiz files in a directory and with a glob pattern. """
+        self.assertEqual(self.paths, find_quiz_files(self.tmp_dir.name))
+        self.assertEqual(self.paths[1:], find_quiz_files(str(Path(self.tmp_dir.name, 'quiz_[12].md'))))
+        self.assertEqual(self.paths[:1], find_quiz_files(self.paths[0]))
+
+    def test_import_quiz_files(self):
+        """Test that every parsed quiz is written to the database and only changed files are imported again. """
+        database_path = str(Path(self.tmp_dir.name, 'quiz.db'))
+        DatabaseManager.create_database(database_path)
+        # Database manager is a singleton, instance for the temporary database must not be shared with other tests
+        singleton_instances = type(DatabaseManager)._instances
+        previous_instance = singleton_instances.pop(DatabaseManager, None)
+        try:
+            database_manager = DatabaseManager(database_path)
+            reports = import_quiz_files(self.paths, database_manager, workers=2, batch_size=2)
+            quizzes_names = database_manager.get_quizzes_names()
+
+            Path(self.paths[0]).write_text(self.quiz_text.replace('## Test quiz', '## Test quiz 0').replace('10', '11'))
+            # Renamed quiz has the same questions, so nothing but the name is written
+            Path(self.paths[1]).write_text(self.quiz_text.replace('## Test quiz', '## Renamed quiz 1'))
+            second_reports = import_quiz_files(self.paths, database_manager, workers=2)
+        finally:
+            singleton_instances.pop(DatabaseManager, None)
+            if previous_instance:
+                singleton_instances[DatabaseManager] = previous_instance
+
+        self.assertEqual(sorted(self.paths), sorted(report.path for report in reports))
+        self.assertEqual(len(parse_quiz_text(self.quiz_text).questions) * 3,
+                         sum(report.questions for report in reports))
+        self.assertEqual({f'Test quiz {index}' for index in range(3)}, set(quizzes_names))
+
+        second_reports = {report.path: report for report in second_reports}
+        self.assertEqual(sorted(self.paths), sorted(second_reports))
+        changed_report = second_reports[self.paths[0]]
+        self.assertEqual((0, 1, 0), (changed_report.inserted, changed_report.updated, changed_report.deleted))
+        self.assertFalse(changed_report.skipped)
+        renamed_report = second_reports[self.paths[1]]
+        self.assertEqual((0, 0, 0, False), (renamed_report.inserted, renamed_report.updated, renamed_report.deleted,
+                                            renamed_report.skipped))
+        self.assertTrue(second_reports[self.paths[2]].skipped)
+
+    def test_import_invalid_quiz_files(self):
+        """Test that files which can't be parsed are reported as failed and other files are still imported. """
+        empty_path = str(Path(self.tmp_dir.name, 'empty.md'))
+        Path(empty_path).write_text('')
+        headless_path = str(Path(self.tmp_dir.name, 'headless.md'))
+        Path(headless_path).write_text(self.quiz_text.replace('## Test quiz', ''))
+        database_path = str(Path(self.tmp_dir.name, 'quiz.db'))
+        DatabaseManager.create_database(database_path)
+        singleton_instances = type(DatabaseManager)._instances
+        previous_instance = singleton_instances.pop(DatabaseManager, None)
+        try:
+            database_manager = DatabaseManager(database_path)
+            reports = import_quiz_files([empty_path, *self.paths, headless_path], database_manager, workers=2)
+            quizzes_names = database_manager.get_quizzes_names()
+        finally:
+            singleton_instances.pop(DatabaseManager, None)
+            if previous_instance:
+                singleton_instances[DatabaseManager] = previous_instance
+
+        reports = {report.path: report for report in reports}
+        self.assertEqual({f'Test quiz {index}' for index in range(3)}, set(quizzes_names))
+        self.assertEqual([None] * 3, [reports[path].error for path in self.paths])
+        self.assertRegex(reports[empty_path].error, '^ValueError: .*empty')
+        self.assertRegex(reports[headless_path].error, '^ValueError: .*header')
+        self.assertEqual(0, reports[headless_path].questions)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            print_reports(list(reports.values()), total_seconds=1)
+        self.assertIn(f'{empty_path}: failed, ValueError', output.getvalue())
+        self.assertIn('(0 unchanged, 2 failed)', output.getvalue())
@@ -1,11 +1,45 @@
 import copy
+import re
 import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from unittest import TestCase
 
-from src.database.database_manager import DatabaseManager
+from sqlalchemy import event
+
+from src.database.database_manager import DatabaseManager, create_database_engine, ENGINE_PROFILES
 from src.database.database_model import QuestionUserData
-from src.question_model import QuizModel, QuestionModel, AnswerModel, QuestionUserDataModel
+from src.database.progress_buffer import ProgressBuffer
+from src.question_model import QuizModel, QuestionModel, AnswerModel, QuestionUserDataModel, SourceFileModel
+
+
+def create_large_quiz(name: str, number_of_questions: int, number_of_answers: int = 4) -> QuizModel:
+    """Create quiz model with a given number of questions, every question has a user data. """
+    questions = [QuestionModel(text=f'Question {index}',
+                               answers=[AnswerModel(text=f'Answer {answer_index}', is_correct=answer_index == 0)
+                                        for answer_index in range(number_of_answers)],
+                               user_data=QuestionUserDataModel(level=index % 4, correct_answer=1))
+                 for index in range(number_of_questions)]
+    return QuizModel(name=name, questions=questions)
+
+
+@contextmanager
+def count_queries(engine, with_parameters: bool = False):
+    """Count SQL statements executed on the engine inside the context. Yields list with statements.
+    If with_parameters is set, statements are yielded with their parameters.
+    """
+    statements = []
+
+    def before_cursor_execute(_conn, _cursor, statement, parameters, *_args):
+        statements.append((statement, parameters) if with_parameters else statement)
+
+    event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, 'before_cursor_execute', before_cursor_execute)
 
 
 class DatabaseManagerTests(TestCase):
@@ -79,6 +113,54 @@ class DatabaseManagerTests(TestCase):
         final_state = self.database_manager.get_quizzes()
         self.assertTrue(new_quiz in final_state)
 
+    def test_add_quiz_bulk(self):
+        """Test adding single quiz with the bulk import, identifiers are generated for rows without them. """
+        answers = [AnswerModel(text='100', is_correct=False), AnswerModel(text='200', is_correct=True)]
+        user_data = QuestionUserDataModel(level=2, correct_answer=1)
+        questions = [QuestionModel(text='Question 1', answers=answers, user_data=user_data),
+                     QuestionModel(id=20, text='Question 2', answers=[], image_path='image_path'),
+                     QuestionModel(text='Question 3', answers=[AnswerModel(text='300', is_correct=True)])]
+        new_quiz = QuizModel(name='New quiz', questions=questions)
+
+        result = self.database_manager.add_quiz_bulk(new_quiz, batch_size=2)
+        self.assertEqual([3, 20, 21], result.question_ids)
+        self.assertEqual([7, 8, 9], result.answer_ids)
+
+        expected_quiz = copy.deepcopy(new_quiz)
+        expected_quiz.id = result.quiz_id
+        for question, question_id in zip(expected_quiz.questions, result.question_ids):
+            question.id = question_id
+        for answer, answer_id in zip([answer for question in expected_quiz.questions for answer in question.answers],
+                                     result.answer_ids):
+            answer.id = answer_id
+        self.assertEqual(expected_quiz, self.database_manager.get_quiz(new_quiz.name))
+
+    def test_add_quiz_bulk_explicit_ids(self):
+        """Test that generated identifiers skip identifiers given later in the import, also in streamed questions. """
+        questions = [QuestionModel(text='Question 1', answers=[AnswerModel(text='1', is_correct=True)]),
+                     QuestionModel(text='Question 2', answers=[AnswerModel(text='2', is_correct=True)]),
+                     QuestionModel(id=4, text='Question 3', answers=[AnswerModel(id=7, text='3', is_correct=True)])]
+
+        result = self.database_manager.add_quiz_bulk(QuizModel(name='New quiz', questions=questions), batch_size=1)
+        self.assertEqual([3, 5, 4], result.question_ids)
+        self.assertEqual([8, 9, 7], result.answer_ids)
+
+        streamed_questions = copy.deepcopy(questions)
+        streamed_questions[2].id, streamed_questions[2].answers[0].id = 7, 11
+        result = self.database_manager.add_quiz_bulk(QuizModel(name='Streamed quiz', questions=[]),
+                                                     iter(streamed_questions))
+        self.assertEqual([6, 8, 7], result.question_ids)
+        self.assertEqual([10, 12, 11], result.answer_ids)
+
+    def test_add_quiz_bulk_rollback(self):
+        """Test that failing bulk import leaves no partially imported quiz. """
+        questions = [QuestionModel(text='Question 1', answers=[]), QuestionModel(id=1, text='Duplicate', answers=[])]
+        new_quiz = QuizModel(name='Broken quiz', questions=questions)
+
+        with self.assertRaises(Exception):
+            self.database_manager.add_quiz_bulk(new_quiz, batch_size=1)
+        self.assertEqual([self.first_quiz.name, self.second_quiz.name], self.database_manager.get_quizzes_names())
+
     def test_get_quiz(self):
         """Test extracting a quiz model from database base on his name. """
         expected_result = self.first_quiz
@@ -96,6 +178,33 @@ class DatabaseManagerTests(TestCase):
         final_state = self.database_manager.get_quizzes()
         self.assertTrue(len(final_state) == 0)
 
+    def test_get_quizzes_summaries(self):
+        """Test that summaries count questions on levels per quiz, page by page, and keep the last studied time. """
+        self.database_manager.add_quiz_bulk(create_large_quiz('Third quiz', 10))
+        summaries = self.database_manager.get_quizzes_summaries()
+
+        self.assertEqual(['First quiz', 'Second quiz', 'Third quiz'], [summary.name for summary in summaries])
+        self.assertEqual([2, 0, 10], [summary.number_of_questions for summary in summaries])
+        self.assertEqual([[2, 0, 0, 0, 0], [0, 0, 0, 0, 0], [3, 3, 2, 2, 0]],
+                         [summary.questions_on_levels for summary in summaries])
+        # Imported progress isn't studying
+        self.database_manager.add_quiz(create_large_quiz('Unstudied quiz', 2))
+        self.assertEqual([None] * 4, [summary.last_studied for summary in
+                                      self.database_manager.get_quizzes_summaries()])
+        self.assertEqual(summaries[1:], self.database_manager.get_quizzes_summaries(offset=1, limit=2))
+        self.assertEqual(summaries[:1], self.database_manager.get_quizzes_summaries(limit=1))
+        self.assertEqual(summaries[1:2], self.database_manager.get_quizzes_summaries(name_filter='sECOND'))
+        self.assertEqual(summaries[2:], self.database_manager.get_quizzes_summaries(offset=1, name_filter='D QUIZ',
+                                                                                    limit=1))
+        self.assertEqual([], self.database_manager.get_quizzes_summaries(name_filter='%'))
+
+        self.database_manager.update_question_user_data(QuestionUserDataModel(level=2, correct_answer=0), 2)
+        self.database_manager.update_questions_user_data({3: QuestionUserDataModel(level=1, correct_answer=0)})
+        first_summary, second_summary, third_summary, fourth_summary = self.database_manager.get_quizzes_summaries()
+        self.assertEqual([1, 0, 1, 0, 0], first_summary.questions_on_levels)
+        self.assertEqual([False, True, False, True], [summary.last_studied is None for summary in
+                                                      (first_summary, second_summary, third_summary, fourth_summary)])
+
     def test_update_question_user_data(self):
         """Test updating question user data, such as level, correct answers and notes. """
         initial_state = self.database_manager.get_quizzes()
@@ -113,3 +222,307 @@ class DatabaseManagerTests(TestCase):
         self.database_manager.update_question_user_data(change_quiz.questions[0].user_data, change_quiz.questions[0].id)
         check_final_state = self.database_manager.get_quizzes()
         self.assertEqual([change_quiz, self.second_quiz], check_final_state)
+
+    def test_get_quiz_lazy(self):
+        """Test extracting a quiz model from database with lazy loading of questions. """
+        result = self.database_manager.get_quiz(self.first_quiz.name, eager=False, validate=True)
+        self.assertEqual(self.first_quiz, result)
+
+    def test_get_quiz_trusted_path(self):
+        """Test that quizzes built from raw rows without validation are equal to validated ones. """
+        quiz = create_large_quiz('Trusted quiz', 50)
+        quiz.questions[0].user_data = None
+        quiz.questions[1].image_path = 'image.png'
+        quiz.questions[2].answers = []
+        self.database_manager.add_quiz_bulk(quiz)
+
+        for eager in (True, False):
+            self.assertEqual(self.database_manager.get_quiz(quiz.name, eager=eager, validate=True),
+                             self.database_manager.get_quiz(quiz.name))
+            self.assertEqual(self.database_manager.get_quizzes(eager=eager, validate=True),
+                             self.database_manager.get_quizzes())
+        trusted_quiz = self.database_manager.get_quiz(quiz.name)
+        self.assertEqual([0, 4], [len(question.answers) for question in trusted_quiz.questions[2:4]])
+        self.assertIsNone(trusted_quiz.questions[0].user_data)
+        self.assertEqual(QuestionUserDataModel(level=1, correct_answer=1), trusted_quiz.questions[1].user_data)
+
+    def test_get_quiz_number_of_queries(self):
+        """Benchmark the eager loading - number of queries must not grow with the number of questions, whether quizzes
+        are built from raw rows or validated from ORM objects.
+        """
+        quizzes = [create_large_quiz(f'Large quiz {number_of_questions}', number_of_questions)
+                   for number_of_questions in (10, 100, 1000)]
+        for quiz in quizzes:
+            self.database_manager.add_quiz(quiz)
+
+        for validate in (False, True):
+            with self.subTest(validate=validate):
+                number_of_queries = []
+                for quiz in quizzes:
+                    with count_queries(self.database_manager.engine) as statements:
+                        result = self.database_manager.get_quiz(quiz.name, validate=validate)
+                    self.assertEqual(len(quiz.questions), len(result.questions))
+                    number_of_queries.append(len(statements))
+
+                self.assertEqual(1, len(set(number_of_queries)), number_of_queries)
+
+    def test_sync_quiz(self):
+        """Test incremental quiz import: only changed questions are written and user data of the rest is kept. """
+        source = SourceFileModel(path='quiz.md', size=1, modification_time=1, content_hash='1')
+        questions = [QuestionModel(text=f'Question {index}', answers=[AnswerModel(text='A', is_correct=True)])
+                     for index in range(4)]
+        quiz = QuizModel(name='Synchronized quiz', questions=questions)
+
+        result = self.database_manager.sync_quiz(quiz, source)
+        self.assertEqual((4, 0, 0), (result.inserted, result.updated, result.deleted))
+        self.assertEqual(source.copy(update={'quiz_id': result.quiz_id}),
+                         self.database_manager.get_source_file(source.path))
+        stored_quiz = self.database_manager.get_quiz(quiz.name)
+        self.database_manager.update_question_user_data(
+            QuestionUserDataModel(level=2, correct_answer=1), stored_quiz.questions[0].id)
+        self.database_manager.update_question_user_data(
+            QuestionUserDataModel(level=3, correct_answer=1), stored_quiz.questions[1].id)
+
+        result = self.database_manager.sync_quiz(quiz, source)
+        self.assertEqual((0, 0, 0), (result.inserted, result.updated, result.deleted))
+
+        changed_quiz = copy.deepcopy(quiz)
+        changed_quiz.questions[1].answers.append(AnswerModel(text='B', is_correct=False))
+        del changed_quiz.questions[2]
+        changed_quiz.questions.append(QuestionModel(text='Question 4', answers=[]))
+        result = self.database_manager.sync_quiz(changed_quiz, source.copy(update={'content_hash': '2'}))
+        self.assertEqual((1, 1, 1), (result.inserted, result.updated, result.deleted))
+
+        synchronized_quiz = self.database_manager.get_quiz(quiz.name)
+        self.assertEqual(result.quiz_id, synchronized_quiz.id)
+        self.assertEqual(['Question 0', 'Question 1', 'Question 3', 'Question 4'],
+                         [question.text for question in synchronized_quiz.questions])
+        self.assertEqual(stored_quiz.questions[0].id, synchronized_quiz.questions[0].id)
+        self.assertEqual(QuestionUserDataModel(level=2, correct_answer=1), synchronized_quiz.questions[0].user_data)
+        self.assertEqual(['A', 'B'], [answer.text for answer in synchronized_quiz.questions[1].answers])
+        self.assertEqual(QuestionUserDataModel(level=3, correct_answer=1), synchronized_quiz.questions[1].user_data)
+        self.assertEqual('2', self.database_manager.get_source_file(source.path).content_hash)
+
+    def test_search(self):
+        """Test that search finds words in texts, answers and comments, ranks text matches first and pages results. """
+        questions = [QuestionModel(text='Pająk i gęś', answers=[AnswerModel(text='Ringo', is_correct=True)]),
+                     QuestionModel(text='Who sang it?', comment='Yellow submarine by the Beatles',
+                                   answers=[AnswerModel(text='The Beatles', is_correct=True),
+                                            AnswerModel(text='"Queen" (1970)', is_correct=False)]),
+                     QuestionModel(text='Beatles members', answers=[AnswerModel(text='John', is_correct=True)])]
+        result = self.database_manager.add_quiz_bulk(QuizModel(name='Music', questions=questions))
+        first_id, second_id, third_id = result.question_ids
+
+        self.assertEqual([third_id, second_id],
+                         [found.question_id for found in self.database_manager.search('beatles')])
+        self.assertEqual([first_id], [found.question_id for found in self.database_manager.search('pajak GES')])
+        self.assertEqual([second_id], [found.question_id for found in self.database_manager.search('"queen" (1970')])
+        self.assertEqual([], self.database_manager.search('beatles ringo'))
+        self.assertEqual([], self.database_manager.search('  '))
+        self.assertEqual([second_id],
+                         [found.question_id for found in self.database_manager.search('beatles', offset=1, limit=1)])
+
+        found = self.database_manager.search('submarine')[0]
+        self.assertEqual((second_id, result.quiz_id, 'Music', 'Who sang it?'),
+                         (found.question_id, found.quiz_id, found.quiz_name, found.text))
+        self.assertEqual('Yellow [submarine] by the Beatles', found.snippet)
+
+    def test_search_index_follows_changes(self):
+        """Test that the search index is kept in sync when quizzes are added, synchronized and erased. """
+        self.assertEqual([1, 2], [found.question_id for found in self.database_manager.search('question')])
+        self.assertEqual([2], [found.question_id for found in self.database_manager.search('3')])
+
+        source = SourceFileModel(path='quiz.md', size=1, modification_time=1, content_hash='1')
+        quiz = QuizModel(name='Synchronized quiz', questions=[
+            QuestionModel(text='Capital of France', answers=[AnswerModel(text='Paris', is_correct=True)])])
+        self.database_manager.sync_quiz(quiz, source)
+        self.assertEqual(1, len(self.database_manager.search('paris')))
+
+        quiz.questions[0].answers = [AnswerModel(text='Lyon', is_correct=False)]
+        self.database_manager.sync_quiz(quiz, source.copy(update={'content_hash': '2'}))
+        self.assertEqual([], self.database_manager.search('paris'))
+        self.assertEqual(['[Lyon]'], [found.snippet for found in self.database_manager.search('lyon')])
+
+        self.database_manager.erase_all_quizzes()
+        self.assertEqual([], self.database_manager.search('question'))
+        self.assertEqual([], self.database_manager.search('capital'))
+
+    def test_update_questions_user_data(self):
+        """Test updating user data of many questions at once, both inserting and updating rows. """
+        self.database_manager.update_question_user_data(QuestionUserDataModel(level=1, correct_answer=1), 2)
+        user_data = {1: QuestionUserDataModel(level=2, correct_answer=0, comment='first'),
+                     2: QuestionUserDataModel(level=3, correct_answer=2)}
+        self.database_manager.update_questions_user_data(user_data, batch_size=1)
+
+        result = self.database_manager.get_quiz(self.first_quiz.name)
+        self.assertEqual(list(user_data.values()), [question.user_data for question in result.questions])
+
+    def test_progress_buffer(self):
+        """Test that progress changes are written after the number of pending changes or the delay is reached. """
+        progress_buffer = ProgressBuffer(self.database_manager, max_pending=2, max_delay_ms=50)
+        try:
+            user_data = QuestionUserDataModel(level=1, correct_answer=1)
+            progress_buffer.add(user_data, 1)
+            user_data.level = 2
+            self.assertEqual([None, None], [question.user_data for question in
+                                            self.database_manager.get_quiz(self.first_quiz.name).questions])
+
+            progress_buffer.add(QuestionUserDataModel(level=3, correct_answer=0), 2)
+            progress_buffer.flush().result()
+            self.assertEqual([QuestionUserDataModel(level=1, correct_answer=1),
+                              QuestionUserDataModel(level=3, correct_answer=0)],
+                             [question.user_data for question in
+                              self.database_manager.get_quiz(self.first_quiz.name).questions])
+
+            progress_buffer.add(QuestionUserDataModel(level=4, correct_answer=0), 1)
+            time.sleep(0.5)
+            self.assertEqual(QuestionUserDataModel(level=4, correct_answer=0),
+                             self.database_manager.get_quiz(self.first_quiz.name).questions[0].user_data)
+        finally:
+            progress_buffer.close()
+
+    def test_progress_buffer_failed_writes(self):
+        """Test that changes which failed to be written are retried after the delay and a failure at close is raised.
+        """
+        class FlakyDatabaseManager:
+            """Database manager failing the given number of writes. """
+            failures = 1
+            written = {}
+
+            def update_questions_user_data(self, user_data_models):
+                if self.failures:
+                    self.failures -= 1
+                    raise RuntimeError('Database is locked')
+                self.written.update(user_data_models)
+
+        database_manager = FlakyDatabaseManager()
+        progress_buffer = ProgressBuffer(database_manager, max_pending=10, max_delay_ms=50)
+        progress_buffer.add(QuestionUserDataModel(level=1, correct_answer=1), 1)
+        with self.assertRaises(RuntimeError):
+            progress_buffer.flush().result()
+        time.sleep(0.5)
+        self.assertEqual({1: QuestionUserDataModel(level=1, correct_answer=1)}, database_manager.written)
+
+        database_manager.failures = 1
+        progress_buffer.add(QuestionUserDataModel(level=2, correct_answer=0), 2)
+        with self.assertRaises(RuntimeError):
+            progress_buffer.close()
+
+    def test_update_question_user_data_single_statement(self):
+        """Test that saving progress takes one statement and changes the row of the given question only. """
+        engine = self.database_manager.engine
+        # User data row of the second question gets identifier 1, equal to the first question identifier
+        with count_queries(engine) as statements:
+            self.database_manager.update_question_user_data(QuestionUserDataModel(level=1, correct_answer=1), 2)
+        self.assertEqual(1, len(statements))
+        with count_queries(engine) as statements:
+            self.database_manager.update_question_user_data(QuestionUserDataModel(level=0, correct_answer=2), 1)
+            self.database_manager.update_question_user_data(QuestionUserDataModel(level=2, correct_answer=0), 2)
+        self.assertEqual(2, len(statements))
+
+        result = self.database_manager.get_quiz(self.first_quiz.name)
+        self.assertEqual([QuestionUserDataModel(level=0, correct_answer=2),
+                          QuestionUserDataModel(level=2, correct_answer=0)],
+                         [question.user_data for question in result.questions])
+
+        with count_queries(engine) as statements:
+            self.database_manager.update_questions_user_data({1: QuestionUserDataModel(level=3, correct_answer=0),
+                                                              2: QuestionUserDataModel(level=4, correct_answer=0)})
+        self.assertEqual(1, len(statements))
+
+    def test_create_database_engine(self):
+        """Test that pragmas of the engine profiles are applied on connect. """
+        expected_pragmas = {'safe': {'journal_mode': 'wal', 'synchronous': 2, 'foreign_keys': 1, 'temp_store': 0},
+                            'fast': {'journal_mode': 'wal', 'synchronous': 1, 'foreign_keys': 1, 'temp_store': 2,
+                                     'mmap_size': ENGINE_PROFILES['fast']['mmap_size'],
+                                     'cache_size': ENGINE_PROFILES['fast']['cache_size']}}
+        for profile, pragmas in expected_pragmas.items():
+            engine = create_database_engine(self.database_manager.database_path, profile)
+            with engine.connect() as connection:
+                for name, value in pragmas.items():
+                    self.assertEqual(value, connection.exec_driver_sql(f'PRAGMA {name}').scalar(), (profile, name))
+            engine.dispose()
+
+        with self.assertRaises(ValueError):
+            create_database_engine(self.database_manager.database_path, 'unknown')
+
+    def test_get_quiz_query_plans(self):
+        """Test that every query of loading a quiz, from raw rows or ORM objects, finds rows with an index instead of
+        scanning whole tables.
+        """
+        self.database_manager.add_quiz(create_large_quiz('Indexed quiz', 100))
+        with count_queries(self.database_manager.engine, with_parameters=True) as statements:
+            self.database_manager.get_quiz('Indexed quiz')
+            self.database_manager.get_quiz('Indexed quiz', validate=True)
+
+        with self.database_manager.engine.connect() as connection:
+            for statement, parameters in statements:
+                plan = [row.detail for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)]
+                self.assertFalse(any(re.match(r'SCAN (quiz|question|answer|question_user_data)(_\d+)?\b', detail)
+                                     for detail in plan), plan)
+                self.assertTrue(any('USING INDEX' in detail or 'USING COVERING INDEX' in detail for detail in plan),
+                                plan)
+
+    def test_get_quizzes_summaries_order(self):
+        """Test that summaries are paged in the order of quizzes names, read from the name index without sorting. """
+        self.database_manager.add_quiz(QuizModel(name='A quiz', questions=[]))
+        self.database_manager.add_quiz(QuizModel(name='First quiz', questions=[]))
+        with count_queries(self.database_manager.engine, with_parameters=True) as statements:
+            summaries = self.database_manager.get_quizzes_summaries()
+
+        self.assertEqual(['A quiz', 'First quiz', 'First quiz', 'Second quiz'], [summary.name for summary in summaries])
+        self.assertEqual(self.first_quiz.id, summaries[1].id)
+        self.assertEqual(summaries[1:3], self.database_manager.get_quizzes_summaries(offset=1, limit=2))
+        with self.database_manager.engine.connect() as connection:
+            statement, parameters = statements[0]
+            plan = [row.detail for row in connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {statement}', parameters)]
+        self.assertTrue(any(re.fullmatch(r'SCAN quiz USING (COVERING )?INDEX ix_quiz_name', detail) for detail in plan),
+                        plan)
+        self.assertNotIn('USE TEMP B-TREE FOR ORDER BY', plan)
+
+    def test_concurrent_readers_and_writer(self):
+        """Stress test: readers in worker threads load quizzes while a writer saves progress. """
+        self.database_manager.add_quiz_bulk(create_large_quiz('Concurrent quiz', 50))
+        question_ids = [question.id for question in self.database_manager.get_quiz('Concurrent quiz').questions]
+        errors = []
+        stop = threading.Event()
+
+        def reader():
+            try:
+                while not stop.is_set():
+                    quiz = self.database_manager.get_quiz('Concurrent quiz')
+                    self.assertEqual(50, len(quiz.questions))
+                    self.assertEqual(['First quiz', 'Second quiz', 'Concurrent quiz'],
+                                     self.database_manager.get_quizzes_names())
+            except BaseException as exc:
+                errors.append(exc)
+            finally:
+                self.database_manager.close_session()
+
+        def writer():
+            try:
+                for level in range(4):
+                    for question_id in question_ids:
+                        self.database_manager.update_question_user_data(
+                            QuestionUserDataModel(level=level, correct_answer=0), question_id)
+                    with self.database_manager.session_scope() as session:
+                        self.assertEqual(50, session.query(QuestionUserData).filter(
+                            QuestionUserData.level == level).count())
+            except BaseException as exc:
+                errors.append(exc)
+            finally:
+                self.database_manager.close_session()
+
+        readers = [threading.Thread(target=reader) for _ in range(4)]
+        writer_thread = threading.Thread(target=writer)
+        for thread in readers + [writer_thread]:
+            thread.start()
+        writer_thread.join()
+        stop.set()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual([], errors)
+        quiz = self.database_manager.get_quiz('Concurrent quiz')
+        self.assertEqual([QuestionUserDataModel(level=3, correct_answer=0)] * 50,
+                         [question.user_data for question in quiz.questions])
@@ -0,0 +1,64 @@
+"""Unit tests for the import time profiler. """
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from src.import_profiler import ImportTime, format_report, parse_import_times, profile_imports
+
+IMPORT_TIME_OUTPUT = '''import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        420 | io
+import time:        80 |         80 |     sqlalchemy.util
+import time:      1500 |       1580 |   sqlalchemy.engine
+not an import time line
+import time:       900 |       2480 | sqlalchemy
+'''
+# Modules which should not be imported before a quiz is opened
+HEAVY_MODULES = ('sqlalchemy', 'pydantic', 'PySide6.QtCharts')
+
+
+class ImportProfilerTests(TestCase):
+    """Unit tests for parsing -X importtime output and writing the report. """
+
+    def test_parse_import_times(self):
+        """Test that import times are parsed with their nesting depth and other lines are skipped. """
+        import_times = parse_import_times(IMPORT_TIME_OUTPUT.splitlines())
+
+        self.assertEqual(5, len(import_times))
+        self.assertEqual(ImportTime(module='_io', self_us=120, cumulative_us=120, depth=1), import_times[0])
+        self.assertEqual(ImportTime(module='sqlalchemy.util', self_us=80, cumulative_us=80, depth=2),
+                         import_times[2])
+        self.assertEqual(ImportTime(module='sqlalchemy', self_us=900, cumulative_us=2480, depth=0), import_times[4])
+
+    def test_format_report(self):
+        """Test that total time counts top level imports only and modules are sorted by cumulative time. """
+        report = format_report(parse_import_times(IMPORT_TIME_OUTPUT.splitlines()), size=2).splitlines()
+
+        self.assertEqual('Imported modules: 5, total import time: 2.9 ms', report[0])
+        self.assertEqual(['sqlalchemy', 'sqlalchemy.engine'], [line.split()[-1] for line in report[3:]])
+
+    def test_profile_imports(self):
+        """Test that the report is written for a child interpreter and its exit code is returned. """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            report_path = str(Path(tmp_dir, 'report.txt'))
+            exit_code = profile_imports(['-c', 'import json; raise SystemExit(3)'], report_path)
+            report = Path(report_path).read_text()
+
+        self.assertEqual(3, exit_code)
+        self.assertIn('  json\n', report)
+
+    def test_gui_startup_defers_heavy_imports(self):
+        """Test that starting the graphic user interface does not import database, models and charts modules. """
+        environment = {**os.environ, 'PYTHONPATH': 'src', 'QT_QPA_PLATFORM': 'offscreen'}
+        process = subprocess.run([sys.executable, '-X', 'importtime', '-c',
+                                  'from PySide6.QtWidgets import QApplication; import run_gui; '
+                                  'application = QApplication([]); run_gui.create_main_window()'],
+                                 env=environment, capture_output=True, text=True)
+
+        self.assertEqual(0, process.returncode, process.stderr)
+        modules = [import_time.module for import_time in parse_import_times(process.stderr.splitlines())]
+        self.assertIn('gui.main_window', modules)
+        self.assertEqual([], [module for module in modules if module.startswith(HEAVY_MODULES)])
@@ -0,0 +1,57 @@
+"""Unit tests for the learning levels sampler. """
+from collections import Counter
+from unittest import TestCase
+
+from src.learning_sampler import LevelSampler, LEVELS_PROBABILITY, numpy
+
+
+class LevelSamplerTests(TestCase):
+    """Unit tests for LevelSampler class. """
+    LEVEL_SIZES = [10, 0, 5, 1, 0]
+
+    def create_samplers(self, seed=None):
+        """Create samplers drawing with the random module and, if it is available, with NumPy. """
+        samplers = [LevelSampler(self.LEVEL_SIZES, seed=seed, use_numpy=False)]
+        if numpy is not None:
+            samplers.append(LevelSampler(self.LEVEL_SIZES, seed=seed))
+        return samplers
+
+    def test_seed(self):
+        """Check that samplers with the same seed draw the same positions. """
+        for first_sampler, second_sampler in zip(self.create_samplers(seed=1), self.create_samplers(seed=1)):
+            self.assertEqual([first_sampler.draw() for _ in range(10)], [second_sampler.draw() for _ in range(10)])
+            self.assertEqual(first_sampler.draw_batch(100), second_sampler.draw_batch(100))
+
+            first_sampler.seed(2)
+            second_sampler.seed(2)
+            self.assertEqual(first_sampler.draw_batch(100), second_sampler.draw_batch(100))
+
+    def test_draw_batch(self):
+        """Check that positions are drawn only from non-empty levels, with levels probabilities. """
+        number = 100000
+        for sampler in self.create_samplers(seed=0):
+            levels, indexes = sampler.draw_batch(number)
+            self.assertEqual(number, len(levels))
+            self.assertTrue(all(0 <= index < self.LEVEL_SIZES[level] for level, index in zip(levels, indexes)))
+
+            levels_counter = Counter(levels)
+            self.assertEqual({0, 2, 3}, set(levels_counter))
+            total_probability = LEVELS_PROBABILITY[0] + LEVELS_PROBABILITY[2] + LEVELS_PROBABILITY[3]
+            for level in (0, 2, 3):
+                self.assertAlmostEqual(LEVELS_PROBABILITY[level] / total_probability,
+                                       levels_counter[level] / number, delta=0.01)
+
+    def test_set_level_size(self):
+        """Check that levels becoming empty are no longer drawn and the other way round. """
+        for sampler in self.create_samplers(seed=0):
+            sampler.set_level_size(0, 0)
+            sampler.set_level_size(2, 0)
+            sampler.set_level_size(4, 2)
+            self.assertEqual({3, 4}, {sampler.draw()[0] for _ in range(100)})
+            self.assertEqual({3, 4}, set(sampler.draw_batch(100)[0]))
+
+            sampler.set_level_size(3, 0)
+            sampler.set_level_size(4, 0)
+            self.assertTrue(sampler.is_empty())
+            with self.assertRaises(ValueError):
+                sampler.draw()
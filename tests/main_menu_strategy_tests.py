@@ -0,0 +1,66 @@
+"""Module contain unit tests for the main menu strategy. """
+import unittest
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtWidgets import QApplication, QWidget
+
+from src.gui.main_window import MainWindow
+from src.gui.strategy.main_menu import MainMenuStrategy
+
+
+class StubStrategy(QObject):
+    """Strategy counting its instances. """
+    strategy_change = Signal(QObject)
+    instances = 0
+
+    def __init__(self):
+        """Constructor. """
+        super().__init__()
+        StubStrategy.instances += 1
+        self.widget = QWidget()
+
+    def get_widgets(self) -> QWidget:
+        """ Get this strategy widgets. """
+        yield self.widget
+
+
+class MainMenuStrategyTests(unittest.TestCase):
+    """Class contain unit tests for the main menu strategy. """
+
+    @classmethod
+    def setUpClass(cls):
+        """Create application needed by widgets. """
+        cls.application = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Create main window with the main menu, sub-strategies are stubs. """
+        StubStrategy.instances = 0
+        self.main_menu_strategy = MainMenuStrategy(quiz_strategy=StubStrategy,
+                                                   about_program_strategy=StubStrategy,
+                                                   manage_quiz_strategy=StubStrategy,
+                                                   create_quiz_strategy=StubStrategy)
+        self.window = MainWindow()
+        self.window.set_stack_widgets(self.main_menu_strategy.get_widgets())
+        self.window.set_strategy(self.main_menu_strategy)
+
+    def test_strategies_are_created_on_navigation(self):
+        """Check if a sub-strategy is created the first time user navigates to it, and only then. """
+        self.assertEqual(0, StubStrategy.instances)
+        self.assertEqual(1, self.window.stack_widget.count())
+
+        self.main_menu_strategy.run_about()
+        about_program_strategy = self.window.strategy
+        self.assertEqual(1, StubStrategy.instances)
+        self.assertIs(about_program_strategy.widget, self.window.stack_widget.currentWidget())
+
+        self.window.set_strategy(self.main_menu_strategy)
+        self.main_menu_strategy.run_about()
+        self.assertEqual(1, StubStrategy.instances)
+        self.assertIs(about_program_strategy, self.window.strategy)
+        self.assertEqual(2, self.window.stack_widget.count())
+        self.assertEqual([self.main_menu_strategy.widget, about_program_strategy.widget],
+                         list(self.main_menu_strategy.get_widgets()))
+
+
+if __name__ == '__main__':
+    unittest.main()
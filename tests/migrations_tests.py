@@ -0,0 +1,159 @@
+"""Unit tests for upgrading databases created by previous versions of the application. """
+import tempfile
+from pathlib import Path
+from unittest import TestCase
+
+from sqlalchemy import create_engine
+
+from src.database.database_manager import DatabaseManager
+from src.database.migrations import upgrade_database, get_database_version, set_database_version, Migration, \
+    Backfill, CreateIndex, Transactional, MigrationError, LATEST_VERSION, MIGRATIONS
+
+# Schema and data of a database in version 0.0.1
+DATABASE_0_0_1 = [
+    'CREATE TABLE quiz (id INTEGER NOT NULL, name TEXT NOT NULL, description TEXT, date DATETIME, PRIMARY KEY (id))',
+    'CREATE TABLE version (id INTEGER NOT NULL, major INTEGER NOT NULL, minor INTEGER NOT NULL, '
+    'patch INTEGER NOT NULL, PRIMARY KEY (id))',
+    'CREATE TABLE question (id INTEGER NOT NULL, quiz_id INTEGER, text TEXT NOT NULL, image_path TEXT, comment TEXT, '
+    'PRIMARY KEY (id), FOREIGN KEY(quiz_id) REFERENCES quiz (id))',
+    'CREATE TABLE question_user_data (id INTEGER NOT NULL, question_id INTEGER, level INTEGER NOT NULL, '
+    'correct_answer INTEGER NOT NULL, comment TEXT, PRIMARY KEY (id), '
+    'FOREIGN KEY(question_id) REFERENCES question (id))',
+    'CREATE TABLE answer (id INTEGER NOT NULL, question_id INTEGER, text TEXT NOT NULL, is_correct BOOLEAN, '
+    'PRIMARY KEY (id), FOREIGN KEY(question_id) REFERENCES question (id))',
+    'INSERT INTO version (major, minor, patch) VALUES (0, 0, 1)',
+    "INSERT INTO quiz (id, name) VALUES (1, 'Quiz')",
+    "INSERT INTO question (id, quiz_id, text) VALUES (1, 1, 'Question 1'), (2, 1, 'Question 2')",
+    "INSERT INTO answer (id, question_id, text, is_correct) VALUES (1, 1, 'A', 1), (2, 2, 'B', 0)",
+    'INSERT INTO question_user_data (id, question_id, level, correct_answer) VALUES (1, 1, 1, 0), (2, 1, 2, 1), '
+    '(3, 2, 3, 0)',
+]
+
+
+def get_schema(engine) -> dict:
+    """Return columns of every table, columns of every index and SQL of every trigger of the database. """
+    schema = {}
+    with engine.connect() as connection:
+        for object_type, name, sql in connection.exec_driver_sql(
+                "SELECT type, name, sql FROM sqlite_master WHERE name NOT LIKE 'sqlite_%' "
+                "AND (type = 'trigger' OR name NOT LIKE 'question_search_%')"):
+            if object_type == 'table':
+                schema[name] = connection.exec_driver_sql(f'PRAGMA table_info({name})').all()
+            elif object_type == 'index':
+                schema[name] = connection.exec_driver_sql(f'PRAGMA index_xinfo({name})').all()
+            else:
+                schema[name] = sql
+    return schema
+
+
+class MigrationsTests(TestCase):
+    """Unit tests for database migrations. """
+
+    def setUp(self):
+        """Create database in version 0.0.1 in temporary directory. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.engine = create_engine('sqlite:///' + str(Path(self.tmp_dir.name, 'quiz.db')))
+        with self.engine.begin() as connection:
+            for statement in DATABASE_0_0_1:
+                connection.exec_driver_sql(statement)
+
+    def tearDown(self) -> None:
+        """Delete temporary directory. """
+        self.engine.dispose()
+        self.tmp_dir.cleanup()
+
+    def test_latest_version(self):
+        """Test that new databases are created in the version reached by migrations. """
+        self.assertEqual(DatabaseManager.DATABASE_VERSION, LATEST_VERSION)
+
+    def test_upgrade_0_0_1(self):
+        """Test upgrading database in version 0.0.1: data is kept and indexes are created. """
+        self.assertEqual([(0, 0, 2), (0, 0, 3), (0, 0, 4)], upgrade_database(self.engine))
+        self.assertEqual([], upgrade_database(self.engine))
+
+        with self.engine.connect() as connection:
+            self.assertEqual((0, 0, 4), get_database_version(connection))
+            indexes = {row.name: row.unique for table in ('quiz', 'question', 'answer', 'question_user_data')
+                       for row in connection.exec_driver_sql(f'PRAGMA index_list({table})')}
+            self.assertEqual({'ix_quiz_name': 0, 'ix_question_quiz_id': 0, 'ix_answer_question_id': 0,
+                              'ix_question_user_data_question_id': 1}, indexes)
+            self.assertEqual([(1, 2, 1), (2, 3, 0)], connection.exec_driver_sql(
+                'SELECT question_id, level, correct_answer FROM question_user_data ORDER BY question_id').all())
+            self.assertEqual([(1, 1, 'A'), (2, 2, 'B')],
+                             connection.exec_driver_sql('SELECT id, question_id, text FROM answer').all())
+            tables = {row[0] for row in connection.exec_driver_sql("SELECT name FROM sqlite_master WHERE type='table'")}
+            self.assertTrue({'source_file', 'question_hash'} <= tables)
+
+    def test_upgraded_schema(self):
+        """Test that an upgraded database has the same tables, columns, indexes and triggers as a new one. """
+        upgrade_database(self.engine)
+        database_path = str(Path(self.tmp_dir.name, 'new_quiz.db'))
+        DatabaseManager.create_database(database_path)
+        new_engine = create_engine('sqlite:///' + database_path)
+        try:
+            self.assertEqual(get_schema(new_engine), get_schema(self.engine))
+        finally:
+            new_engine.dispose()
+
+    def test_upgrade_0_0_2(self):
+        """Test that the upgrade to version 0.0.3 adds the last studied column, empty for existing progress. """
+        upgrade_database(self.engine, MIGRATIONS[:1])
+        self.assertEqual([(0, 0, 3)], upgrade_database(self.engine, MIGRATIONS[:2]))
+        self.assertEqual([], upgrade_database(self.engine, MIGRATIONS[:2]))
+
+        with self.engine.connect() as connection:
+            self.assertEqual([(1, None), (2, None)], connection.exec_driver_sql(
+                'SELECT question_id, last_studied FROM question_user_data ORDER BY question_id').all())
+
+    def test_upgrade_0_0_3(self):
+        """Test that the upgrade to version 0.0.4 indexes existing questions and keeps the index in sync. """
+        upgrade_database(self.engine, MIGRATIONS[:2])
+        self.assertEqual([(0, 0, 4)], upgrade_database(self.engine))
+
+        with self.engine.begin() as connection:
+            self.assertEqual([(1, 'Question 1', 'A'), (2, 'Question 2', 'B')], connection.exec_driver_sql(
+                'SELECT rowid, text, answers FROM question_search ORDER BY rowid').all())
+            connection.exec_driver_sql("INSERT INTO answer (id, question_id, text, is_correct) VALUES (3, 1, 'C', 0)")
+            connection.exec_driver_sql("UPDATE question SET text = 'Changed' WHERE id = 2")
+            self.assertEqual([(1, 'Question 1', 'A\nC'), (2, 'Changed', 'B')], connection.exec_driver_sql(
+                'SELECT rowid, text, answers FROM question_search ORDER BY rowid').all())
+
+    def test_interrupted_upgrade(self):
+        """Test that an upgrade failing in the middle keeps the version and may be run again. """
+        def fail(_connection):
+            raise RuntimeError('Upgrade interrupted')
+
+        operations = [CreateIndex('ix_answer_text', 'answer', ['text']),
+                      Backfill('question_user_data', 'UPDATE question_user_data SET comment = id '
+                                             'WHERE id BETWEEN :first_id AND :last_id',
+                               batch_size=1)]
+        failing_migrations = [Migration((0, 0, 1), (0, 0, 2), [*operations, Transactional(fail)])]
+        with self.assertRaises(RuntimeError):
+            upgrade_database(self.engine, failing_migrations)
+        with self.engine.connect() as connection:
+            self.assertEqual((0, 0, 1), get_database_version(connection))
+            self.assertEqual([('1',), ('2',), ('3',)], connection.exec_driver_sql(
+                'SELECT comment FROM question_user_data ORDER BY id').all())
+
+        self.assertEqual([(0, 0, 2)], upgrade_database(self.engine, [Migration((0, 0, 1), (0, 0, 2), operations)]))
+        with self.engine.connect() as connection:
+            self.assertEqual((0, 0, 2), get_database_version(connection))
+            self.assertEqual([('1',), ('2',), ('3',)], connection.exec_driver_sql(
+                'SELECT comment FROM question_user_data ORDER BY id').all())
+
+    def test_missing_version(self):
+        """Test that reading the version of a database without one raises an exception. """
+        with self.engine.begin() as connection:
+            connection.exec_driver_sql('DELETE FROM version')
+            with self.assertRaisesRegex(MigrationError, 'empty'):
+                get_database_version(connection)
+            connection.exec_driver_sql('DROP TABLE version')
+            with self.assertRaisesRegex(MigrationError, 'no version table'):
+                get_database_version(connection)
+
+    def test_unknown_version(self):
+        """Test that upgrading database in an unknown version raises an exception. """
+        with self.engine.begin() as connection:
+            set_database_version(connection, (1, 0, 0))
+        with self.assertRaises(MigrationError):
+            upgrade_database(self.engine)
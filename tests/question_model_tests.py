@@ -36,6 +36,15 @@ class LearningModelUnitTests(TestCase):
 
         self.assertEqual(expected_result, LearningModel.create_from_quiz_model(self.quiz_model))
 
+    def test_create_without_unique_identifiers(self):
+        """Check that questions without identifiers or with repeated ones are rejected, they couldn't be updated. """
+        stored_questions = copy.deepcopy(self.questions)
+        stored_questions[2].id = stored_questions[0].id
+        parsed_questions = [question.copy(update={'id': None}) for question in self.questions]
+        for questions in (stored_questions, parsed_questions):
+            with self.assertRaises(ValueError):
+                LearningModel.create_from_quiz_model(QuizModel(name='quiz name', questions=questions))
+
     def test_iteration(self):
         """Base test for iterating over questions. """
         learning_model = LearningModel.create_from_quiz_model(self.quiz_model)
@@ -60,3 +69,43 @@ class LearningModelUnitTests(TestCase):
             next(learning_model)
 
         self.assertEqual('Study finished, every question is on the top level of study.', err.exception.value)
+
+    def test_update_question(self):
+        """Check moving questions between levels after their user data changed. """
+        learning_model = LearningModel.create_from_quiz_model(copy.deepcopy(self.quiz_model))
+        first_question, third_question = learning_model.learning_levels[0]
+
+        for _ in range(3):
+            first_question.correct_answer()
+        learning_model.update_question(first_question)
+        self.assertEqual([1, 1, 0, 1, 0], learning_model.get_number_of_questions_on_levels())
+        self.assertEqual(1, learning_model.get_question_level(first_question))
+        self.assertEqual(0, learning_model.get_question_level(third_question))
+        self.assertEqual([third_question], learning_model.learning_levels[0])
+
+        third_question.user_data.level = 3
+        learning_model.update_question(third_question)
+        first_question.user_data.level = 0
+        learning_model.update_question(first_question)
+        self.assertEqual([[first_question], [], [], [self.questions[1], third_question], []],
+                         learning_model.learning_levels)
+        self.assertEqual(1, learning_model.learning_levels[3].index(third_question))
+        self.assertEqual(3, learning_model.get_question_level(third_question))
+
+    def test_contains(self):
+        """Check if questions in the model are found. """
+        learning_model = LearningModel.create_from_quiz_model(self.quiz_model)
+        self.assertTrue(all(question in learning_model for question in self.questions))
+        self.assertFalse(QuestionModel(id=4, text='question 4', answers=[]) in learning_model)
+
+    def test_next_questions(self):
+        """Check drawing a batch of questions and reproducing the draws with a seed. """
+        learning_model = LearningModel.create_from_quiz_model(self.quiz_model)
+        learning_model.seed(1)
+        questions = learning_model.next_questions(50)
+        single_questions = [next(learning_model) for _ in range(50)]
+
+        learning_model.seed(1)
+        self.assertEqual(questions, learning_model.next_questions(50))
+        self.assertEqual(single_questions, [next(learning_model) for _ in range(50)])
+        self.assertTrue(all(question in learning_model for question in questions))
@@ -0,0 +1,86 @@
+"""Unit tests for the compact question store used while studying. """
+from unittest import TestCase
+
+from src.question_model import LearningModel, QuizModel, QuestionModel, AnswerModel, QuestionUserDataModel
+from src.question_store import QuestionStore, StudyAnswer, StudyModel, StudyQuestion
+
+
+def create_quiz_model(number_of_questions: int) -> QuizModel:
+    """Create quiz model, every third question has progress. """
+    questions = [QuestionModel(id=index + 1, text=f'question {index}',
+                               answers=[AnswerModel(text=f'answer {index}.{answer}', is_correct=answer != index % 3)
+                                        for answer in range(3)],
+                               user_data=QuestionUserDataModel(level=index % 5, correct_answer=1)
+                               if index % 3 == 0 else None)
+                 for index in range(number_of_questions)]
+    return QuizModel(name='quiz', questions=questions)
+
+
+class QuestionStoreTests(TestCase):
+    """Unit tests for QuestionStore and StudyModel classes. """
+
+    def setUp(self):
+        """Create quiz model. """
+        self.quiz_model = create_quiz_model(30)
+
+    def test_from_quiz_model(self):
+        """Check if questions, answers and progress are converted from the quiz model. """
+        store = QuestionStore.from_quiz_model(self.quiz_model)
+
+        self.assertEqual(30, len(store))
+        question = StudyQuestion(store, 4)
+        self.assertEqual(5, question.id)
+        self.assertEqual('question 4', question.text)
+        self.assertEqual((StudyAnswer('answer 4.0', True), StudyAnswer('answer 4.1', False),
+                          StudyAnswer('answer 4.2', True)), question.answers)
+        self.assertEqual(QuestionUserDataModel(level=0, correct_answer=0), question.user_data)
+        self.assertEqual(QuestionUserDataModel(level=3, correct_answer=1), StudyQuestion(store, 3).user_data)
+
+    def test_too_many_answers(self):
+        """Check if a question with more answers than fits in a bitmask is rejected. """
+        answers = [AnswerModel(text=str(index), is_correct=True) for index in range(QuestionStore.MAX_ANSWERS + 1)]
+
+        with self.assertRaises(ValueError):
+            QuestionStore().append(QuestionModel(id=1, text='question', answers=answers))
+
+    def test_answers_follow_question_model_rules(self):
+        """Check if levels and correct answers change the same way as in question models. """
+        store = QuestionStore.from_quiz_model(self.quiz_model)
+        for index, question_model in enumerate(self.quiz_model.questions):
+            question_model.user_data = question_model.user_data or QuestionUserDataModel()
+            for answer in range(20):
+                if answer % 7 == 6:
+                    question_model.incorrect_answer()
+                    store.incorrect_answer(index)
+                else:
+                    question_model.correct_answer()
+                    store.correct_answer(index)
+                self.assertEqual(question_model.user_data, store.get_user_data_model(index))
+
+    def test_study_model_draws_like_learning_model(self):
+        """Check if the study model draws the same questions as the learning model and moves them between levels. """
+        learning_model = LearningModel.create_from_quiz_model(create_quiz_model(30))
+        study_model = StudyModel.create_from_quiz_model(self.quiz_model)
+        learning_model.seed(1)
+        study_model.seed(1)
+
+        for answer in range(500):
+            learning_question, study_question = next(learning_model), next(study_model)
+            self.assertEqual(learning_question.id, study_question.id)
+            self.assertIn(study_question, study_model)
+            if answer % 4:
+                learning_question.correct_answer()
+                study_question.correct_answer()
+                learning_model.update_question(learning_question)
+                study_model.update_question(study_question)
+            self.assertEqual(learning_model.get_number_of_questions_on_levels(),
+                             study_model.get_number_of_questions_on_levels())
+            self.assertEqual(study_question.level, study_model.get_question_level(study_question))
+
+    def test_reset_progress(self):
+        """Check if resetting progress moves every question to the first level. """
+        store = QuestionStore.from_quiz_model(self.quiz_model)
+        store.reset_progress()
+
+        self.assertEqual([30, 0, 0, 0, 0], StudyModel(store).get_number_of_questions_on_levels())
+        self.assertEqual(QuestionUserDataModel(level=0, correct_answer=0), StudyQuestion(store, 3).user_data)
@@ -1,13 +1,61 @@
 """Module contain unit tests for the question strategy. """
+import tempfile
+import tracemalloc
 import unittest
+from pathlib import Path
 
+from PySide6.QtCore import QCoreApplication, QEvent
+from PySide6.QtCharts import QChartView
 from PySide6.QtGui import QColorConstants, QColor
+from PySide6.QtWidgets import QApplication
 
-from src.gui.strategy.question import blend_colors
+from src.gui.strategy import question
+from src.gui.strategy.question import blend_colors, QuestionStrategy
+from src.gui.widgets import QuestionWidget
+from src.question_model import QuizModel, QuestionModel, AnswerModel
+from src.question_store import StudyModel
+
+# Qt bindings without immortal None (Python < 3.12 with PySide6 6.12) drop about 20 references to None for every
+# drawn question and abort the interpreter when its reference count reaches zero, so the session is kept well below
+# the tens of thousands of references the interpreter holds
+LONG_SESSION_QUESTIONS = 1000
+
+
+def process_deferred_deletes():
+    """Delete widgets scheduled with deleteLater, as the event loop would. """
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
 
 
 class QuestionStrategyTests(unittest.TestCase):
     """Class contain unit tests for the question strategy. """
+
+    @classmethod
+    def setUpClass(cls):
+        """Create application needed by widgets. """
+        cls.application = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        """Create question strategy using a temporary database. """
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        database_path = str(Path(self.tmp_dir.name, 'quiz.db'))
+        # Strategy uses the database manager imported by the gui package
+        database_manager_class = question.DatabaseManager
+        database_manager_class.create_database(database_path)
+        # Database manager is a singleton, instance for the temporary database must not be shared with other tests
+        self.singleton_instances = type(database_manager_class)._instances
+        self.previous_instance = self.singleton_instances.pop(database_manager_class, None)
+        database_manager_class(database_path)
+        self.strategy = QuestionStrategy()
+
+    def tearDown(self) -> None:
+        """Restore database manager and delete temporary directory. """
+        self.strategy.progress_buffer.close()
+        self.strategy.database_manager.engine.dispose()
+        self.singleton_instances.pop(question.DatabaseManager, None)
+        if self.previous_instance:
+            self.singleton_instances[question.DatabaseManager] = self.previous_instance
+        self.tmp_dir.cleanup()
+
     def test_blend_colors(self):
         """Check if blending colors produces correct result. """
         expected_result = [QColor(255, 0, 0),
@@ -19,3 +67,74 @@ class QuestionStrategyTests(unittest.TestCase):
 
         result = list(blend_colors(QColorConstants.Red, QColorConstants.Green, 5))
         self.assertEqual(expected_result, result)
+
+    def test_progress_chart_values(self):
+        """Check if the progress chart shows the current number of questions on levels. """
+        questions = [QuestionModel(id=index, text=f'Question {index}',
+                                   answers=[AnswerModel(text='Answer', is_correct=True)]) for index in range(10)]
+        self.strategy.start_quiz(StudyModel.create_from_quiz_model(QuizModel(name='quiz', questions=questions)))
+
+        for _ in range(3):
+            self.strategy.current_question.correct_answer()
+        self.strategy.question_iterator.update_question(self.strategy.current_question)
+        self.strategy.draw_next_question()
+
+        self.assertEqual([9, 1, 0, 0, 0], [bar_set.at(0) for bar_set in self.strategy.progress_chart.bar_sets])
+
+    def test_answer_check_boxes_are_reused(self):
+        """Check if answers checkboxes are reused by the next questions and clicks are assigned to right answers. """
+        questions = [QuestionModel(id=index, text=f'Question {index}',
+                                   answers=[AnswerModel(text=f'Answer {index}.{answer}', is_correct=answer == 0)
+                                            for answer in range(2 + index)])
+                     for index in range(2)]
+        quiz_model = QuizModel(name='quiz', questions=questions)
+        # Answered questions progress is saved, so they have to be stored
+        self.strategy.database_manager.add_quiz_bulk(quiz_model)
+        self.strategy.start_quiz(StudyModel.create_from_quiz_model(quiz_model))
+        while len(self.strategy.current_question.answers) != 3:
+            self.strategy.draw_next_question()
+        check_boxes = list(self.strategy.widget.answer_check_boxes)
+
+        self.strategy.widget.answer_check_boxes[1].click()
+        self.strategy.next_or_check_question()
+        self.assertEqual([False, True, False], self.strategy.manage_answer.answer_model)
+        self.assertEqual(QuestionWidget.RED_STYLE_SHEET, check_boxes[0].styleSheet())
+        self.assertFalse(check_boxes[2].isEnabled())
+
+        while len(self.strategy.current_question.answers) != 2:
+            self.strategy.draw_next_question()
+        self.assertEqual(check_boxes, self.strategy.widget.answer_check_boxes)
+        self.assertEqual(['Answer 0.0', 'Answer 0.1'], [check_box.text() for check_box in check_boxes[:2]])
+        self.assertEqual([False, False, True], [check_box.isHidden() for check_box in check_boxes])
+        self.assertEqual(['', ''], [check_box.styleSheet() for check_box in check_boxes[:2]])
+        self.assertTrue(all(check_box.isEnabled() and not check_box.isChecked() for check_box in check_boxes[:2]))
+
+    def test_long_session_is_flat(self):
+        """Check if widgets number and memory do not grow while questions are drawn in a long session. """
+        questions = [QuestionModel(id=index, text=f'Question {index}',
+                                   answers=[AnswerModel(text=f'Answer {answer}', is_correct=answer == 0)
+                                            for answer in range(4)])
+                     for index in range(100)]
+        self.strategy.start_quiz(StudyModel.create_from_quiz_model(QuizModel(name='quiz', questions=questions)))
+        process_deferred_deletes()
+        widgets_at_start = len(QApplication.allWidgets())
+
+        tracemalloc.start()
+        try:
+            for index in range(LONG_SESSION_QUESTIONS):
+                self.strategy.draw_next_question()
+                process_deferred_deletes()
+                if index == LONG_SESSION_QUESTIONS // 10:
+                    memory_after_warm_up, _ = tracemalloc.get_traced_memory()
+            memory_at_end, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.assertEqual(widgets_at_start, len(QApplication.allWidgets()))
+        self.assertEqual(1, len(self.strategy.widget.findChildren(QChartView)))
+        self.assertEqual(1, self.strategy.widget.chart_layout.count())
+        self.assertLess(memory_at_end - memory_after_warm_up, 256 * 1024)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+"""Module contain unit tests for the lazy quiz list model and the choose quiz widget. """
+import unittest
+from datetime import datetime
+from typing import List, Optional
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QApplication
+
+from src.gui.quiz_list_model import QuizListModel, get_quiz_description
+from src.gui.widgets import ChooseQuizWidget
+from src.question_model import QuizSummaryModel
+
+
+class StubQuizzesSummaries:
+    """Summaries of generated quizzes, paged the way the database manager does it. Fetched pages are recorded. """
+
+    def __init__(self, number_of_quizzes: int):
+        """Constructor. """
+        self.summaries = [QuizSummaryModel(id=index, name=f'Quiz {index}', number_of_questions=10,
+                                           questions_on_levels=[10 - index % 10, 0, 0, 0, index % 10])
+                          for index in range(number_of_quizzes)]
+        self.pages = []
+
+    def __call__(self, offset: int, limit: int, name_filter: Optional[str]) -> List[QuizSummaryModel]:
+        """Return summaries of a page of quizzes with names containing the filter. """
+        self.pages.append((offset, limit, name_filter))
+        summaries = [summary for summary in self.summaries
+                     if not name_filter or name_filter.lower() in summary.name.lower()]
+        return summaries[offset:offset + limit]
+
+
+class QuizListModelTests(unittest.TestCase):
+    """Class contain unit tests for the lazy quiz list model. """
+
+    @classmethod
+    def setUpClass(cls):
+        """Views need an application. """
+        cls.application = QApplication.instance() or QApplication([])
+
+    def test_fetch_pages(self):
+        """Test that quizzes are fetched page by page until a page shorter than the page size is fetched. """
+        fetch_summaries = StubQuizzesSummaries(25)
+        model = QuizListModel(fetch_summaries, page_size=10)
+        self.assertEqual(0, model.rowCount())
+        self.assertEqual([], fetch_summaries.pages)
+
+        while model.canFetchMore():
+            model.fetchMore()
+
+        self.assertEqual([(0, 10, None), (10, 10, None), (20, 10, None)], fetch_summaries.pages)
+        self.assertEqual(25, model.rowCount())
+        self.assertEqual('Quiz 13', model.index(13).data(QuizListModel.QUIZ_NAME_ROLE))
+        self.assertEqual('Quiz 13 (3/10 learnt)', model.index(13).data(Qt.DisplayRole))
+        self.assertIsNone(model.index(25).data(Qt.DisplayRole))
+
+    def test_set_name_filter(self):
+        """Test that setting the filter drops fetched quizzes and fetches filtered ones from the first page. """
+        fetch_summaries = StubQuizzesSummaries(25)
+        model = QuizListModel(fetch_summaries, page_size=10)
+        model.fetchMore()
+
+        model.set_name_filter('quiz 1')
+        self.assertEqual(0, model.rowCount())
+        model.fetchMore()
+
+        self.assertEqual((0, 10, 'quiz 1'), fetch_summaries.pages[-1])
+        self.assertEqual(['Quiz 1', *[f'Quiz {index}' for index in range(10, 19)]],
+                         [model.index(row).data(QuizListModel.QUIZ_NAME_ROLE) for row in range(model.rowCount())])
+        self.assertTrue(model.canFetchMore())
+
+    def test_view_fetches_visible_rows_only(self):
+        """Test that the view opens the list fetching the first page only, whatever the number of quizzes. """
+        fetch_summaries = StubQuizzesSummaries(10000)
+        widget = ChooseQuizWidget()
+        widget.set_quizzes_model(QuizListModel(fetch_summaries, page_size=50))
+        widget.show()
+        self.application.processEvents()
+
+        self.assertEqual([(0, 50, None)], fetch_summaries.pages)
+        widget.close()
+
+    def test_choose_filtered_quiz(self):
+        """Test that pressing enter in the search field chooses the first quiz matching the typed text. """
+        widget = ChooseQuizWidget()
+        widget.set_quizzes_model(QuizListModel(StubQuizzesSummaries(25)))
+        chosen = []
+        widget.choose_quiz.connect(chosen.append)
+
+        widget.search_edit.setText('z 2')
+        widget.search_edit.returnPressed.emit()
+
+        self.assertEqual(['Quiz 2'], chosen)
+
+    def test_quiz_description(self):
+        """Test that the description shows progress and the day the quiz was last studied. """
+        summary = QuizSummaryModel(id=1, name='Quiz', number_of_questions=5, questions_on_levels=[3, 0, 0, 0, 2],
+                                   last_studied=datetime(2022, 5, 1, 12, 30))
+
+        self.assertEqual('Quiz (2/5 learnt, last studied 2022-05-01)', get_quiz_description(summary))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""Module contain unit tests for the background quiz loader. """
+import unittest
+
+from PySide6.QtCore import QCoreApplication, QThreadPool
+from PySide6.QtWidgets import QApplication
+
+from src.gui.quiz_loader import QuizLoader
+from src.question_model import QuizModel, QuestionModel, AnswerModel
+
+
+class StubDatabaseManager:
+    """Database manager returning a prepared quiz. """
+
+    def __init__(self, quiz_model: QuizModel = None, error: Exception = None):
+        """Constructor. """
+        self.quiz_model = quiz_model
+        self.error = error
+        self.closed_sessions = 0
+
+    def get_quiz(self, name: str) -> QuizModel:
+        """Return the prepared quiz or raise the prepared error. """
+        if self.error is not None:
+            raise self.error
+        return self.quiz_model
+
+    def close_session(self) -> None:
+        """Count closed sessions. """
+        self.closed_sessions += 1
+
+
+def create_quiz_model(number_of_questions: int) -> QuizModel:
+    """Create quiz model with questions having a single correct answer. """
+    questions = [QuestionModel(id=index, text=f'Question {index}',
+                               answers=[AnswerModel(text='Answer', is_correct=True)])
+                 for index in range(1, number_of_questions + 1)]
+    return QuizModel(name='quiz', questions=questions)
+
+
+class QuizLoaderTests(unittest.TestCase):
+    """Class contain unit tests for the background quiz loader. """
+
+    @classmethod
+    def setUpClass(cls):
+        """Signals emitted from a worker thread need an application to be delivered. Other tests need widgets. """
+        cls.application = QApplication.instance() or QApplication([])
+
+    def run_loader(self, loader: QuizLoader) -> dict:
+        """Run the loader in the thread pool and collect emitted signals. """
+        emitted = {'progress': [], 'finished': [], 'failed': [], 'cancelled': 0}
+        loader.signals.progress.connect(lambda step, text: emitted['progress'].append(step))
+        loader.signals.finished.connect(emitted['finished'].append)
+        loader.signals.failed.connect(emitted['failed'].append)
+        loader.signals.cancelled.connect(lambda: emitted.update(cancelled=emitted['cancelled'] + 1))
+
+        thread_pool = QThreadPool()
+        thread_pool.start(loader)
+        thread_pool.waitForDone()
+        QCoreApplication.processEvents()
+        return emitted
+
+    def test_load_quiz(self):
+        """Check if the learning model is built in the background and progress is reported. """
+        database_manager = StubDatabaseManager(create_quiz_model(10))
+
+        emitted = self.run_loader(QuizLoader('quiz', database_manager))
+
+        self.assertEqual([0, 1, QuizLoader.NUMBER_OF_STEPS], emitted['progress'])
+        self.assertEqual(1, len(emitted['finished']))
+        self.assertEqual([10, 0, 0, 0, 0], emitted['finished'][0].get_number_of_questions_on_levels())
+        self.assertEqual([], emitted['failed'])
+        self.assertEqual(1, database_manager.closed_sessions)
+
+    def test_cancel_loading(self):
+        """Check if the result of a cancelled loading is dropped. """
+        database_manager = StubDatabaseManager(create_quiz_model(10))
+        loader = QuizLoader('quiz', database_manager)
+        loader.cancel()
+
+        emitted = self.run_loader(loader)
+
+        self.assertEqual([], emitted['finished'])
+        self.assertEqual(1, emitted['cancelled'])
+        self.assertEqual(1, database_manager.closed_sessions)
+
+    def test_loading_failure(self):
+        """Check if a loading error is reported instead of being raised in the worker thread. """
+        database_manager = StubDatabaseManager(error=RuntimeError('database is locked'))
+
+        emitted = self.run_loader(QuizLoader('quiz', database_manager))
+
+        self.assertEqual(['database is locked'], emitted['failed'])
+        self.assertEqual([], emitted['finished'])
+        self.assertEqual(1, database_manager.closed_sessions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,10 @@
+import io
 from unittest import TestCase
 
 from src.question_model import QuizModel, QuestionModel, AnswerModel
-from src.database.quiz_parser import parse_quiz_text
+from src.database.quiz_parser import parse_quiz_text, parse_quiz_stream
+
+QUIZ_FILE_PATH = 'data/test_quiz.md'
 
 
 class QuizParserTests(TestCase):
@@ -87,3 +90,35 @@ Yes, sky is blue.
             ])
 
         self.assertEqual(expected_data, parse_quiz_text(example_text))
+
+    def test_parse_quiz_stream(self):
+        """Test parsing quiz from a file object gives the same questions as parsing the whole text. """
+        with open(QUIZ_FILE_PATH) as quiz_file:
+            expected_data = parse_quiz_text(quiz_file.read())
+
+        with open(QUIZ_FILE_PATH) as quiz_file:
+            quiz_name, questions = parse_quiz_stream(quiz_file)
+            self.assertEqual(expected_data, QuizModel(name=quiz_name, questions=list(questions)))
+
+    def test_parse_quiz_stream_is_lazy(self):
+        """Test that a question is yielded as soon as the next question starts, before the rest is read. """
+        quiz_file = io.StringIO('''## Test quiz
+#### Q1. What is 2 + 2?
+- [x] 4
+#### Q2. What is 2 + 3?
+- [x] 5
+''')
+        quiz_name, questions = parse_quiz_stream(quiz_file)
+        first_question = next(questions)
+
+        self.assertEqual('Test quiz', quiz_name)
+        self.assertEqual(QuestionModel(text='Q1. What is 2 + 2?', answers=[AnswerModel(text='4', is_correct=True)],
+                                       comment=''), first_question)
+        self.assertEqual('- [x] 5\n', quiz_file.readline())
+
+    def test_parse_quiz_stream_without_name(self):
+        """Test that quizzes without lines or without the quiz name header are rejected with a clear error. """
+        with self.assertRaisesRegex(ValueError, 'empty'):
+            parse_quiz_stream(io.StringIO('\n\n'))
+        with self.assertRaisesRegex(ValueError, 'header'):
+            parse_quiz_stream(io.StringIO('#### Q1. What is 2 + 2?\n- [x] 4\n'))
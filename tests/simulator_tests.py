@@ -0,0 +1,43 @@
+"""Unit tests for the learning simulator. """
+from unittest import TestCase
+
+from src.question_model import NEEDED_CORRECT_ANSWERS
+from src.simulator import LearnerModel, generate_quiz_model, simulate, run_simulations
+
+
+class SimulatorTests(TestCase):
+    """Unit tests for simulating learning with synthetic learners. """
+
+    @classmethod
+    def setUpClass(cls):
+        """Define quiz used in tests. """
+        cls.quiz_model = generate_quiz_model(20)
+
+    def test_simulate_perfect_learner(self):
+        """Learner answering always correctly needs the same number of answers to master every question. """
+        result = simulate(self.quiz_model, LearnerModel(min_recall=1, max_recall=1, seed=0))
+
+        self.assertTrue(result.finished)
+        self.assertEqual([sum(NEEDED_CORRECT_ANSWERS)] * 20, result.question_answers_to_mastery)
+        self.assertEqual(result.answers, sum(result.answers_on_levels))
+        self.assertEqual([NEEDED_CORRECT_ANSWERS[level] * 20 for level in range(len(NEEDED_CORRECT_ANSWERS))],
+                         result.answers_on_levels[:-1])
+        self.assertIsNone(self.quiz_model.questions[0].user_data)
+
+    def test_simulate_answers_limit(self):
+        """Learner never answering correctly doesn't finish the quiz. """
+        result = simulate(self.quiz_model, LearnerModel(min_recall=0, max_recall=0, max_answers=500))
+
+        self.assertFalse(result.finished)
+        self.assertEqual(500, result.answers)
+        self.assertEqual([500, 0, 0, 0, 0], result.answers_on_levels)
+        self.assertEqual([], result.question_answers_to_mastery)
+
+    def test_run_simulations(self):
+        """Simulations run in parallel give the same results as run one by one. """
+        learners = [LearnerModel(seed=seed) for seed in range(4)]
+        results = run_simulations(self.quiz_model, learners, workers=2)
+
+        self.assertEqual([simulate(self.quiz_model, learner).answers for learner in learners],
+                         [result.answers for result in results])
+        self.assertTrue(all(result.finished for result in results))
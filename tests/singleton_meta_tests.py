@@ -0,0 +1,33 @@
+"""Unit tests for the singleton base class. """
+import threading
+import time
+from unittest import TestCase
+
+from src.singleton_meta import SingletonMeta
+
+
+class SlowSingleton(metaclass=SingletonMeta):
+    """Singleton with a slow constructor, counting its calls. """
+    calls = 0
+
+    def __init__(self):
+        """Constructor. """
+        time.sleep(0.05)
+        SlowSingleton.calls += 1
+
+
+class SingletonMetaTests(TestCase):
+    """Unit tests for SingletonMeta class. """
+
+    def test_concurrent_creation(self):
+        """Check that threads creating the instance at the same time get the same, single instance. """
+        instances = []
+        threads = [threading.Thread(target=lambda: instances.append(SlowSingleton())) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, SlowSingleton.calls)
+        self.assertEqual(10, len(instances))
+        self.assertTrue(all(instance is instances[0] for instance in instances))